@@ -1,2 +1,3 @@
 from application.ports.file_system_port import FileSystemPort
 from application.ports.config_port import ConfigPort
+from application.ports.file_watcher_port import FileWatcherPort
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List, Optional, Sequence, Tuple
+from domain import StatRecord
 
 
 class FileSystemPort(ABC):
@@ -10,6 +11,15 @@ class FileSystemPort(ABC):
         """Проверяет существование файла."""
         pass
 
+    @abstractmethod
+    def stat_file(self, path: str) -> Optional[StatRecord]:
+        """Проверяет файл одним stat и возвращает его сведения или None.
+
+        Адаптер может запомнить сведения до конца запуска и отвечать по ним
+        на file_exists, get_file_size и get_file_signature для этого пути.
+        """
+        pass
+
     @abstractmethod
     def dir_exists(self, path: str) -> bool:
         """Проверяет существование директории."""
@@ -21,15 +31,41 @@ class FileSystemPort(ABC):
         pass
 
     @abstractmethod
-    def read_file(self, file_path: str) -> List[str]:
+    def iter_files(
+        self,
+        dir_path: str,
+        recursive: bool = False,
+        include: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+    ) -> Iterator[str]:
+        """Лениво перечисляет файлы директории с учётом шаблонов."""
+        pass
+
+    @abstractmethod
+    def read_file(self, file_path: str) -> Sequence[str]:
         """Читает содержимое файла и возвращает список строк."""
         pass
 
+    @abstractmethod
+    def iter_lines(self, file_path: str) -> Iterator[str]:
+        """Лениво читает файл построчно."""
+        pass
+
     @abstractmethod
     def write_file(self, file_path: str, content: str) -> None:
         """Записывает содержимое в файл."""
         pass
 
+    @abstractmethod
+    def get_file_size(self, path: str) -> int:
+        """Возвращает размер файла в байтах."""
+        pass
+
+    @abstractmethod
+    def get_file_signature(self, path: str) -> Optional[Tuple[int, int]]:
+        """Возвращает (st_mtime_ns, st_size) файла или None, если его нет."""
+        pass
+
     @abstractmethod
     def get_absolute_path(self, path: str) -> str:
         """Возвращает абсолютный путь к файлу."""
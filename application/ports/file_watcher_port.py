@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, Optional, Set
+
+
+class FileWatcherPort(ABC):
+    """Интерфейс для отслеживания изменений файлов и директорий."""
+
+    @abstractmethod
+    def watch(self, paths: Iterable[str]) -> None:
+        """Задаёт набор отслеживаемых абсолютных путей вместо прежнего."""
+        pass
+
+    @abstractmethod
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Ждёт изменений не дольше timeout секунд и возвращает изменившиеся пути.
+
+        Для директории возвращается и сама директория, и изменившиеся в ней
+        записи. Пустое множество означает, что время ожидания истекло.
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Освобождает ресурсы наблюдателя."""
+        pass
@@ -1,2 +1,6 @@
 from .config_service import ConfigService
 from .file_processor_service import FileProcessorService
+from .incremental_processor_service import IncrementalProcessorService
+from .line_memo import LineMemo
+from .profiler import NullProfiler, Profiler
+from .watch_service import WatchService
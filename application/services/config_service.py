@@ -25,20 +25,58 @@ class ConfigService:
         return self.config_port.get_config_by_id(configs, config_id)
 
     def get_files_from_config(self, config: Config) -> List[str]:
-        """Получает список файлов на основе конфигурации."""
+        """Получает список файлов на основе конфигурации.
+
+        Файлы режима files проверяются через stat_file: сведения проверки
+        адаптер переиспользует при подписи, размере и чтении файла.
+        """
         if config.mode == "dir":
             if not self.file_system_port.dir_exists(config.path):
                 raise FileNotFoundError(f"Директория не найдена: {config.path}")
 
-            return sorted(self.file_system_port.list_files(config.path))
+            return sorted(
+                self.file_system_port.iter_files(
+                    config.path,
+                    recursive=config.recursive,
+                    include=self.split_patterns(config.include),
+                    exclude=self.split_patterns(config.exclude),
+                )
+            )
 
         elif config.mode == "files":
             file_paths = [p.strip() for p in config.path.split(",")]
             for file_path in file_paths:
-                if not self.file_system_port.file_exists(file_path):
+                record = self.file_system_port.stat_file(file_path)
+                if record is None or not record.is_file:
                     raise FileNotFoundError(f"Файл не найден: {file_path}")
 
             return sorted(file_paths)
 
         else:
             raise ValueError(f"Неподдерживаемый режим: {config.mode}")
+
+    def get_search_patterns(self, config: Config) -> List[str]:
+        """Собирает шаблоны действия search из patterns и файла patterns_file.
+
+        В файле шаблоны идут по одному на строку, пустые строки пропускаются.
+        Повторы удаляются с сохранением порядка.
+        """
+        patterns = self.split_patterns(config.patterns)
+        if config.patterns_file:
+            if not self.file_system_port.file_exists(config.patterns_file):
+                raise FileNotFoundError(
+                    f"Файл шаблонов не найден: {config.patterns_file}"
+                )
+            lines = self.file_system_port.read_file(config.patterns_file)
+            patterns.extend(line.strip() for line in lines if line.strip())
+        if not patterns:
+            raise ValueError(
+                f"Для действия search конфигурации {config.id} не заданы шаблоны "
+                "(patterns или patterns_file)"
+            )
+        return list(dict.fromkeys(patterns))
+
+    @staticmethod
+    def split_patterns(patterns: str) -> List[str]:
+        """Разбивает список glob-шаблонов через запятую."""
+        return [pattern.strip() for pattern in patterns.split(",") if pattern.strip()]
@@ -1,17 +1,52 @@
-from typing import Dict, List, Union
-from domain import Config, FileContent, ProcessingResult
-from domain import TextProcessingService
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence as SequenceABC
+from itertools import islice, zip_longest
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from domain import ColumnarResult, CompactLines, Config, FileContent, FileMatches
+from domain import FileStats, ProcessingResult, SearchResult, StatsResult
+from domain import TextProcessingService, compile_patterns
 from application.ports import FileSystemPort
+from application.services.line_memo import LineMemo
+
+_MISSING = object()
 
 
 class FileProcessorService:
     """Сервис для обработки файлов."""
 
+    STREAMING_THRESHOLD = 64 * 1024 * 1024
+    PARALLEL_THRESHOLD = 100_000
+    PARALLEL_ACTIONS = ("count", "replace")
+    CHUNKS_PER_WORKER = 4
+    STATS_ACTION = "stats"
+    SEARCH_ACTION = "search"
+    # Действия, которые сохраняют сводку вместо построчной матрицы.
+    SUMMARY_ACTIONS = (STATS_ACTION, SEARCH_ACTION)
+    BATCH_LINES = 64 * 1024
+    # Действия, результат которых зависит только от строки (и номера файла).
+    MEMO_ACTIONS = ("string", "count", "replace")
+
     def __init__(
-        self, file_system_port: FileSystemPort, text_service: TextProcessingService
+        self,
+        file_system_port: FileSystemPort,
+        text_service: TextProcessingService,
+        line_memo: Optional[LineMemo] = None,
     ):
         self.file_system_port = file_system_port
         self.text_service = text_service
+        self.line_memo = line_memo
 
     def read_files(self, file_paths: List[str]) -> List[FileContent]:
         """Читает содержимое файлов."""
@@ -22,51 +57,381 @@ class FileProcessorService:
         return result
 
     def process_files(
-        self, files_content: List[FileContent], action: str
-    ) -> Dict[str, Dict[str, Union[str, int]]]:
-        """Обрабатывает файлы согласно указанному действию."""
-        result = {}
+        self,
+        files_content: List[FileContent],
+        action: str,
+        workers: int = 1,
+        patterns: Sequence[str] = (),
+    ) -> Union[Mapping[str, Dict[str, Union[str, int]]], StatsResult, SearchResult]:
+        """Обрабатывает файлы согласно указанному действию.
+
+        Для действий stats и search (с шаблонами patterns) вместо построчной
+        матрицы возвращается сводка.
+        """
+        if action == self.STATS_ACTION:
+            return self.collect_stats(
+                file_content.lines for file_content in files_content
+            )
+        if action == self.SEARCH_ACTION:
+            return self.collect_matches(
+                (file_content.lines for file_content in files_content), patterns
+            )
+        return self.process_files_columnar(files_content, action, workers).out
 
-        max_lines = (
-            max(len(content.lines) for content in files_content) if files_content else 0
+    def collect_stats(self, files_lines: Iterable[Iterable[str]]) -> StatsResult:
+        """Собирает статистику файлов за один проход по строкам каждого файла."""
+        files = []
+        for file_idx, lines in enumerate(files_lines):
+            stats = FileStats(file_num=file_idx + 1)
+            for batch in self._iter_batches(lines):
+                words = sum(self.text_service.count_words_bulk(batch))
+                stats.update(list(map(len, batch)), words)
+            files.append(stats)
+        return StatsResult(files)
+
+    def stream_stats(self, file_paths: List[str]) -> StatsResult:
+        """Собирает статистику, читая каждый файл построчно один раз."""
+        return self.collect_stats(
+            self.file_system_port.iter_lines(file_path) for file_path in file_paths
         )
 
-        for line_num in range(1, max_lines + 1):
-            line_result = {}
+    def collect_matches(
+        self, files_lines: Iterable[Iterable[str]], patterns: Sequence[str]
+    ) -> SearchResult:
+        """Ищет шаблоны в файлах за один проход по строкам каждого файла.
+
+        Шаблоны компилируются один раз; порция строк просматривается целиком
+        как один текст, а номер строки вхождения находится по смещениям строк.
+        """
+        patterns = list(dict.fromkeys(patterns))
+        matcher = compile_patterns(tuple(patterns)) if patterns else None
+        files = []
+        for lines in files_lines:
+            matches = FileMatches()
+            first_line = 1
+            for batch in self._iter_batches(lines):
+                if matcher is None:
+                    continue
+                if not isinstance(batch, CompactLines):
+                    batch = CompactLines.from_lines(batch)
+                # Вхождения приходят по возрастанию строк, поэтому номер строки
+                # ищется только при переходе за конец текущей строки.
+                offsets = batch.offsets
+                by_line = matches.lines
+                line_end = 0
+                line: Dict[str, int] = {}
+                for start, pattern in matcher.finditer(batch.text):
+                    if start >= line_end:
+                        index = bisect_right(offsets, start)
+                        line_end = offsets[index]
+                        line = by_line[first_line + index - 1] = {}
+                    line[pattern] = line.get(pattern, 0) + 1
+                first_line += len(batch)
+            matches.count_patterns()
+            files.append(matches)
+        return SearchResult(patterns, files)
 
-            for file_idx, file_content in enumerate(files_content):
-                file_num = file_idx + 1
+    def stream_matches(
+        self, file_paths: List[str], patterns: Sequence[str]
+    ) -> SearchResult:
+        """Ищет шаблоны, читая каждый файл построчно один раз."""
+        return self.collect_matches(
+            (self.file_system_port.iter_lines(file_path) for file_path in file_paths),
+            patterns,
+        )
 
-                action_map = {
-                    "string": lambda line: line,
-                    "count": lambda line: self.text_service.count_words(line),
-                    "replace": lambda line: self.text_service.replace_letters(
-                        line, file_num
-                    ),
-                }
+    def _iter_batches(self, lines: Iterable[str]) -> Iterator[Sequence[str]]:
+        """Делит строки файла на порции по BATCH_LINES строк."""
+        size = self.BATCH_LINES
+        if isinstance(lines, SequenceABC):
+            # Срез CompactLines остаётся CompactLines: слова в нём считаются
+            # векторно, а поиск идёт по готовому тексту.
+            for start in range(0, len(lines), size):
+                end = start + size
+                yield lines[start:end]
+            return
 
-                if line_num <= len(file_content.lines):
-                    current_line = file_content.lines[line_num - 1]
-                    line_result[str(file_num)] = action_map.get(
-                        action, lambda line: ""
-                    )(current_line)
-                else:
-                    line_result[str(file_num)] = 0 if action == "count" else ""
+        iterator = iter(lines)
+        while True:
+            batch = list(islice(iterator, size))
+            if not batch:
+                return
+            yield batch
 
-            result[str(line_num)] = line_result
+    def process_files_columnar(
+        self, files_content: List[FileContent], action: str, workers: int = 1
+    ) -> ColumnarResult:
+        """Обрабатывает файлы и возвращает результат по столбцам файлов."""
+        if self.should_parallelize(files_content, action, workers):
+            columns = self.process_columns_parallel(files_content, action, workers)
+        else:
+            columns = [
+                self.process_lines(file_content.lines, action, file_idx + 1)
+                for file_idx, file_content in enumerate(files_content)
+            ]
+        return ColumnarResult(action=action, columns=columns)
 
-        return result
+    def build_rows(
+        self,
+        columns: List[Sequence[Union[str, int]]],
+        action: str,
+        sparse: bool = False,
+    ) -> Mapping[str, Dict[str, Union[str, int]]]:
+        """Собирает строки результата из столбцов файлов.
+
+        Короткие файлы дополняются до самого длинного, если не задан sparse.
+        """
+        columnar = ColumnarResult(action=action, columns=columns)
+        return columnar.sparse_out if sparse else columnar.out
+
+    def should_parallelize(
+        self, files_content: List[FileContent], action: str, workers: int
+    ) -> bool:
+        """Определяет, окупится ли запуск пула процессов."""
+        if workers <= 1 or action not in self.PARALLEL_ACTIONS:
+            return False
+        total_lines = sum(len(file_content.lines) for file_content in files_content)
+        return total_lines >= self.PARALLEL_THRESHOLD
+
+    def process_columns_parallel(
+        self, files_content: List[FileContent], action: str, workers: int
+    ) -> List[Union[array, List[str]]]:
+        """Обрабатывает файлы в пуле процессов, разбивая строки на фрагменты."""
+        max_lines = max(len(file_content.lines) for file_content in files_content)
+        chunk_count = max(1, workers * self.CHUNKS_PER_WORKER)
+        chunk_size = max(1, -(-max_lines // chunk_count))
+
+        chunks = []
+        for start in range(0, max_lines, chunk_size):
+            end = start + chunk_size
+            chunks.append(
+                [
+                    (file_idx + 1, file_content.lines[start:end])
+                    for file_idx, file_content in enumerate(files_content)
+                ]
+            )
+
+        # Пул процессов тянет multiprocessing, поэтому импортируется по месту.
+        from concurrent.futures import ProcessPoolExecutor
+
+        columns = [array("q") if action == "count" else [] for _ in files_content]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunk_results = executor.map(
+                _process_chunk,
+                [self.text_service] * len(chunks),
+                [action] * len(chunks),
+                chunks,
+            )
+            for chunk_columns in chunk_results:
+                for column, chunk_column in zip(columns, chunk_columns):
+                    column.extend(chunk_column)
+
+        return columns
+
+    def process_lines(
+        self, lines: Sequence[str], action: str, file_num: int
+    ) -> Union[array, List[str]]:
+        """Обрабатывает все строки одного файла согласно указанному действию.
+
+        Если задан кэш строк, вычисляются только строки, которых в нём нет.
+        """
+        if self.line_memo is not None and action in self.MEMO_ACTIONS:
+            values = self.line_memo.map_lines(
+                action,
+                self._memo_file_num(action, file_num),
+                lines,
+                lambda missing: self._compute_lines(missing, action, file_num),
+            )
+            return array("q", values) if action == "count" else values
+        return self._compute_lines(lines, action, file_num)
+
+    def _compute_lines(
+        self, lines: Sequence[str], action: str, file_num: int
+    ) -> Union[array, List[str]]:
+        """Вычисляет результат действия для строк файла."""
+        if action == "string":
+            return list(lines)
+        if action == "count":
+            if isinstance(lines, (CompactLines, list)):
+                return self.text_service.count_words_bulk(lines)
+            # Ленивые представления (mmap) считаются порциями: в памяти только
+            # текст одной порции, а не всего файла.
+            counts = array("q")
+            for batch in self._iter_batches(lines):
+                counts.extend(self.text_service.count_words_bulk(batch))
+            return counts
+        if action == "replace":
+            return self.text_service.replace_lines(lines, file_num)
+        return [""] * len(lines)
+
+    def should_stream(self, file_paths: List[str]) -> bool:
+        """Определяет, нужно ли обрабатывать файлы в потоковом режиме."""
+        total_size = 0
+        for file_path in file_paths:
+            total_size += self.file_system_port.get_file_size(file_path)
+            if total_size > self.STREAMING_THRESHOLD:
+                return True
+        return False
+
+    def iter_rows(
+        self,
+        file_paths: List[str],
+        action: str,
+        line_counts: List[int] = None,
+        pad: Optional[bool] = None,
+    ) -> Iterator[Tuple[str, Dict[str, Union[str, int]]]]:
+        """Лениво обрабатывает файлы, проходя их одновременно по номерам строк.
+
+        Если передан список line_counts, в него по мере перебора записывается
+        число строк каждого файла. Строки за концом файлов дополняются, если
+        pad не задан явно, только без line_counts.
+        """
+        if pad is None:
+            pad = line_counts is None
+        if line_counts is not None:
+            line_counts[:] = [0] * len(file_paths)
+        if not pad:
+            return self._iter_sparse_rows(file_paths, action, line_counts)
+        return self._iter_padded_rows(file_paths, action, line_counts)
+
+    def _iter_padded_rows(
+        self, file_paths: List[str], action: str, line_counts: List[int] = None
+    ) -> Iterator[Tuple[str, Dict[str, Union[str, int]]]]:
+        """Перебирает строки файлов, дополняя закончившиеся файлы."""
+        handlers = [
+            self.get_line_handler(action, file_idx + 1)
+            for file_idx in range(len(file_paths))
+        ]
+        padding = 0 if action == "count" else ""
+        iterators = [self.file_system_port.iter_lines(path) for path in file_paths]
+        sources = iterators
+        if line_counts is not None:
+            # Подсчёт строк нужен только профилю, поэтому обычный перебор
+            # обходится без обёрток.
+            sources = [
+                self._count_lines(iterator, line_counts, file_idx)
+                for file_idx, iterator in enumerate(iterators)
+            ]
+
+        try:
+            for line_num, lines in enumerate(
+                zip_longest(*sources, fillvalue=_MISSING), start=1
+            ):
+                line_result = {}
+                for file_idx, line in enumerate(lines):
+                    line_result[str(file_idx + 1)] = (
+                        padding if line is _MISSING else handlers[file_idx](line)
+                    )
+                yield str(line_num), line_result
+        finally:
+            for iterator in iterators:
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()
+
+    @staticmethod
+    def _count_lines(
+        lines: Iterable[str], line_counts: List[int], file_idx: int
+    ) -> Iterator[str]:
+        """Пропускает строки файла, записывая их число в line_counts."""
+        for line in lines:
+            line_counts[file_idx] += 1
+            yield line
+
+    def _iter_sparse_rows(
+        self, file_paths: List[str], action: str, line_counts: List[int] = None
+    ) -> Iterator[Tuple[str, Dict[str, Union[str, int]]]]:
+        """Перебирает строки файлов без дополнения, считая строки каждого файла."""
+        if line_counts is None:
+            line_counts = [0] * len(file_paths)
+        active = [
+            (
+                file_idx,
+                str(file_idx + 1),
+                self.file_system_port.iter_lines(path),
+                self.get_line_handler(action, file_idx + 1),
+            )
+            for file_idx, path in enumerate(file_paths)
+        ]
+        iterators = [iterator for _, _, iterator, _ in active]
+
+        try:
+            line_num = 0
+            while active:
+                line_num += 1
+                line_result = {}
+                still_active = []
+                for entry in active:
+                    file_idx, key, iterator, handler = entry
+                    line = next(iterator, _MISSING)
+                    if line is _MISSING:
+                        continue
+                    line_result[key] = handler(line)
+                    line_counts[file_idx] = line_num
+                    still_active.append(entry)
+                if len(still_active) != len(active):
+                    active = still_active
+                if line_result:
+                    yield str(line_num), line_result
+        finally:
+            for iterator in iterators:
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()
+
+    def get_line_handler(
+        self, action: str, file_num: int
+    ) -> Callable[[str], Union[str, int]]:
+        """Возвращает функцию обработки одной строки для указанного действия."""
+        handler = self._line_handler(action, file_num)
+        if self.line_memo is not None and action in self.MEMO_ACTIONS:
+            return self.line_memo.wrap(
+                action, self._memo_file_num(action, file_num), handler
+            )
+        return handler
+
+    @staticmethod
+    def _memo_file_num(action: str, file_num: int) -> int:
+        """Номер файла в ключе кэша строк: только replace зависит от файла."""
+        return file_num if action == "replace" else 0
+
+    def _line_handler(
+        self, action: str, file_num: int
+    ) -> Callable[[str], Union[str, int]]:
+        """Возвращает функцию обработки одной строки без кэша."""
+        if action == "string":
+            return lambda line: line
+        if action == "count":
+            return self.text_service.count_words
+        if action == "replace":
+            return lambda line: self.text_service.replace_letters(line, file_num)
+        return lambda line: ""
 
     def create_processing_result(
         self,
         config_file: str,
         config: Config,
         processed_data: Dict[str, Dict[str, Union[str, int]]],
+        line_counts: List[int] = None,
     ) -> ProcessingResult:
-        """Создает объект с результатами обработки."""
+        """Создает объект с результатами обработки.
+
+        line_counts передаётся для разреженного результата (без дополнения).
+        """
         return ProcessingResult(
             config_file=self.file_system_port.get_absolute_path(config_file),
             config_id=config.id,
             config_data={"mode": config.mode, "path": config.path},
             out=processed_data,
+            line_counts=line_counts,
         )
+
+
+def _process_chunk(
+    text_service: TextProcessingService,
+    action: str,
+    chunk: List[Tuple[int, Sequence[str]]],
+) -> List[Union[array, List[str]]]:
+    """Обрабатывает фрагмент строк всех файлов в рабочем процессе."""
+    service = FileProcessorService(None, text_service)
+    return [service.process_lines(lines, action, file_num) for file_num, lines in chunk]
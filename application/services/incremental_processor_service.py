@@ -0,0 +1,87 @@
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+from domain import ResultManifest
+from application.ports import FileSystemPort
+from application.services.file_processor_service import FileProcessorService
+
+
+class IncrementalProcessorService:
+    """Сервис инкрементальной переобработки файлов.
+
+    Столбец файла в out зависит только от содержимого файла и его номера,
+    поэтому пересчитываются лишь столбцы изменённых, добавленных или
+    сдвинувшихся файлов, а остальные берутся из предыдущего результата.
+    """
+
+    def __init__(
+        self, file_system_port: FileSystemPort, file_processor: FileProcessorService
+    ):
+        self.file_system_port = file_system_port
+        self.file_processor = file_processor
+
+    def find_stale_columns(
+        self,
+        file_paths: List[str],
+        signatures: List[Optional[Tuple[int, int]]],
+        action: str,
+        manifest: Optional[ResultManifest],
+    ) -> List[int]:
+        """Возвращает индексы файлов, столбцы которых нужно пересчитать."""
+        if manifest is None or manifest.action != action:
+            return list(range(len(file_paths)))
+
+        stale = []
+        for file_idx, (file_path, signature) in enumerate(zip(file_paths, signatures)):
+            if (
+                signature is None
+                or file_idx >= len(manifest.files)
+                or manifest.files[file_idx] != file_path
+                or manifest.signatures[file_idx] != signature
+            ):
+                stale.append(file_idx)
+        return stale
+
+    def process_files(
+        self,
+        file_paths: List[str],
+        action: str,
+        previous_out: Optional[Mapping[str, Mapping[str, Union[str, int]]]],
+        manifest: Optional[ResultManifest],
+        sparse: bool = False,
+    ) -> Tuple[Dict[str, Dict[str, Union[str, int]]], ResultManifest, List[int]]:
+        """Пересчитывает только устаревшие столбцы и собирает новый результат.
+
+        При sparse строки результата не дополняются до самого длинного файла.
+        """
+        signatures = [
+            self.file_system_port.get_file_signature(file_path)
+            for file_path in file_paths
+        ]
+        if previous_out is None:
+            manifest = None
+        stale = self.find_stale_columns(file_paths, signatures, action, manifest)
+        stale_set = set(stale)
+
+        columns = []
+        for file_idx, file_path in enumerate(file_paths):
+            file_num = file_idx + 1
+            if file_idx in stale_set:
+                lines = self.file_system_port.read_file(file_path)
+                columns.append(
+                    self.file_processor.process_lines(lines, action, file_num)
+                )
+            else:
+                columns.append(
+                    [
+                        previous_out[str(line_num)][str(file_num)]
+                        for line_num in range(1, manifest.line_counts[file_idx] + 1)
+                    ]
+                )
+
+        new_manifest = ResultManifest(
+            action=action,
+            files=list(file_paths),
+            signatures=signatures,
+            line_counts=[len(column) for column in columns],
+        )
+        rows = self.file_processor.build_rows(columns, action, sparse)
+        return rows, new_manifest, stale
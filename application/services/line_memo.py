@@ -0,0 +1,146 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Sequence, Tuple, Union
+from domain import CompactLines
+
+_MISSING = object()
+
+Value = Union[str, int]
+
+
+class LineMemo:
+    """Ограниченный LRU-кэш результатов обработки строк.
+
+    Ключ - (action, file_num, строка). Строки результата интернируются,
+    поэтому одинаковые значения в столбцах - один объект, даже если запись
+    уже вытеснена из кэша. Счётчики hits и misses считают строки: попадание -
+    строка, значение которой не вычислялось. Кэш можно разделять между
+    потоками.
+    """
+
+    DEFAULT_MAX_ENTRIES = 100_000
+    BATCH_LINES = 64 * 1024
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError(
+                f"Размер кэша строк должен быть больше нуля: {max_entries}"
+            )
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Tuple[str, int, str], Value]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def map_lines(
+        self,
+        action: str,
+        file_num: int,
+        lines: Sequence[str],
+        compute: Callable[[List[str]], Sequence[Value]],
+    ) -> List[Value]:
+        """Возвращает значения строк, вычисляя compute только для новых строк.
+
+        Строки обрабатываются порциями по BATCH_LINES: повторы внутри порции
+        сводятся к одной проверке кэша, а отсутствующие в нём строки
+        передаются в compute одним списком.
+        """
+        result: List[Value] = []
+        size = self.BATCH_LINES
+        for start in range(0, len(lines), size):
+            end = start + size
+            batch = lines[start:end]
+            if isinstance(batch, CompactLines):
+                batch = batch.tolist()
+            values: Dict[str, Value] = dict.fromkeys(batch)
+            missing = self._lookup(action, file_num, values)
+            if missing:
+                self._store(action, file_num, values, missing, compute(missing))
+            with self._lock:
+                self.hits += len(batch) - len(missing)
+            result.extend(map(values.__getitem__, batch))
+        return result
+
+    def wrap(
+        self, action: str, file_num: int, handler: Callable[[str], Value]
+    ) -> Callable[[str], Value]:
+        """Возвращает обработчик одной строки, использующий кэш."""
+
+        def memoized(line: str) -> Value:
+            key = (action, file_num, line)
+            with self._lock:
+                value = self._cache.get(key, _MISSING)
+                if value is not _MISSING:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return value
+            value = self._intern(handler(line))
+            with self._lock:
+                self.misses += 1
+                self._put(key, value)
+            return value
+
+        return memoized
+
+    def clear(self) -> None:
+        """Очищает кэш строк."""
+        with self._lock:
+            self._cache.clear()
+
+    def cache_stats(self) -> Dict[str, Union[int, float]]:
+        """Возвращает счётчики кэша строк и долю попаданий."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._cache),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _lookup(
+        self, action: str, file_num: int, values: Dict[str, Value]
+    ) -> List[str]:
+        """Заполняет values найденными значениями и возвращает новые строки."""
+        missing = []
+        cache = self._cache
+        with self._lock:
+            for line in values:
+                key = (action, file_num, line)
+                value = cache.get(key, _MISSING)
+                if value is _MISSING:
+                    missing.append(line)
+                else:
+                    cache.move_to_end(key)
+                    values[line] = value
+        return missing
+
+    def _store(
+        self,
+        action: str,
+        file_num: int,
+        values: Dict[str, Value],
+        missing: List[str],
+        computed: Sequence[Value],
+    ) -> None:
+        """Запоминает вычисленные значения новых строк."""
+        intern = self._intern
+        with self._lock:
+            self.misses += len(missing)
+            for line, value in zip(missing, computed):
+                value = values[line] = intern(value)
+                self._put((action, file_num, line), value)
+
+    def _put(self, key: Hashable, value: Value) -> None:
+        """Помещает значение в кэш, вытесняя давно не использованные записи."""
+        self._cache[key] = value
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+    @staticmethod
+    def _intern(value: Value) -> Value:
+        """Интернирует строковое значение."""
+        return sys.intern(value) if type(value) is str else value
@@ -0,0 +1,123 @@
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - модуля resource нет в Windows
+    resource = None
+
+
+class _Stage:
+    """Контекстный менеджер, добавляющий время выполнения к этапу профиля."""
+
+    __slots__ = ("_profiler", "_name", "_start")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self._profiler = profiler
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> "_Stage":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._profiler.add_time(self._name, time.perf_counter() - self._start)
+
+
+class _NullStage:
+    """Пустой контекстный менеджер для выключенного профилирования."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+class NullProfiler:
+    """Профилировщик, который ничего не измеряет.
+
+    Используется по умолчанию, чтобы выключенное профилирование стоило
+    одного вызова метода на этап.
+    """
+
+    enabled = False
+
+    def stage(self, name: str) -> _NullStage:
+        """Возвращает пустой контекст этапа."""
+        return _NULL_STAGE
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Ничего не делает."""
+
+
+class Profiler(NullProfiler):
+    """Собирает время этапов и счётчики одного запуска конфигурации.
+
+    Время этапа накапливается вместе с числом вызовов. Если задан
+    trace_memory, на время профилирования включается tracemalloc и в отчёт
+    попадает пик выделенной Python памяти.
+    """
+
+    enabled = True
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._tracing = False
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+
+    def stage(self, name: str) -> _Stage:
+        """Возвращает контекст, замеряющий время этапа name."""
+        return _Stage(self, name)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """Добавляет время к этапу name."""
+        with self._lock:
+            stage = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0})
+            stage["calls"] += 1
+            stage["seconds"] += seconds
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Увеличивает счётчик name на value."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def finish(self) -> Dict[str, Any]:
+        """Завершает профилирование и возвращает отчёт для JSON."""
+        memory: Dict[str, Any] = {"peak_rss_bytes": self.peak_rss()}
+        if self.trace_memory and tracemalloc.is_tracing():
+            memory["tracemalloc_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+        return {
+            "total_seconds": time.perf_counter() - self._started,
+            "stages": self.stages,
+            "counters": self.counters,
+            "memory": memory,
+        }
+
+    @staticmethod
+    def peak_rss() -> Optional[int]:
+        """Возвращает пиковый размер резидентной памяти процесса в байтах."""
+        if resource is None:  # pragma: no cover
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # В macOS ru_maxrss измеряется в байтах, в Linux - в килобайтах.
+        return peak if sys.platform == "darwin" else peak * 1024
@@ -0,0 +1,174 @@
+import os
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set
+from domain import Config
+from application.ports import FileWatcherPort
+from application.services.config_service import ConfigService
+
+
+class ConfigScope(NamedTuple):
+    """Пути, от которых зависит результат конфигурации."""
+
+    files: Set[str]
+    directory: Optional[str]
+    recursive: bool
+
+
+class WatchService:
+    """Сервис, перезапускающий конфигурации при изменении входных данных.
+
+    Отслеживаются конфигурационный файл, файлы каждой конфигурации и, для
+    режима dir, сами директории. Пачка изменений, пришедших подряд с
+    интервалом меньше debounce секунд, обрабатывается один раз, и
+    перезапускаются только затронутые конфигурации.
+    """
+
+    DEBOUNCE_SECONDS = 0.2
+
+    def __init__(
+        self,
+        config_service: ConfigService,
+        file_watcher: FileWatcherPort,
+        debounce: float = DEBOUNCE_SECONDS,
+    ):
+        self.config_service = config_service
+        self.file_watcher = file_watcher
+        self.debounce = debounce
+
+    def watch(
+        self,
+        config_file: str,
+        config_ids: Optional[List[str]],
+        run: Callable[[List[Config]], None],
+        on_error: Callable[[Exception], None] = None,
+        max_cycles: int = None,
+        timeout: float = None,
+    ) -> None:
+        """Выполняет конфигурации и перезапускает их при изменениях.
+
+        config_ids=None означает все конфигурации файла, включая добавленные
+        позже. max_cycles и timeout ограничивают число и длительность
+        ожиданий; по умолчанию наблюдение не прекращается.
+        """
+        config_path = os.path.abspath(config_file)
+        configs = self.select_configs(
+            self.config_service.read_configs(config_file), config_ids
+        )
+        scopes = self.build_scopes(configs)
+        self.file_watcher.watch(self.watched_paths(config_path, scopes))
+        run(configs)
+
+        cycles = 0
+        while max_cycles is None or cycles < max_cycles:
+            cycles += 1
+            changed = self.wait_for_changes(timeout)
+            if not changed:
+                continue
+
+            affected = self.affected_configs(changed, configs, scopes)
+            if config_path in changed:
+                try:
+                    new_configs = self.select_configs(
+                        self.config_service.read_configs(config_file), config_ids
+                    )
+                except (OSError, ValueError) as e:
+                    if on_error is not None:
+                        on_error(e)
+                else:
+                    previous = {config.id: config for config in configs}
+                    affected_ids = {config.id for config in affected}
+                    configs = new_configs
+                    affected = [
+                        config
+                        for config in configs
+                        if config.id in affected_ids
+                        or previous.get(config.id) != config
+                    ]
+
+            scopes = self.build_scopes(configs)
+            self.file_watcher.watch(self.watched_paths(config_path, scopes))
+            if affected:
+                run(affected)
+
+    def wait_for_changes(self, timeout: float = None) -> Set[str]:
+        """Ждёт изменений и собирает всю пачку, пока они не затихнут."""
+        changed = self.file_watcher.wait(timeout)
+        if not changed:
+            return set()
+
+        while True:
+            more = self.file_watcher.wait(self.debounce)
+            if not more:
+                return changed
+            changed |= more
+
+    def select_configs(
+        self, configs: List[Config], config_ids: Optional[List[str]]
+    ) -> List[Config]:
+        """Выбирает отслеживаемые конфигурации, пропуская отсутствующие ID."""
+        if config_ids is None:
+            return configs
+
+        selected = []
+        for config_id in config_ids:
+            config = self.config_service.get_config_by_id(configs, config_id)
+            if config is not None:
+                selected.append(config)
+        return selected
+
+    def build_scopes(self, configs: List[Config]) -> Dict[str, ConfigScope]:
+        """Определяет пути, от которых зависит каждая конфигурация."""
+        scopes = {}
+        for config in configs:
+            directory = os.path.abspath(config.path) if config.mode == "dir" else None
+            try:
+                file_paths = self.config_service.get_files_from_config(config)
+            except (OSError, ValueError):
+                file_paths = [] if directory else config.path.split(",")
+            if config.patterns_file:
+                file_paths = [*file_paths, config.patterns_file]
+            scopes[config.id] = ConfigScope(
+                files={os.path.abspath(path.strip()) for path in file_paths},
+                directory=directory,
+                recursive=config.recursive,
+            )
+        return scopes
+
+    @staticmethod
+    def watched_paths(config_path: str, scopes: Dict[str, ConfigScope]) -> Set[str]:
+        """Возвращает пути, за которыми нужно следить."""
+        paths = {config_path}
+        for scope in scopes.values():
+            paths |= scope.files
+            if scope.directory is not None:
+                paths.add(scope.directory)
+                if scope.recursive:
+                    paths.update(os.path.dirname(path) for path in scope.files)
+        return paths
+
+    @staticmethod
+    def affected_configs(
+        changed: Iterable[str], configs: List[Config], scopes: Dict[str, ConfigScope]
+    ) -> List[Config]:
+        """Возвращает конфигурации, затронутые изменившимися путями."""
+        affected = []
+        for config in configs:
+            scope = scopes[config.id]
+            for path in changed:
+                if path in scope.files or (
+                    scope.directory is not None
+                    and WatchService.is_in_directory(
+                        path, scope.directory, scope.recursive
+                    )
+                ):
+                    affected.append(config)
+                    break
+        return affected
+
+    @staticmethod
+    def is_in_directory(path: str, directory: str, recursive: bool) -> bool:
+        """Проверяет, относится ли путь к директории конфигурации."""
+        if path == directory:
+            return True
+        if recursive:
+            return path.startswith(os.path.join(directory, ""))
+        return os.path.dirname(path) == directory
@@ -0,0 +1,9 @@
+from .corpus import ACTIONS, Corpus, CorpusSpec, generate_corpus
+from .runner import (
+    BenchmarkRunner,
+    compare_results,
+    format_report,
+    load_results,
+    measure,
+    save_results,
+)
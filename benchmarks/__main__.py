@@ -0,0 +1,102 @@
+import argparse
+import sys
+import tempfile
+from typing import List
+
+from benchmarks import (
+    ACTIONS,
+    BenchmarkRunner,
+    CorpusSpec,
+    compare_results,
+    format_report,
+    generate_corpus,
+    load_results,
+    save_results,
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Создаёт разбор аргументов командной строки бенчмарка."""
+    defaults = CorpusSpec()
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Бенчмарк этапов обработки на синтетическом корпусе",
+    )
+    parser.add_argument("--files", type=int, default=defaults.files)
+    parser.add_argument("--lines", type=int, default=defaults.lines)
+    parser.add_argument("--line-length", type=int, default=defaults.line_length)
+    parser.add_argument("--configs", type=int, default=defaults.configs)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--reader", choices=sorted(BenchmarkRunner.READERS), default="mmap"
+    )
+    parser.add_argument(
+        "--actions",
+        default=",".join(ACTIONS),
+        help="действия через запятую (по умолчанию все)",
+    )
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="не измерять пиковую память (tracemalloc заметно замедляет прогон)",
+    )
+    parser.add_argument(
+        "--workdir", help="каталог для корпуса (по умолчанию временный)"
+    )
+    parser.add_argument("--output", help="путь для сохранения результатов в JSON")
+    parser.add_argument("--baseline", help="JSON с результатами базового прогона")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="допустимое относительное замедление этапа (по умолчанию 0.1)",
+    )
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=0.001,
+        help="минимальное замедление этапа в секундах (по умолчанию 0.001)",
+    )
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    """Генерирует корпус, прогоняет бенчмарк и сравнивает с базовым прогоном."""
+    args = build_parser().parse_args(argv)
+    spec = CorpusSpec(
+        files=args.files,
+        lines=args.lines,
+        line_length=args.line_length,
+        configs=args.configs,
+        seed=args.seed,
+    )
+    actions = [action.strip() for action in args.actions.split(",") if action.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus = generate_corpus(args.workdir or tmp_dir, spec)
+        results = BenchmarkRunner(
+            corpus,
+            repeat=args.repeat,
+            reader=args.reader,
+            actions=actions,
+            trace_memory=not args.no_memory,
+        ).run()
+
+    comparison = None
+    if args.baseline:
+        baseline = load_results(args.baseline)
+        if baseline.get("corpus") != results["corpus"]:
+            print("Внимание: параметры корпуса отличаются от базового прогона")
+        comparison = compare_results(results, baseline, args.tolerance, args.min_delta)
+    if args.output:
+        save_results(results, args.output)
+
+    print(format_report(results, comparison))
+    if comparison and any(row["regressed"] for row in comparison):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
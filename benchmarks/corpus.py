@@ -0,0 +1,115 @@
+import os
+import random
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List
+
+ACTIONS = ("string", "count", "replace")
+
+_WORDS = (
+    "alpha",
+    "beta",
+    "gamma",
+    "delta",
+    "abc",
+    "lorem",
+    "ipsum",
+    "x",
+    "строка",
+    "файл",
+    "слово",
+    "проверка",
+    "замены",
+    "текст",
+    "42",
+    "2024",
+)
+_PUNCTUATION = ("", "", "", ",", ".", "!", "?")
+
+
+@dataclass
+class CorpusSpec:
+    """Параметры синтетического корпуса для бенчмарков."""
+
+    files: int = 3
+    lines: int = 10_000
+    line_length: int = 60
+    configs: int = 3
+    seed: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Возвращает параметры корпуса в виде словаря."""
+        return asdict(self)
+
+
+@dataclass
+class Corpus:
+    """Сгенерированный корпус: файлы и конфигурационный файл к ним."""
+
+    spec: CorpusSpec
+    directory: str
+    config_path: str
+    file_paths: List[str]
+    total_lines: int
+    total_bytes: int
+
+
+def generate_line(rng: random.Random, line_length: int) -> str:
+    """Генерирует строку примерно заданной длины из слов словаря."""
+    target = rng.randint(0, 2 * line_length)
+    words = []
+    length = 0
+    while length < target:
+        word = rng.choice(_WORDS) + rng.choice(_PUNCTUATION)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def generate_corpus(directory: str, spec: CorpusSpec) -> Corpus:
+    """Детерминированно создаёт файлы корпуса и конфигурационный файл."""
+    rng = random.Random(spec.seed)
+    data_dir = os.path.join(directory, "data")
+    os.makedirs(data_dir, exist_ok=True)
+
+    file_paths = []
+    total_lines = 0
+    total_bytes = 0
+    for file_idx in range(spec.files):
+        file_path = os.path.join(data_dir, f"file{file_idx + 1:04d}.txt")
+        lines = [generate_line(rng, spec.line_length) for _ in range(spec.lines)]
+        content = "\n".join(lines) + "\n"
+        with open(file_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(content)
+        file_paths.append(file_path)
+        total_lines += len(lines)
+        total_bytes += len(content.encode("utf-8"))
+
+    config_path = os.path.join(directory, "config.txt")
+    with open(config_path, "w", encoding="utf-8") as f:
+        f.write(render_configs(spec, data_dir, file_paths))
+
+    return Corpus(
+        spec=spec,
+        directory=directory,
+        config_path=config_path,
+        file_paths=file_paths,
+        total_lines=total_lines,
+        total_bytes=total_bytes,
+    )
+
+
+def render_configs(spec: CorpusSpec, data_dir: str, file_paths: List[str]) -> str:
+    """Формирует текст конфигурационного файла с чередованием режимов и действий."""
+    blocks = []
+    for config_idx in range(spec.configs):
+        if config_idx % 2 == 0 or not file_paths:
+            mode, path = "dir", data_dir
+        else:
+            mode, path = "files", ", ".join(file_paths)
+        blocks.append(
+            f"#{config_idx + 1}\n"
+            f"#mode: {mode}\n"
+            f"#path: {path}\n"
+            f"#action: {ACTIONS[config_idx % len(ACTIONS)]}\n"
+        )
+    return "\n".join(blocks)
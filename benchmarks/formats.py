@@ -0,0 +1,146 @@
+import argparse
+import os
+import sys
+import tempfile
+from typing import Any, Dict, List, Sequence
+
+from benchmarks.corpus import ACTIONS, CorpusSpec, generate_corpus
+from benchmarks.runner import FORMAT_VERSION, measure, save_results
+from domain import Config, TextProcessingService
+from application.services import FileProcessorService
+from infrastructure.adapters import LocalFileSystemAdapter, MmapFileSystemAdapter
+from infrastructure.repositories import FileRepository
+from presentation import OUTPUT_FORMATTERS
+
+
+def measure_formats(
+    spec: CorpusSpec,
+    workdir: str,
+    repeat: int = 3,
+    actions: Sequence[str] = ACTIONS,
+    formats: Sequence[str] = tuple(OUTPUT_FORMATTERS),
+) -> Dict[str, Any]:
+    """Замеряет размер файла результата и время его записи в каждом формате.
+
+    Файлы читаются и обрабатываются один раз на действие, замеряется только
+    запись результата.
+    """
+    corpus = generate_corpus(workdir, spec)
+    file_system = LocalFileSystemAdapter()
+    file_processor = FileProcessorService(file_system, TextProcessingService())
+    files_content = FileRepository(MmapFileSystemAdapter()).get_multiple_files(
+        corpus.file_paths
+    )
+    output_dir = os.path.join(workdir, "results")
+    os.makedirs(output_dir, exist_ok=True)
+
+    rows = []
+    for action in actions:
+        columnar = file_processor.process_files_columnar(files_content, action)
+        result = file_processor.create_processing_result(
+            corpus.config_path,
+            Config(id=action, mode="dir", path=corpus.directory, action=action),
+            columnar.out,
+        )
+        for output_format in formats:
+            formatter = OUTPUT_FORMATTERS[output_format]
+            output_path = os.path.join(
+                output_dir, f"result_{action}.{formatter.EXTENSION}"
+            )
+            _, timings, _ = measure(
+                lambda: formatter.save_to_file(result, output_path),
+                repeat,
+                trace_memory=False,
+            )
+            seconds = min(timings)
+            size = os.path.getsize(output_path)
+            rows.append(
+                {
+                    "action": action,
+                    "format": output_format,
+                    "bytes": size,
+                    "seconds": seconds,
+                    "bytes_per_second": size / seconds if seconds else None,
+                }
+            )
+
+    return {
+        "format_version": FORMAT_VERSION,
+        "corpus": dict(
+            spec.to_dict(),
+            total_lines=corpus.total_lines,
+            total_bytes=corpus.total_bytes,
+        ),
+        "formats": rows,
+    }
+
+
+def format_table(results: Dict[str, Any]) -> str:
+    """Форматирует замеры форматов в таблицу для консоли."""
+    json_sizes = {
+        row["action"]: row["bytes"]
+        for row in results["formats"]
+        if row["format"] == "json"
+    }
+    lines = [
+        f"{'Действие':<10} {'Формат':<8} {'Размер, МБ':>11} {'От JSON':>8} {'Запись, с':>10}"
+    ]
+    for row in results["formats"]:
+        json_size = json_sizes.get(row["action"])
+        ratio = f"{row['bytes'] / json_size:>8.2f}" if json_size else f"{'-':>8}"
+        lines.append(
+            f"{row['action']:<10} {row['format']:<8} {row['bytes'] / 1e6:>11.2f} "
+            f"{ratio} {row['seconds']:>10.4f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: List[str] = None) -> int:
+    """Точка входа: python -m benchmarks.formats [параметры]."""
+    defaults = CorpusSpec(configs=1)
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.formats",
+        description="Размер и время записи результата в каждом формате",
+    )
+    parser.add_argument("--files", type=int, default=defaults.files)
+    parser.add_argument("--lines", type=int, default=defaults.lines)
+    parser.add_argument("--line-length", type=int, default=defaults.line_length)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--actions",
+        default=",".join(ACTIONS),
+        help="действия через запятую (по умолчанию все)",
+    )
+    parser.add_argument(
+        "--formats",
+        default=",".join(OUTPUT_FORMATTERS),
+        help="форматы через запятую (по умолчанию все)",
+    )
+    parser.add_argument("--output", help="путь для сохранения результатов в JSON")
+    args = parser.parse_args(argv)
+
+    actions = [action.strip() for action in args.actions.split(",") if action.strip()]
+    formats = [name.strip() for name in args.formats.split(",") if name.strip()]
+    for name in formats:
+        if name not in OUTPUT_FORMATTERS:
+            parser.error(f"неизвестный формат: {name}")
+
+    spec = CorpusSpec(
+        files=args.files,
+        lines=args.lines,
+        line_length=args.line_length,
+        configs=1,
+        seed=args.seed,
+    )
+    with tempfile.TemporaryDirectory() as workdir:
+        results = measure_formats(spec, workdir, max(1, args.repeat), actions, formats)
+
+    if args.output:
+        save_results(results, args.output)
+    print(format_table(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
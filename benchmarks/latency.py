@@ -0,0 +1,147 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from benchmarks.corpus import CorpusSpec, generate_corpus
+from benchmarks.runner import FORMAT_VERSION, save_results
+from presentation.server import ServerClient
+
+SCRIPT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "script.py"
+)
+
+
+def summarize(timings: List[float]) -> Dict[str, Any]:
+    """Сводит замеры задержки в медиану, 95-й перцентиль, минимум и среднее."""
+    ordered = sorted(timings)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "runs": len(ordered),
+        "min": ordered[0],
+        "median": ordered[len(ordered) // 2],
+        "p95": ordered[p95_index],
+        "mean": sum(ordered) / len(ordered),
+    }
+
+
+def time_calls(func: Callable[[], Any], runs: int) -> List[float]:
+    """Замеряет время runs последовательных вызовов func."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_cli(args: List[str], cwd: str) -> None:
+    """Запускает командную строку в отдельном процессе интерпретатора."""
+    subprocess.run(
+        [sys.executable, SCRIPT_PATH, *args],
+        cwd=cwd,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def wait_for_server(client: ServerClient, timeout: float = 10.0) -> None:
+    """Ждёт, пока сервер начнёт отвечать."""
+    deadline = time.monotonic() + timeout
+    while not client.is_available():
+        if time.monotonic() > deadline:
+            raise TimeoutError("Сервер не запустился")
+        time.sleep(0.02)
+
+
+def measure_latency(
+    spec: CorpusSpec, runs: int, workdir: str, config_id: str = "1"
+) -> Dict[str, Any]:
+    """Сравнивает задержку холодного запуска CLI и запросов к серверу.
+
+    Кэш результатов отключён в обоих случаях, чтобы сравнивалась обработка,
+    а не копирование готового файла.
+    """
+    corpus = generate_corpus(workdir, spec)
+    socket_path = os.path.join(workdir, "server.sock")
+    config_args = [corpus.config_path, config_id, "--no-cache"]
+
+    server = subprocess.Popen(
+        [sys.executable, SCRIPT_PATH, f"--serve={socket_path}", "--no-cache"],
+        cwd=workdir,
+        stdout=subprocess.DEVNULL,
+    )
+    client = ServerClient(socket_path)
+    try:
+        wait_for_server(client)
+        cold_cli = time_calls(lambda: run_cli(config_args, workdir), runs)
+        cli_via_server = time_calls(
+            lambda: run_cli(config_args + [f"--server={socket_path}"], workdir), runs
+        )
+
+        previous_cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            client_call = time_calls(
+                lambda: client.run(corpus.config_path, [config_id]), runs
+            )
+        finally:
+            os.chdir(previous_cwd)
+    finally:
+        if client.is_available():
+            client.request({"command": "shutdown"})
+        server.wait(timeout=10)
+
+    return {
+        "format_version": FORMAT_VERSION,
+        "corpus": dict(
+            spec.to_dict(),
+            total_lines=corpus.total_lines,
+            total_bytes=corpus.total_bytes,
+        ),
+        "latency": {
+            "cold_cli": summarize(cold_cli),
+            "cli_via_server": summarize(cli_via_server),
+            "client_call": summarize(client_call),
+        },
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    """Точка входа: python -m benchmarks.latency [параметры]."""
+    defaults = CorpusSpec(files=3, lines=1_000, configs=1)
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.latency",
+        description="Задержка холодного запуска CLI и запросов к серверу",
+    )
+    parser.add_argument("--files", type=int, default=defaults.files)
+    parser.add_argument("--lines", type=int, default=defaults.lines)
+    parser.add_argument("--line-length", type=int, default=defaults.line_length)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", help="путь для сохранения результатов в JSON")
+    args = parser.parse_args(argv)
+
+    spec = CorpusSpec(
+        files=args.files,
+        lines=args.lines,
+        line_length=args.line_length,
+        configs=1,
+        seed=args.seed,
+    )
+    with tempfile.TemporaryDirectory() as workdir:
+        results = measure_latency(spec, max(1, args.runs), workdir)
+
+    if args.output:
+        save_results(results, args.output)
+    print(f"{'Способ':<16} {'Медиана, мс':>12} {'p95, мс':>10}")
+    for name, stats in results["latency"].items():
+        print(f"{name:<16} {stats['median'] * 1e3:>12.1f} {stats['p95'] * 1e3:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
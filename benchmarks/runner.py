@@ -0,0 +1,250 @@
+import json
+import os
+import platform
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from benchmarks.corpus import ACTIONS, Corpus
+from domain import Config, TextProcessingService
+from domain import services as domain_services
+from application.services import ConfigService, FileProcessorService
+from infrastructure.adapters import (
+    ConfigFileAdapter,
+    LocalFileSystemAdapter,
+    MmapFileSystemAdapter,
+)
+from infrastructure.repositories import FileRepository
+from presentation import JsonFormatter
+
+FORMAT_VERSION = 1
+
+
+def measure(
+    func: Callable[[], Any], repeat: int, trace_memory: bool = True
+) -> Tuple[Any, List[float], Optional[int]]:
+    """Выполняет func repeat раз и, если нужно, ещё один раз под tracemalloc.
+
+    Возвращает результат последнего вызова, времена всех замеров и пиковый
+    объём памяти Python, выделенной за контрольный вызов, или None.
+    """
+    timings = []
+    value = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = func()
+        timings.append(time.perf_counter() - start)
+
+    if not trace_memory:
+        return value, timings, None
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return value, timings, peak
+
+
+class BenchmarkRunner:
+    """Измеряет время, пропускную способность и пиковую память этапов обработки."""
+
+    READERS = {"local": LocalFileSystemAdapter, "mmap": MmapFileSystemAdapter}
+
+    def __init__(
+        self,
+        corpus: Corpus,
+        repeat: int = 3,
+        reader: str = "mmap",
+        actions: Sequence[str] = ACTIONS,
+        trace_memory: bool = True,
+    ):
+        if reader not in self.READERS:
+            raise ValueError(f"Неизвестный способ чтения файлов: {reader}")
+        self.corpus = corpus
+        self.repeat = max(1, repeat)
+        self.reader = reader
+        self.actions = list(actions)
+        self.trace_memory = trace_memory
+
+        self.file_system = LocalFileSystemAdapter()
+        self.config_adapter = ConfigFileAdapter(self.file_system)
+        self.config_service = ConfigService(self.config_adapter, self.file_system)
+        self.file_processor = FileProcessorService(
+            self.file_system, TextProcessingService()
+        )
+        self.output_dir = os.path.join(corpus.directory, "results")
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    def run(self) -> Dict[str, Any]:
+        """Прогоняет все этапы и возвращает результаты в виде словаря для JSON."""
+        self.stages = {}
+        corpus = self.corpus
+
+        configs = self.stage(
+            "config_parse",
+            lambda: self.config_service.read_configs(corpus.config_path),
+            items=corpus.spec.configs,
+            size=os.path.getsize(corpus.config_path),
+        )
+        self.stage(
+            "listing",
+            lambda: [self.config_service.get_files_from_config(c) for c in configs],
+            items=len(configs),
+        )
+        files_content = self.stage(
+            "read",
+            lambda: self.read_files(corpus.file_paths),
+            items=corpus.total_lines,
+            size=corpus.total_bytes,
+        )
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        for action in self.actions:
+            columnar = self.stage(
+                f"process_{action}",
+                lambda: self.file_processor.process_files_columnar(
+                    files_content, action
+                ),
+                items=corpus.total_lines,
+                size=corpus.total_bytes,
+            )
+            result = self.file_processor.create_processing_result(
+                corpus.config_path,
+                Config(id=action, mode="dir", path=corpus.directory, action=action),
+                columnar.out,
+            )
+            output_size = len(JsonFormatter.format_result(result).encode("utf-8"))
+            self.stage(
+                f"serialize_{action}",
+                lambda: JsonFormatter.format_result(result),
+                items=columnar.max_lines,
+                size=output_size,
+            )
+            output_path = os.path.join(self.output_dir, f"result_{action}.json")
+            self.stage(
+                f"write_{action}",
+                lambda: JsonFormatter.save_to_file(result, output_path),
+                items=columnar.max_lines,
+                size=output_size,
+            )
+
+        return {
+            "format_version": FORMAT_VERSION,
+            "environment": self.environment(),
+            "corpus": dict(
+                corpus.spec.to_dict(),
+                total_lines=corpus.total_lines,
+                total_bytes=corpus.total_bytes,
+            ),
+            "stages": self.stages,
+        }
+
+    def stage(
+        self, name: str, func: Callable[[], Any], items: int = 0, size: int = 0
+    ) -> Any:
+        """Измеряет один этап и сохраняет его показатели под именем name."""
+        value, timings, peak = measure(func, self.repeat, self.trace_memory)
+        seconds = min(timings)
+        self.stages[name] = {
+            "seconds": seconds,
+            "mean_seconds": sum(timings) / len(timings),
+            "repeat": len(timings),
+            "items": items,
+            "bytes": size,
+            "items_per_second": items / seconds if seconds else None,
+            "bytes_per_second": size / seconds if seconds else None,
+            "peak_memory_bytes": peak,
+        }
+        return value
+
+    def read_files(self, file_paths: List[str]):
+        """Читает файлы через новый репозиторий, чтобы не попадать в его кэш."""
+        repository = FileRepository(self.READERS[self.reader]())
+        files_content = repository.get_multiple_files(file_paths)
+        for file_content in files_content:
+            len(file_content.lines)
+        return files_content
+
+    def environment(self) -> Dict[str, Any]:
+        """Описывает окружение, в котором выполнялись замеры."""
+        return {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "numpy": domain_services.load_numpy() is not None,
+            "reader": self.reader,
+            "repeat": self.repeat,
+        }
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.1,
+    min_delta: float = 0.001,
+) -> List[Dict[str, Any]]:
+    """Сравнивает время этапов с базовым прогоном.
+
+    Этап считается замедлившимся, если его время больше базового более чем
+    на долю tolerance и не меньше чем на min_delta секунд, чтобы шум коротких
+    этапов не давал ложных срабатываний. Этапы, отсутствующие в одном из
+    прогонов, пропускаются.
+    """
+    rows = []
+    baseline_stages = baseline.get("stages", {})
+    for name, stage in current.get("stages", {}).items():
+        if name not in baseline_stages:
+            continue
+        baseline_seconds = baseline_stages[name]["seconds"]
+        seconds = stage["seconds"]
+        ratio = seconds / baseline_seconds if baseline_seconds else None
+        rows.append(
+            {
+                "stage": name,
+                "baseline_seconds": baseline_seconds,
+                "seconds": seconds,
+                "ratio": ratio,
+                "regressed": (
+                    ratio is not None
+                    and ratio > 1 + tolerance
+                    and seconds - baseline_seconds >= min_delta
+                ),
+            }
+        )
+    return rows
+
+
+def save_results(results: Dict[str, Any], file_path: str) -> None:
+    """Сохраняет результаты бенчмарка в JSON файл."""
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def load_results(file_path: str) -> Dict[str, Any]:
+    """Загружает результаты бенчмарка из JSON файла."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def format_report(
+    results: Dict[str, Any], comparison: List[Dict[str, Any]] = None
+) -> str:
+    """Форматирует результаты бенчмарка в таблицу для консоли."""
+    ratios = {row["stage"]: row for row in comparison or []}
+    lines = [f"{'Этап':<20} {'Время, с':>10} {'МБ/с':>10} {'Пик, МБ':>10}  Базовый"]
+    for name, stage in results["stages"].items():
+        speed = stage["bytes_per_second"] or 0
+        peak = stage["peak_memory_bytes"]
+        line = f"{name:<20} {stage['seconds']:>10.4f} {speed / 1e6:>10.1f} " + (
+            f"{peak / 1e6:>10.1f}" if peak is not None else f"{'-':>10}"
+        )
+        row = ratios.get(name)
+        if row is not None and row["ratio"] is not None:
+            line += f"  x{row['ratio']:.2f}"
+            if row["regressed"]:
+                line += " ЗАМЕДЛЕНИЕ"
+        lines.append(line)
+    return "\n".join(lines)
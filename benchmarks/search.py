@@ -0,0 +1,179 @@
+import argparse
+import random
+import sys
+import tempfile
+from typing import Any, Callable, Dict, List, Sequence
+
+from benchmarks.corpus import _WORDS, CorpusSpec, generate_corpus
+from benchmarks.runner import FORMAT_VERSION, measure, save_results
+from domain import AhoCorasickMatcher, CompactLines, RegexMatcher
+from domain import TextProcessingService
+from application.services import FileProcessorService
+from infrastructure.adapters import LocalFileSystemAdapter
+
+PATTERN_COUNTS = (1, 10, 100, 1000)
+_LETTERS = "abcdefghijklmnopqrstuvwxyzабвгдеёжзийклмнопрстуфхцчшщъыьэюя"
+
+
+def make_patterns(count: int, seed: int = 0) -> List[str]:
+    """Создаёт count шаблонов: слова корпуса, затем случайные слова."""
+    rng = random.Random(seed)
+    patterns = list(_WORDS[:count])
+    seen = set(patterns)
+    while len(patterns) < count:
+        pattern = "".join(rng.choice(_LETTERS) for _ in range(rng.randint(3, 8)))
+        if pattern not in seen:
+            seen.add(pattern)
+            patterns.append(pattern)
+    return patterns
+
+
+def naive_search(texts: Sequence[Sequence[str]], patterns: Sequence[str]) -> int:
+    """Ищет каждый шаблон в каждой строке отдельно; возвращает число вхождений."""
+    matches = 0
+    for lines in texts:
+        for line in lines:
+            for pattern in patterns:
+                start = line.find(pattern)
+                while start != -1:
+                    matches += 1
+                    start = line.find(pattern, start + 1)
+    return matches
+
+
+def matcher_search(matcher_class: Callable) -> Callable[[Sequence, Sequence], int]:
+    """Возвращает поиск по текстам файлов заранее скомпилированным матчером."""
+
+    def search(texts: Sequence[Sequence[str]], patterns: Sequence[str]) -> int:
+        matcher = matcher_class(patterns)
+        return sum(sum(1 for _ in matcher.finditer(lines.text)) for lines in texts)
+
+    return search
+
+
+def measure_search(
+    spec: CorpusSpec,
+    workdir: str,
+    repeat: int = 3,
+    pattern_counts: Sequence[int] = PATTERN_COUNTS,
+) -> Dict[str, Any]:
+    """Сравнивает поиск набора шаблонов разными способами.
+
+    naive - цикл по шаблонам для каждой строки, regex и aho_corasick -
+    один проход по тексту файла скомпилированным матчером, action - действие
+    search целиком (выбор матчера и разбивка вхождений по строкам).
+    """
+    corpus = generate_corpus(workdir, spec)
+    file_system = LocalFileSystemAdapter()
+    texts = [
+        CompactLines.from_lines(file_system.iter_lines(file_path))
+        for file_path in corpus.file_paths
+    ]
+    chars = sum(len(lines.text) for lines in texts)
+    file_processor = FileProcessorService(file_system, TextProcessingService())
+
+    def run_action(texts: Sequence[Sequence[str]], patterns: Sequence[str]) -> int:
+        result = file_processor.collect_matches(texts, patterns)
+        return sum(sum(matches.patterns.values()) for matches in result.files)
+
+    methods = {
+        "naive": naive_search,
+        "regex": matcher_search(RegexMatcher),
+        "aho_corasick": matcher_search(AhoCorasickMatcher),
+        "action": run_action,
+    }
+
+    rows = []
+    for count in pattern_counts:
+        patterns = make_patterns(count, spec.seed)
+        for name, method in methods.items():
+            matches, timings, _ = measure(
+                lambda: method(texts, patterns), repeat, trace_memory=False
+            )
+            seconds = min(timings)
+            rows.append(
+                {
+                    "patterns": count,
+                    "method": name,
+                    "matches": matches,
+                    "seconds": seconds,
+                    "chars_per_second": chars / seconds if seconds else None,
+                }
+            )
+
+    return {
+        "format_version": FORMAT_VERSION,
+        "corpus": dict(
+            spec.to_dict(),
+            total_lines=corpus.total_lines,
+            total_bytes=corpus.total_bytes,
+            total_chars=chars,
+        ),
+        "search": rows,
+    }
+
+
+def format_table(results: Dict[str, Any]) -> str:
+    """Форматирует замеры поиска в таблицу для консоли."""
+    naive = {
+        row["patterns"]: row["seconds"]
+        for row in results["search"]
+        if row["method"] == "naive"
+    }
+    lines = [
+        f"{'Шаблонов':>8} {'Способ':<13} {'Вхождений':>10} {'Время, с':>9} "
+        f"{'Мсимв/с':>8} {'Быстрее naive':>14}"
+    ]
+    for row in results["search"]:
+        speedup = naive[row["patterns"]] / row["seconds"] if row["seconds"] else 0
+        lines.append(
+            f"{row['patterns']:>8} {row['method']:<13} {row['matches']:>10} "
+            f"{row['seconds']:>9.4f} {row['chars_per_second'] / 1e6:>8.1f} "
+            f"{speedup:>14.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: List[str] = None) -> int:
+    """Точка входа: python -m benchmarks.search [параметры]."""
+    defaults = CorpusSpec(configs=1)
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.search",
+        description="Поиск набора шаблонов: автомат и выражение против цикла",
+    )
+    parser.add_argument("--files", type=int, default=defaults.files)
+    parser.add_argument("--lines", type=int, default=defaults.lines)
+    parser.add_argument("--line-length", type=int, default=defaults.line_length)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--patterns",
+        default=",".join(map(str, PATTERN_COUNTS)),
+        help="числа шаблонов через запятую",
+    )
+    parser.add_argument("--output", help="путь для сохранения результатов в JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        counts = [int(count) for count in args.patterns.split(",") if count.strip()]
+    except ValueError:
+        parser.error(f"неверный список чисел шаблонов: {args.patterns}")
+
+    spec = CorpusSpec(
+        files=args.files,
+        lines=args.lines,
+        line_length=args.line_length,
+        configs=1,
+        seed=args.seed,
+    )
+    with tempfile.TemporaryDirectory() as workdir:
+        results = measure_search(spec, workdir, max(1, args.repeat), counts)
+
+    if args.output:
+        save_results(results, args.output)
+    print(format_table(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,2 +1,20 @@
-from .models import Config, FileContent, ProcessingResult
-from .services import TextProcessingService
+from .models import (
+    ColumnarOut,
+    ColumnarResult,
+    CompactLines,
+    Config,
+    FileContent,
+    FileMatches,
+    FileStats,
+    ProcessingResult,
+    ResultManifest,
+    SearchResult,
+    StatRecord,
+    StatsResult,
+)
+from .services import (
+    AhoCorasickMatcher,
+    RegexMatcher,
+    TextProcessingService,
+    compile_patterns,
+)
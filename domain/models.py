@@ -1,5 +1,12 @@
-from dataclasses import dataclass
-from typing import Dict, List, Union
+import heapq
+import sys
+from array import array
+from collections import Counter
+from collections.abc import ItemsView, Mapping
+from collections.abc import Sequence as SequenceABC
+from itertools import accumulate, chain, islice, repeat
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 
 @dataclass
@@ -10,14 +17,442 @@ class Config:
     mode: str
     path: str
     action: str = "string"
+    workers: int = 1
+    recursive: bool = False
+    include: str = ""
+    exclude: str = ""
+    patterns: str = ""
+    patterns_file: str = ""
+
+
+class CompactLines(SequenceABC):
+    """Компактное хранение строк файла: один буфер текста и массив смещений.
+
+    Строки хранятся в одной строке через \\n, а в _offsets лежат начала строк
+    и завершающая отметка, поэтому на строку уходит 4-8 байт вместо
+    отдельного объекта str. Поддерживает len(), индексы, срезы и перебор.
+    """
+
+    __slots__ = ("_text", "_offsets")
+
+    def __init__(self, text: str, offsets: array):
+        self._text = text
+        self._offsets = offsets
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "CompactLines":
+        """Создаёт представление из последовательности строк без \\n."""
+        lines = list(lines)
+        if not lines:
+            return cls("", array("I", [0]))
+        text = "\n".join(lines)
+        typecode = "I" if len(text) < 2**32 - 1 else "Q"
+        offsets = array(typecode, [0])
+        offsets.extend(accumulate(len(line) + 1 for line in lines))
+        return cls(text, offsets)
+
+    @classmethod
+    def from_text(cls, text: str) -> "CompactLines":
+        """Создаёт представление из текста файла с переводами строк \\n."""
+        if not text:
+            return cls.from_lines([])
+        if text.endswith("\n"):
+            text = text[:-1]
+        # Текст остаётся как есть: без промежуточного списка строк и повторной
+        # склейки индекс строится поиском переводов строк.
+        typecode = "I" if len(text) < 2**32 - 1 else "Q"
+        offsets = array(typecode, [0])
+        find = text.find
+        position = find("\n")
+        while position != -1:
+            offsets.append(position + 1)
+            position = find("\n", position + 1)
+        offsets.append(len(text) + 1)
+        return cls(text, offsets)
+
+    @property
+    def text(self) -> str:
+        """Текст всех строк, соединённых через \\n."""
+        return self._text
+
+    @property
+    def offsets(self) -> array:
+        """Начала строк в тексте и завершающая отметка len(text) + 1."""
+        return self._offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, "CompactLines"]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if stop <= start:
+                return CompactLines.from_lines([])
+            base = self._offsets[start]
+            end = self._offsets[stop] - 1
+            offsets = islice(self._offsets, start, stop + 1)
+            return CompactLines(
+                self._text[base:end],
+                array(self._offsets.typecode, (offset - base for offset in offsets)),
+            )
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("индекс строки вне диапазона")
+        start = self._offsets[index]
+        end = self._offsets[index + 1] - 1
+        return self._text[start:end]
+
+    def __iter__(self) -> Iterator[str]:
+        text = self._text
+        offsets = self._offsets
+        for start, next_start in zip(offsets, islice(offsets, 1, None)):
+            end = next_start - 1
+            yield text[start:end]
+
+    def tolist(self) -> List[str]:
+        """Возвращает строки списком, разбивая общий текст одним split."""
+        if not len(self):
+            return []
+        lines = self._text.split("\n")
+        # Строка, переданная в from_lines вместе с \n, разбилась бы на две.
+        return lines if len(lines) == len(self) else list(self)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CompactLines):
+            return self._text == other._text and self._offsets == other._offsets
+        if isinstance(other, SequenceABC) and not isinstance(other, str):
+            return len(self) == len(other) and all(
+                line == other_line for line, other_line in zip(self, other)
+            )
+        return NotImplemented
+
+    def __sizeof__(self) -> int:
+        return (
+            object.__sizeof__(self)
+            + sys.getsizeof(self._text)
+            + sys.getsizeof(self._offsets)
+        )
+
+    def __reduce__(self):
+        return CompactLines, (self._text, self._offsets)
+
+    def __repr__(self) -> str:
+        return f"CompactLines({list(self)!r})"
 
 
 @dataclass
 class FileContent:
     """Доменная модель содержимого файла."""
 
+    __slots__ = ("file_path", "lines")
+
     file_path: str
-    lines: List[str]
+    lines: Sequence[str]
+
+
+@dataclass(frozen=True)
+class StatRecord:
+    """Результат одного stat файла: тип, размер и время изменения."""
+
+    is_file: bool
+    size: int
+    mtime_ns: int
+
+    @property
+    def signature(self) -> Tuple[int, int]:
+        """Подпись (st_mtime_ns, st_size), как у get_file_signature."""
+        return self.mtime_ns, self.size
+
+
+@dataclass
+class ColumnarResult:
+    """Результат обработки, хранящийся по столбцам файлов.
+
+    Для действия count столбец - array('q'), для остальных - список строк.
+    Ячейки дополнения до самого длинного файла не хранятся.
+    """
+
+    action: str
+    columns: List[Union[array, List[str]]]
+
+    def __post_init__(self):
+        if self.action == "count":
+            self.columns = [
+                column if isinstance(column, array) else array("q", column)
+                for column in self.columns
+            ]
+
+    @property
+    def line_counts(self) -> List[int]:
+        """Число строк в каждом файле."""
+        return [len(column) for column in self.columns]
+
+    @property
+    def max_lines(self) -> int:
+        """Число строк в самом длинном файле."""
+        return max(self.line_counts) if self.columns else 0
+
+    @property
+    def padding(self) -> Union[str, int]:
+        """Значение ячейки для строк за концом файла."""
+        return 0 if self.action == "count" else ""
+
+    def row(self, line_num: int) -> Dict[str, Union[str, int]]:
+        """Возвращает строку результата с номером line_num (с 1)."""
+        line_idx = line_num - 1
+        padding = self.padding
+        return {
+            str(file_idx + 1): column[line_idx] if line_idx < len(column) else padding
+            for file_idx, column in enumerate(self.columns)
+        }
+
+    def rows(self) -> Iterator[Tuple[str, Dict[str, Union[str, int]]]]:
+        """Лениво перебирает строки результата."""
+        for line_num in range(1, self.max_lines + 1):
+            yield str(line_num), self.row(line_num)
+
+    def sparse_row(self, line_num: int) -> Dict[str, Union[str, int]]:
+        """Возвращает строку line_num только с ячейками файлов, где она есть."""
+        line_idx = line_num - 1
+        return {
+            str(file_idx + 1): column[line_idx]
+            for file_idx, column in enumerate(self.columns)
+            if line_idx < len(column)
+        }
+
+    def sparse_rows(self) -> Iterator[Tuple[str, Dict[str, Union[str, int]]]]:
+        """Лениво перебирает строки без ячеек дополнения.
+
+        Файлы, которые уже закончились, исключаются из перебора, поэтому
+        время пропорционально числу настоящих ячеек, а не max_lines * файлы.
+        """
+        line_counts = self.line_counts
+        by_length = sorted(range(len(line_counts)), key=line_counts.__getitem__)
+        active = [
+            (str(file_idx + 1), column) for file_idx, column in enumerate(self.columns)
+        ]
+        ended = 0
+        for line_idx in range(self.max_lines):
+            if line_counts[by_length[ended]] <= line_idx:
+                while line_counts[by_length[ended]] <= line_idx:
+                    ended += 1
+                active = [
+                    (key, column) for key, column in active if len(column) > line_idx
+                ]
+            yield str(line_idx + 1), {key: column[line_idx] for key, column in active}
+
+    @property
+    def out(self) -> "ColumnarOut":
+        """Представление в прежнем виде {номер строки: {номер файла: значение}}."""
+        return ColumnarOut(self)
+
+    @property
+    def sparse_out(self) -> "ColumnarOut":
+        """Представление out без ячеек дополнения коротких файлов."""
+        return ColumnarOut(self, sparse=True)
+
+
+class ColumnarOut(Mapping):
+    """Ленивое представление столбцового результата в виде словаря out.
+
+    При sparse строки содержат только ячейки файлов, в которых они есть.
+    """
+
+    def __init__(self, result: ColumnarResult, sparse: bool = False):
+        self.result = result
+        self.sparse = sparse
+        self._max_lines = result.max_lines
+
+    def __getitem__(self, key: str) -> Dict[str, Union[str, int]]:
+        if not isinstance(key, str) or not key.isdigit() or str(int(key)) != key:
+            raise KeyError(key)
+        line_num = int(key)
+        if not 1 <= line_num <= self._max_lines:
+            raise KeyError(key)
+        if self.sparse:
+            return self.result.sparse_row(line_num)
+        return self.result.row(line_num)
+
+    def __iter__(self) -> Iterator[str]:
+        return (str(line_num) for line_num in range(1, self._max_lines + 1))
+
+    def __len__(self) -> int:
+        return self._max_lines
+
+    def items(self) -> ItemsView:
+        return _ColumnarItems(self)
+
+    def __repr__(self) -> str:
+        return f"ColumnarOut({dict(self.items())!r})"
+
+
+class _ColumnarItems(ItemsView):
+    """Пары (номер строки, строка), перебираемые напрямую по столбцам."""
+
+    def __iter__(self):
+        mapping = self._mapping
+        if mapping.sparse:
+            return mapping.result.sparse_rows()
+        return mapping.result.rows()
+
+
+@dataclass
+class FileStats:
+    """Сводная статистика строк файла, накапливаемая порциями за один проход.
+
+    Гистограмма длин строк хранится по степеням двойки: корзина b содержит
+    строки длиной от 2**(b-1) до 2**b - 1 (корзина 0 - пустые строки). В
+    longest лежат top_n самых длинных строк как (длина, -файл, -строка), чтобы
+    при равной длине выше стояли более ранние строки.
+    """
+
+    file_num: int = 0
+    top_n: int = 10
+    lines: int = 0
+    words: int = 0
+    chars: int = 0
+    histogram: Dict[int, int] = field(default_factory=dict)
+    longest: List[Tuple[int, int, int]] = field(default_factory=list)
+
+    def update(self, lengths: Sequence[int], words: int) -> None:
+        """Добавляет порцию следующих подряд строк по их длинам и числу слов."""
+        first_line = self.lines + 1
+        self.lines += len(lengths)
+        self.words += words
+        self.chars += sum(lengths)
+        histogram = self.histogram
+        for bucket, size in Counter(map(int.bit_length, lengths)).items():
+            histogram[bucket] = histogram.get(bucket, 0) + size
+        if self.top_n:
+            line_keys = range(-first_line, -first_line - len(lengths), -1)
+            candidates = zip(lengths, repeat(-self.file_num), line_keys)
+            self.longest = heapq.nlargest(self.top_n, chain(self.longest, candidates))
+
+    def merge(self, other: "FileStats") -> None:
+        """Добавляет статистику другого файла (для сводки по всем файлам)."""
+        self.lines += other.lines
+        self.words += other.words
+        self.chars += other.chars
+        for bucket, size in other.histogram.items():
+            self.histogram[bucket] = self.histogram.get(bucket, 0) + size
+        self.longest = heapq.nlargest(self.top_n, self.longest + other.longest)
+
+    @staticmethod
+    def bucket_label(bucket: int) -> str:
+        """Возвращает подпись корзины гистограммы: "0", "1", "2-3", "4-7"..."""
+        if bucket <= 1:
+            return str(bucket)
+        return f"{1 << (bucket - 1)}-{(1 << bucket) - 1}"
+
+    def to_dict(self, with_file: bool = False) -> Dict[str, object]:
+        """Представление для записи в результат."""
+        longest = []
+        for length, file_key, line_key in self.longest:
+            entry = {"file": -file_key} if with_file else {}
+            entry.update(line=-line_key, length=length)
+            longest.append(entry)
+        return {
+            "lines": self.lines,
+            "words": self.words,
+            "chars": self.chars,
+            "emptyLines": self.histogram.get(0, 0),
+            "maxLength": self.longest[0][0] if self.longest else 0,
+            "meanLength": round(self.chars / self.lines, 2) if self.lines else 0,
+            "histogram": {
+                self.bucket_label(bucket): self.histogram[bucket]
+                for bucket in sorted(self.histogram)
+            },
+            "longest": longest,
+        }
+
+
+@dataclass
+class StatsResult:
+    """Результат действия stats: статистика каждого файла и всех вместе."""
+
+    files: List[FileStats]
+
+    @property
+    def corpus(self) -> FileStats:
+        """Сводная статистика всех файлов."""
+        top_n = max((stats.top_n for stats in self.files), default=0)
+        corpus = FileStats(top_n=top_n)
+        for stats in self.files:
+            corpus.merge(stats)
+        return corpus
+
+    def to_dict(self) -> Dict[str, Dict[str, object]]:
+        """Представление out: {"files": {номер файла: ...}, "corpus": ...}."""
+        return {
+            "files": {
+                str(file_idx + 1): stats.to_dict()
+                for file_idx, stats in enumerate(self.files)
+            },
+            "corpus": self.corpus.to_dict(with_file=True),
+        }
+
+
+@dataclass
+class FileMatches:
+    """Вхождения шаблонов поиска в одном файле: по строкам и всего."""
+
+    lines: Dict[int, Dict[str, int]] = field(default_factory=dict)
+    patterns: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, line_num: int, pattern: str) -> None:
+        """Учитывает одно вхождение шаблона в строке line_num."""
+        line = self.lines.get(line_num)
+        if line is None:
+            line = self.lines[line_num] = {}
+        line[pattern] = line.get(pattern, 0) + 1
+        self.patterns[pattern] = self.patterns.get(pattern, 0) + 1
+
+    def count_patterns(self) -> None:
+        """Пересчитывает итоги по шаблонам из вхождений по строкам."""
+        totals: Dict[str, int] = {}
+        for line in self.lines.values():
+            for pattern, count in line.items():
+                totals[pattern] = totals.get(pattern, 0) + count
+        self.patterns = totals
+
+    def to_dict(self) -> Dict[str, object]:
+        """Представление для записи в результат."""
+        return {
+            "matches": sum(self.patterns.values()),
+            "matchedLines": len(self.lines),
+            "patterns": self.patterns,
+            "lines": {str(line_num): line for line_num, line in self.lines.items()},
+        }
+
+
+@dataclass
+class SearchResult:
+    """Результат действия search: вхождения шаблонов в каждом файле и всего."""
+
+    patterns: List[str]
+    files: List[FileMatches]
+
+    def to_dict(self) -> Dict[str, object]:
+        """Представление out: шаблоны, {"files": {номер файла: ...}} и corpus."""
+        totals = {pattern: 0 for pattern in self.patterns}
+        for matches in self.files:
+            for pattern, count in matches.patterns.items():
+                totals[pattern] += count
+        return {
+            "patterns": self.patterns,
+            "files": {
+                str(file_idx + 1): matches.to_dict()
+                for file_idx, matches in enumerate(self.files)
+            },
+            "corpus": {
+                "matches": sum(totals.values()),
+                "matchedFiles": sum(1 for matches in self.files if matches.lines),
+                "patterns": totals,
+            },
+        }
 
 
 @dataclass
@@ -27,4 +462,25 @@ class ProcessingResult:
     config_file: str
     config_id: str
     config_data: Dict[str, str]
-    out: Dict[str, Dict[str, Union[str, int]]]
+    out: Union[
+        Mapping,
+        StatsResult,
+        SearchResult,
+        Dict[str, Dict[str, Union[str, int]]],
+        Iterable[Tuple[str, Dict[str, Union[str, int]]]],
+    ]
+    # Число строк каждого файла для разреженного результата (строки out без
+    # дополнения); None - строки дополнены до самого длинного файла. При
+    # потоковой обработке список заполняется по мере перебора out.
+    line_counts: Optional[List[int]] = None
+
+
+@dataclass
+class ResultManifest:
+    """Сведения о входных файлах, из которых получен сохранённый результат."""
+
+    action: str
+    files: List[str]
+    signatures: List[Optional[Tuple[int, int]]]
+    line_counts: List[int]
+    result_signature: Optional[Tuple[int, int]] = None
@@ -1,21 +1,213 @@
+import re
+from array import array
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterator, List, Sequence, Tuple
+from domain.models import CompactLines
+
+# NumPy импортируется при первом подсчёте слов, а не при запуске: импорт
+# стоит десятков миллисекунд, а для справки и списка конфигураций не нужен.
+_NOT_LOADED = object()
+np = _NOT_LOADED
+
+# Самый старший пробельный символ Unicode для str.split() - U+3000.
+_MAX_WHITESPACE = 0x3000
+
+
+def load_numpy():
+    """Возвращает модуль numpy, импортируя его при первом вызове, или None."""
+    global np
+    if np is _NOT_LOADED:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - NumPy необязателен
+            numpy = None
+        np = numpy
+    return np
+
+
+@lru_cache(maxsize=1)
+def _whitespace_table():
+    """Таблица пробельных символов str.split() для кодов до U+3000."""
+    table = np.zeros(_MAX_WHITESPACE + 2, dtype=bool)
+    for code in range(_MAX_WHITESPACE + 1):
+        table[code] = chr(code).isspace()
+    return table
+
+
 class TextProcessingService:
     """Сервис для обработки текста."""
 
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def get_replace_table(file_number: int) -> Dict[int, str]:
+        """Возвращает таблицу замены английских букв для str.translate."""
+        table = {}
+        for offset in range(26):
+            value = str(offset + 1 + file_number)
+            table[ord("A") + offset] = value
+            table[ord("a") + offset] = value
+        return table
+
     @staticmethod
     def replace_letters(text: str, file_number: int) -> str:
         """Замена английских букв на числа."""
-        result = ""
-        for char in text:
-            order = ord(char)
-            if 65 <= order <= 90:  # Заглавные английские буквы
-                result += str(order - 64 + file_number)
-            elif 97 <= order <= 122:  # Строчные английские буквы
-                result += str(order - 96 + file_number)
-            else:
-                result += char
-        return result
+        return text.translate(TextProcessingService.get_replace_table(file_number))
+
+    @staticmethod
+    def replace_lines(lines: Sequence[str], file_number: int) -> List[str]:
+        """Замена английских букв на числа во всех строках файла."""
+        table = TextProcessingService.get_replace_table(file_number)
+        return [line.translate(table) for line in lines]
 
     @staticmethod
     def count_words(text: str) -> int:
         """Подсчет количества слов в строке."""
         return len(text.split())
+
+    @staticmethod
+    def count_words_bulk(lines: Sequence[str]) -> array:
+        """Подсчет количества слов в каждой строке файла за один проход.
+
+        При наличии NumPy общий текст файла разбирается как массив кодов
+        символов и считаются начала слов; другие последовательности строк
+        (порции потокового чтения) сначала собираются в CompactLines. Без
+        NumPy - str.split().
+        """
+        if load_numpy() is None:
+            return array("q", map(len, map(str.split, lines)))
+        if not isinstance(lines, CompactLines):
+            lines = CompactLines.from_lines(lines)
+
+        text, offsets = lines.text, lines.offsets
+        if text.isascii():
+            codes = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+        else:
+            codes = np.frombuffer(
+                text.encode("utf-32-le", "surrogatepass"), dtype=np.dtype("<u4")
+            )
+
+        # Пробельные символы ASCII: 9-13, 28-32; остальные ищутся по таблице.
+        is_space = (codes - codes.dtype.type(9)) <= 4
+        is_space |= (codes - codes.dtype.type(28)) <= 4
+        if codes.dtype != np.uint8:
+            high = np.flatnonzero(codes >= 0x85)
+            if high.size:
+                is_space[high] = _whitespace_table()[
+                    np.minimum(codes[high], _MAX_WHITESPACE + 1)
+                ]
+
+        word_starts = ~is_space
+        word_starts[1:] &= is_space[:-1]
+        positions = np.flatnonzero(word_starts)
+
+        bounds = np.asarray(offsets, dtype=np.int64)
+        counts = np.diff(np.searchsorted(positions, bounds))
+
+        result = array("q")
+        result.frombytes(counts.astype(np.int64).tobytes())
+        return result
+
+
+class RegexMatcher:
+    """Поиск набора строк одним составным регулярным выражением.
+
+    Варианты упорядочены от длинных к коротким, поэтому в каждой позиции
+    находится самый длинный шаблон, а остальные шаблоны, начинающиеся там же,
+    - его префиксы, и они добавляются по заранее построенной таблице. Так
+    находятся все вхождения, в том числе перекрывающиеся, как у автомата.
+    Проверка вариантов в позиции последовательна, поэтому подходит для
+    небольших наборов.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        ordered = sorted(set(patterns), key=len, reverse=True)
+        self.patterns = list(patterns)
+        self._search = re.compile("|".join(map(re.escape, ordered))).search
+        self._prefixes = {
+            pattern: [other for other in ordered if pattern.startswith(other)]
+            for pattern in ordered
+        }
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Перебирает пары (начало вхождения, шаблон) в порядке начала."""
+        search = self._search
+        prefixes = self._prefixes
+        match = search(text)
+        while match is not None:
+            start = match.start()
+            for pattern in prefixes[match.group()]:
+                yield start, pattern
+            match = search(text, start + 1)
+
+
+class AhoCorasickMatcher:
+    """Автомат Ахо-Корасик: время поиска линейно по длине текста.
+
+    Переходы каждого состояния хранят и переходы по цепочке суффиксных
+    ссылок, кроме переходов корня: символ без перехода ведёт по таблице
+    корня. Так поиск делает не больше двух обращений к словарю на символ
+    при любом числе шаблонов.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = list(patterns)
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[str, ...]] = [()]
+        for pattern in dict.fromkeys(patterns):
+            state = 0
+            for char in pattern:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append(())
+                state = next_state
+            outputs[state] += (pattern,)
+
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [{} for _ in goto]
+        delta[0] = goto[0]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            # Переходы по суффиксной ссылке (без переходов корня), затем свои.
+            delta[state] = dict(delta[fail[state]]) if fail[state] else {}
+            delta[state].update(goto[state])
+            for char, next_state in goto[state].items():
+                fallback = delta[fail[state]].get(char) if fail[state] else None
+                if fallback is None:
+                    fallback = goto[0].get(char, 0)
+                fail[next_state] = fallback
+                outputs[next_state] += outputs[fail[next_state]]
+                queue.append(next_state)
+        self._delta = delta
+        self._outputs = outputs
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Перебирает пары (начало вхождения, шаблон) в порядке конца."""
+        delta = self._delta
+        root = delta[0]
+        outputs = self._outputs
+        state = 0
+        for end, char in enumerate(text, 1):
+            next_state = delta[state].get(char)
+            state = root.get(char, 0) if next_state is None else next_state
+            if outputs[state]:
+                for pattern in outputs[state]:
+                    yield end - len(pattern), pattern
+
+
+# До этого числа шаблонов составное выражение не медленнее автомата на чистом
+# Python (на корпусе benchmarks они сравниваются между 32 и 48 шаблонами);
+# дальше проверка вариантов в каждой позиции растёт с их числом.
+REGEX_MAX_PATTERNS = 48
+
+
+@lru_cache(maxsize=32)
+def compile_patterns(patterns: Tuple[str, ...]):
+    """Компилирует набор шаблонов один раз для всех файлов и запусков."""
+    if len(patterns) <= REGEX_MAX_PATTERNS:
+        return RegexMatcher(patterns)
+    return AhoCorasickMatcher(patterns)
@@ -1,2 +1,9 @@
 from .config_file_adapter import ConfigFileAdapter
 from .file_system_adapter import LocalFileSystemAdapter
+from .file_watcher_adapter import (
+    InotifyFileWatcher,
+    PollingFileWatcher,
+    create_file_watcher,
+)
+from .mmap_file_system_adapter import MmapFileSystemAdapter, MmapLineView
+from .stat_cache import StatCache
@@ -1,55 +1,74 @@
-import re
-from typing import List, Optional
+import dataclasses
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
 from domain import Config
 from application.ports import ConfigPort
 from application.ports import FileSystemPort
 
 
 class ConfigFileAdapter(ConfigPort):
-    """Адаптер для работы с конфигурационными файлами."""
+    """Адаптер для работы с конфигурационными файлами.
 
-    def __init__(self, file_system_port: FileSystemPort):
+    Файл разбирается за один проход по строкам, а для последнего
+    прочитанного списка строится индекс id -> Config. Если задан cache_dir,
+    разобранные конфигурации сохраняются рядом в JSON и используются
+    повторно, пока не изменятся время изменения и размер файла.
+    """
+
+    CACHE_FORMAT_VERSION = 3
+    TRUE_VALUES = ("1", "true", "yes", "да")
+
+    def __init__(self, file_system_port: FileSystemPort, cache_dir: str = None):
         self.file_system_port = file_system_port
+        self.cache_dir = cache_dir
+        # (список, его длина, индекс) заменяется целиком, чтобы адаптер
+        # можно было использовать из нескольких потоков.
+        self._indexed: Tuple[Optional[List[Config]], int, Dict[str, Config]] = (
+            None,
+            0,
+            {},
+        )
 
     def read_configs(self, config_path: str) -> List[Config]:
         """Читает конфигурации из файла."""
-        content = "\n".join(self.file_system_port.read_file(config_path))
-
-        config_blocks = re.split(r"(?=^#\d+$)", content, flags=re.MULTILINE)
-
-        configs = []
-        for block in config_blocks:
-            if not block.strip():
-                continue
-
-            lines = block.strip().split("\n")
-
-            if not lines[0].startswith("#") or not lines[0][1:].strip().isdigit():
-                continue
+        signature = None
+        if self.cache_dir is not None:
+            signature = self.file_system_port.get_file_signature(config_path)
+            configs = self._load_cached(config_path, signature)
+            if configs is not None:
+                return self._build_index(configs)
 
-            config_dict = {"id": lines[0][1:].strip()}
+        configs = self.parse_lines(self.file_system_port.read_file(config_path))
 
-            for line in lines[1:]:
-                line = line.strip()
-                if not line or (line.startswith("#") and ":" not in line):
-                    continue
+        if self.cache_dir is not None and signature is not None:
+            self._save_cached(config_path, signature, configs)
+        return self._build_index(configs)
 
-                if ":" in line:
-                    if line.startswith("#"):
-                        line = line[1:]
+    def parse_lines(self, lines: Sequence[str]) -> List[Config]:
+        """Разбирает строки конфигурационного файла за один проход."""
+        configs = []
+        leading: List[str] = []
+        config_dict: Optional[Dict[str, str]] = None
 
-                    key, value = line.split(":", 1)
-                    config_dict[key.strip().lower()] = value.strip()
+        for raw_line in lines:
+            if raw_line[:1] == "#" and raw_line[1:].isdecimal():
+                if config_dict is None:
+                    self._append_leading_block(configs, leading)
+                else:
+                    self._append_config(configs, config_dict)
+                config_dict = {"id": raw_line[1:]}
+            elif config_dict is None:
+                leading.append(raw_line)
+            else:
+                self._parse_line(config_dict, raw_line)
 
-            if "mode" in config_dict and "path" in config_dict:
-                configs.append(
-                    Config(
-                        id=config_dict["id"],
-                        mode=config_dict["mode"],
-                        path=config_dict["path"],
-                        action=config_dict.get("action", "string"),
-                    )
-                )
+        if config_dict is None:
+            self._append_leading_block(configs, leading)
+        else:
+            self._append_config(configs, config_dict)
 
         return configs
 
@@ -57,7 +76,124 @@ class ConfigFileAdapter(ConfigPort):
         self, configs: List[Config], config_id: str
     ) -> Optional[Config]:
         """Находит конфигурацию по ID."""
+        indexed_configs, indexed_size, index = self._indexed
+        if configs is indexed_configs and len(configs) == indexed_size:
+            return index.get(config_id)
+
         for config in configs:
             if config.id == config_id:
                 return config
         return None
+
+    def _build_index(self, configs: List[Config]) -> List[Config]:
+        """Строит индекс id -> Config для списка конфигураций."""
+        index: Dict[str, Config] = {}
+        for config in configs:
+            index.setdefault(config.id, config)
+
+        self._indexed = (configs, len(configs), index)
+        return configs
+
+    def _append_leading_block(self, configs: List[Config], leading: List[str]):
+        """Разбирает текст до первого заголовка вида #<число>."""
+        text = "\n".join(leading).strip()
+        if not text:
+            return
+
+        lines = text.split("\n")
+        if not lines[0].startswith("#") or not lines[0][1:].strip().isdigit():
+            return
+
+        config_dict = {"id": lines[0][1:].strip()}
+        for line in lines[1:]:
+            self._parse_line(config_dict, line)
+        self._append_config(configs, config_dict)
+
+    @staticmethod
+    def _parse_line(config_dict: Dict[str, str], line: str) -> None:
+        """Разбирает строку вида [#]ключ: значение внутри блока."""
+        line = line.strip()
+        if ":" not in line:
+            return
+        if line[0] == "#":
+            line = line[1:]
+
+        key, value = line.split(":", 1)
+        config_dict[key.strip().lower()] = value.strip()
+
+    @classmethod
+    def _append_config(cls, configs: List[Config], config_dict: Dict[str, str]) -> None:
+        """Создаёт конфигурацию из разобранного блока и добавляет её в список."""
+        if "mode" in config_dict and "path" in config_dict:
+            configs.append(
+                Config(
+                    id=config_dict["id"],
+                    mode=config_dict["mode"],
+                    path=config_dict["path"],
+                    action=config_dict.get("action", "string"),
+                    workers=cls._parse_workers(config_dict),
+                    recursive=config_dict.get("recursive", "").lower()
+                    in cls.TRUE_VALUES,
+                    include=config_dict.get("include", ""),
+                    exclude=config_dict.get("exclude", ""),
+                    patterns=config_dict.get("patterns", ""),
+                    patterns_file=config_dict.get("patterns_file", ""),
+                )
+            )
+
+    @staticmethod
+    def _parse_workers(config_dict: Dict[str, str]) -> int:
+        """Возвращает число рабочих процессов блока (по умолчанию 1)."""
+        value = config_dict.get("workers", "")
+        if not value:
+            return 1
+        if not value.isdecimal() or int(value) < 1:
+            raise ValueError(
+                f"Неверное число процессов в конфигурации {config_dict['id']}: "
+                f"{value}"
+            )
+        return int(value)
+
+    def _cache_path(self, config_path: str) -> str:
+        """Возвращает путь к файлу кэша разобранных конфигураций."""
+        absolute_path = self.file_system_port.get_absolute_path(config_path)
+        digest = hashlib.sha256(absolute_path.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def _cache_stamp(self, signature) -> list:
+        """Возвращает отметку, при совпадении которой кэш действителен."""
+        field_names = [field.name for field in dataclasses.fields(Config)]
+        return [self.CACHE_FORMAT_VERSION, list(signature), field_names]
+
+    def _load_cached(self, config_path: str, signature) -> Optional[List[Config]]:
+        """Загружает разобранные конфигурации из кэша, если он актуален."""
+        if signature is None:
+            return None
+        try:
+            with open(self._cache_path(config_path), "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if cached.get("stamp") != self._cache_stamp(signature):
+            return None
+        return [Config(*values) for values in cached["configs"]]
+
+    def _save_cached(self, config_path: str, signature, configs: List[Config]) -> None:
+        """Сохраняет разобранные конфигурации в кэш."""
+        field_names = [field.name for field in dataclasses.fields(Config)]
+        cached = {
+            "stamp": self._cache_stamp(signature),
+            "configs": [
+                [getattr(config, name) for name in field_names] for config in configs
+            ],
+        }
+        cache_path = self._cache_path(config_path)
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(cached, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
@@ -1,14 +1,38 @@
+import fnmatch
 import os
-from typing import List
+import re
+import stat
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+from domain import CompactLines, StatRecord
 from application.ports import FileSystemPort
+from infrastructure.adapters.stat_cache import StatCache
+
+_MISSING = object()
 
 
 class LocalFileSystemAdapter(FileSystemPort):
-    """Адаптер для работы с локальной файловой системой."""
+    """Адаптер для работы с локальной файловой системой.
+
+    С общим StatCache сведения проверенных в запуске файлов (stat_file и
+    обход директории) переиспользуются вместо повторных stat, а абсолютные
+    пути - вместо повторных os.getcwd.
+    """
+
+    def __init__(self, stat_cache: Optional[StatCache] = None):
+        self.stat_cache = stat_cache
+
+    def stat_file(self, path: str) -> Optional[StatRecord]:
+        """Проверяет файл одним stat и возвращает его сведения или None."""
+        if self.stat_cache is None:
+            return _stat_record(path)
+        return self.stat_cache.stat(path, _stat_record)
 
     def file_exists(self, path: str) -> bool:
         """Проверяет существование файла."""
-        return os.path.isfile(path)
+        record = self._cached_record(path)
+        if record is _MISSING:
+            return os.path.isfile(path)
+        return record is not None and record.is_file
 
     def dir_exists(self, path: str) -> bool:
         """Проверяет существование директории."""
@@ -16,27 +40,115 @@ class LocalFileSystemAdapter(FileSystemPort):
 
     def list_files(self, dir_path: str) -> List[str]:
         """Возвращает список файлов в директории."""
-        file_paths = []
-        for file_name in sorted(os.listdir(dir_path)):
-            file_path = os.path.join(dir_path, file_name)
-            if os.path.isfile(file_path):
-                file_paths.append(file_path)
-        return file_paths
-
-    def read_file(self, file_path: str) -> List[str]:
-        """Читает содержимое файла и возвращает список строк."""
+        return sorted(self.iter_files(dir_path))
+
+    def iter_files(
+        self,
+        dir_path: str,
+        recursive: bool = False,
+        include: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+    ) -> Iterator[str]:
+        """Лениво перечисляет файлы директории через os.scandir.
+
+        Тип записи берётся из DirEntry, поэтому для обычных файлов не нужен
+        отдельный stat. Шаблоны сравниваются с путём относительно dir_path
+        (через "/") и с именем записи; исключённые каталоги не обходятся.
+        Порядок файлов не определён. Внутри запуска StatCache для каждого
+        найденного файла выполняется один DirEntry.stat() (на Linux - системный
+        вызов), и его сведения заменяют последующие stat по пути.
+        """
+        remember = None
+        if self.stat_cache is not None and self.stat_cache.active:
+            remember = self.stat_cache.remember
+        include_match = _compile_patterns(include)
+        exclude_match = _compile_patterns(exclude)
+        pending = [(dir_path, "")]
+
+        while pending:
+            current_dir, prefix = pending.pop()
+            with os.scandir(current_dir) as entries:
+                for entry in entries:
+                    relative_path = prefix + entry.name
+                    if exclude_match is not None and (
+                        exclude_match(relative_path) or exclude_match(entry.name)
+                    ):
+                        continue
+                    if entry.is_file():
+                        if include_match is None or (
+                            include_match(relative_path) or include_match(entry.name)
+                        ):
+                            if remember:
+                                remember(entry.path, _stat_record(entry))
+                            yield entry.path
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, relative_path + "/"))
+
+    def read_file(self, file_path: str) -> CompactLines:
+        """Читает содержимое файла и возвращает компактный список строк."""
         try:
             with open(file_path, "r", encoding="utf-8") as file:
-                return [line.rstrip("\n") for line in file.readlines()]
+                return CompactLines.from_text(file.read())
         except Exception as e:
             print(f"Ошибка при чтении файла {file_path}: {str(e)}")
             return []
 
+    def iter_lines(self, file_path: str) -> Iterator[str]:
+        """Лениво читает файл построчно."""
+        try:
+            with open(file_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    yield line.rstrip("\n")
+        except Exception as e:
+            print(f"Ошибка при чтении файла {file_path}: {str(e)}")
+
     def write_file(self, file_path: str, content: str) -> None:
         """Записывает содержимое в файл."""
         with open(file_path, "w", encoding="utf-8") as file:
             file.write(content)
 
+    def get_file_size(self, path: str) -> int:
+        """Возвращает размер файла в байтах."""
+        record = self._cached_record(path)
+        if record is _MISSING or record is None:
+            return os.path.getsize(path)
+        return record.size
+
+    def get_file_signature(self, path: str) -> Optional[Tuple[int, int]]:
+        """Возвращает (st_mtime_ns, st_size) файла или None, если его нет."""
+        record = self._cached_record(path)
+        if record is _MISSING:
+            record = _stat_record(path)
+        return None if record is None else record.signature
+
     def get_absolute_path(self, path: str) -> str:
         """Возвращает абсолютный путь к файлу."""
-        return os.path.abspath(path)
+        if self.stat_cache is None:
+            return os.path.abspath(path)
+        return self.stat_cache.absolute_path(path)
+
+    def _cached_record(self, path: str) -> Any:
+        """Возвращает сведения файла из StatCache или _MISSING."""
+        if self.stat_cache is None:
+            return _MISSING
+        return self.stat_cache.lookup(path, _MISSING)
+
+
+def _stat_record(path: Any) -> Optional[StatRecord]:
+    """Выполняет stat пути или записи каталога; None, если файла нет."""
+    try:
+        result = path.stat() if isinstance(path, os.DirEntry) else os.stat(path)
+    except OSError:
+        return None
+    return StatRecord(
+        is_file=stat.S_ISREG(result.st_mode),
+        size=result.st_size,
+        mtime_ns=result.st_mtime_ns,
+    )
+
+
+def _compile_patterns(patterns: Sequence[str]) -> Optional[Callable]:
+    """Объединяет glob-шаблоны в одно регулярное выражение."""
+    if not patterns:
+        return None
+    return re.compile("|".join(map(fnmatch.translate, patterns))).match
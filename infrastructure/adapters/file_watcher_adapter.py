@@ -0,0 +1,215 @@
+import os
+import select
+import struct
+import time
+from typing import Dict, Iterable, Optional, Set, Tuple
+from application.ports import FileWatcherPort
+
+_Signature = Optional[Tuple[int, int, int]]
+
+
+class PollingFileWatcher(FileWatcherPort):
+    """Наблюдатель, периодически сравнивающий результаты os.stat.
+
+    Для каждого пути хранится (st_mtime_ns, st_size, st_ino), поэтому
+    замечаются изменение, замена и удаление файла, а для директории -
+    добавление и удаление записей в ней.
+    """
+
+    DEFAULT_INTERVAL = 1.0
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self._snapshot: Dict[str, _Signature] = {}
+
+    def watch(self, paths: Iterable[str]) -> None:
+        """Задаёт отслеживаемые пути, сохраняя снимок уже известных."""
+        self._snapshot = {
+            path: self._snapshot[path] if path in self._snapshot else self._stat(path)
+            for path in paths
+        }
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Опрашивает пути с интервалом interval, пока что-то не изменится."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = self.poll()
+            if changed:
+                return changed
+
+            delay = self.interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return set()
+                delay = min(delay, remaining)
+            time.sleep(delay)
+
+    def poll(self) -> Set[str]:
+        """Один раз сравнивает текущее состояние путей со снимком."""
+        changed = set()
+        for path, signature in self._snapshot.items():
+            current = self._stat(path)
+            if current != signature:
+                self._snapshot[path] = current
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        """Забывает снимок путей."""
+        self._snapshot = {}
+
+    @staticmethod
+    def _stat(path: str) -> _Signature:
+        """Возвращает сигнатуру пути или None, если его нет."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class InotifyFileWatcher(FileWatcherPort):
+    """Наблюдатель на основе inotify (Linux), вызываемого через ctypes.
+
+    Файлы отслеживаются через родительскую директорию, чтобы замечать и
+    атомарную замену файла через rename. Для отслеживаемой директории
+    сообщается обо всех изменившихся в ней записях.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+
+    WATCH_MASK = (
+        IN_MODIFY
+        | IN_ATTRIB
+        | IN_CLOSE_WRITE
+        | IN_MOVED_FROM
+        | IN_MOVED_TO
+        | IN_CREATE
+        | IN_DELETE
+        | IN_DELETE_SELF
+        | IN_MOVE_SELF
+    )
+    READ_SIZE = 64 * 1024
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self):
+        # ctypes.util тянет subprocess, поэтому импортируется только здесь.
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify недоступен на этой платформе")
+        self._libc = libc
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._dirs: Dict[str, int] = {}
+        self._wds: Dict[int, str] = {}
+        self._targets: Dict[str, Optional[Set[str]]] = {}
+
+    def watch(self, paths: Iterable[str]) -> None:
+        """Добавляет недостающие и снимает лишние наблюдения за директориями."""
+        targets: Dict[str, Optional[Set[str]]] = {}
+        for path in paths:
+            if os.path.isdir(path):
+                targets[path] = None
+                continue
+            directory, name = os.path.split(path)
+            names = targets.setdefault(directory, set())
+            if names is not None:
+                names.add(name)
+
+        for directory in list(self._dirs):
+            if directory not in targets:
+                wd = self._dirs.pop(directory)
+                self._wds.pop(wd, None)
+                self._libc.inotify_rm_watch(self._fd, wd)
+
+        for directory in targets:
+            if directory not in self._dirs:
+                wd = self._libc.inotify_add_watch(
+                    self._fd, os.fsencode(directory), self.WATCH_MASK
+                )
+                if wd >= 0:
+                    self._dirs[directory] = wd
+                    self._wds[wd] = directory
+        self._targets = targets
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Ждёт событий inotify и возвращает изменившиеся пути."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed: Set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, self.READ_SIZE)
+            except BlockingIOError:
+                break
+            self._parse_events(data, changed)
+        return changed
+
+    def close(self) -> None:
+        """Закрывает дескриптор inotify."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _parse_events(self, data: bytes, changed: Set[str]) -> None:
+        """Разбирает буфер событий inotify в множество путей."""
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+            name_start = offset + self._EVENT.size
+            offset = name_start + length
+            if mask & self.IN_Q_OVERFLOW:
+                changed.update(self._all_targets())
+                continue
+
+            directory = self._wds.get(wd)
+            if directory is None:
+                continue
+            if mask & self.IN_IGNORED:
+                del self._wds[wd]
+                self._dirs.pop(directory, None)
+
+            name = os.fsdecode(data[name_start:offset].rstrip(b"\0"))
+            names = self._targets.get(directory, set())
+            if not name or names is None:
+                changed.add(directory)
+            if name and (names is None or name in names):
+                changed.add(os.path.join(directory, name))
+
+    def _all_targets(self) -> Set[str]:
+        """Возвращает все отслеживаемые пути (при переполнении очереди)."""
+        paths = set()
+        for directory, names in self._targets.items():
+            if names is None:
+                paths.add(directory)
+            else:
+                paths.update(os.path.join(directory, name) for name in names)
+        return paths
+
+
+def create_file_watcher(
+    poll_interval: float = PollingFileWatcher.DEFAULT_INTERVAL,
+) -> FileWatcherPort:
+    """Создаёт наблюдатель inotify, а если он недоступен - опрашивающий."""
+    try:
+        return InotifyFileWatcher()
+    except (OSError, AttributeError):
+        return PollingFileWatcher(poll_interval)
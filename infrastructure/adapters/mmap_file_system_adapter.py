@@ -0,0 +1,176 @@
+import codecs
+import mmap
+import os
+import re
+from array import array
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+from domain import CompactLines
+from infrastructure.adapters.file_system_adapter import LocalFileSystemAdapter
+
+_NEWLINE = re.compile(rb"\r\n|\r|\n")
+
+
+class MmapLineView(Sequence):
+    """Ленивое представление строк файла поверх mmap.
+
+    В памяти хранится только индекс начал строк (array('Q')), который
+    строится при первом обращении. Файл отображается в память на время
+    обращения и сразу закрывается, поэтому представление не держит открытых
+    дескрипторов. Строка декодируется только при чтении, срез - одним куском
+    в CompactLines. Переводы строк обрабатываются так же, как при чтении
+    файла в текстовом режиме: \\n, \\r\\n и \\r. Если файл изменился после
+    построения индекса, обращение выбрасывает OSError, а после close() -
+    ValueError.
+    """
+
+    BATCH_LINES = 64 * 1024
+    VALIDATE_CHUNK_BYTES = 1024 * 1024
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._offsets: Optional[array] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._closed = False
+
+    def load(self) -> "MmapLineView":
+        """Строит индекс строк и проверяет UTF-8 за одно отображение файла."""
+        with self._mapped() as mapping:
+            self._build_index(mapping)
+            if mapping is not None:
+                decoder = codecs.getincrementaldecoder("utf-8")()
+                size = self.VALIDATE_CHUNK_BYTES
+                for start in range(0, len(mapping), size):
+                    end = start + size
+                    decoder.decode(mapping[start:end])
+                decoder.decode(b"", final=True)
+        return self
+
+    @contextmanager
+    def _mapped(self) -> Iterator[Optional[mmap.mmap]]:
+        """Отображает файл на время блока with; для пустого файла - None."""
+        if self._closed:
+            raise ValueError(f"Представление строк файла закрыто: {self.file_path}")
+        with open(self.file_path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self._signature is None:
+                self._signature = signature
+            elif signature != self._signature:
+                raise OSError(f"Файл изменился после чтения: {self.file_path}")
+            if not stat.st_size:
+                yield None
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+                yield mapping
+
+    def _build_index(self, mapping: Optional[mmap.mmap]) -> None:
+        """Строит индекс начал строк по отображению файла."""
+        if self._offsets is not None:
+            return
+        offsets = array("Q", [0])
+        if mapping is not None:
+            for match in _NEWLINE.finditer(mapping):
+                offsets.append(match.end())
+            if offsets[-1] != len(mapping):
+                offsets.append(len(mapping))
+        self._offsets = offsets
+
+    def _index(self) -> array:
+        """Возвращает индекс начал строк, строя его при первом обращении."""
+        if self._closed:
+            raise ValueError(f"Представление строк файла закрыто: {self.file_path}")
+        if self._offsets is None:
+            with self._mapped() as mapping:
+                self._build_index(mapping)
+        return self._offsets
+
+    def _line(self, line_idx: int) -> str:
+        """Декодирует одну строку по её индексу."""
+        offsets = self._index()
+        start, end = offsets[line_idx], offsets[line_idx + 1]
+        with self._mapped() as mapping:
+            raw = mapping[start:end]
+        if raw.endswith(b"\r\n"):
+            raw = raw[:-2]
+        elif raw.endswith((b"\n", b"\r")):
+            raw = raw[:-1]
+        return raw.decode("utf-8")
+
+    def _lines(self, start: int, stop: int) -> CompactLines:
+        """Декодирует строки [start, stop) одним куском."""
+        offsets = self._index()
+        stop = min(stop, len(offsets) - 1)
+        if stop <= start:
+            return CompactLines.from_lines([])
+        first, end = offsets[start], offsets[stop]
+        with self._mapped() as mapping:
+            text = str(mapping[first:end], "utf-8")
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return CompactLines.from_text(text)
+
+    def __len__(self) -> int:
+        return len(self._index()) - 1
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return self._lines(start, stop)
+            return [self._line(i) for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("индекс строки вне диапазона")
+        return self._line(index)
+
+    def __iter__(self) -> Iterator[str]:
+        # Порции декодируются за одно отображение, между ними файл закрыт.
+        size = self.BATCH_LINES
+        for start in range(0, len(self), size):
+            yield from self._lines(start, start + size)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(
+                line == other_line for line, other_line in zip(self, other)
+            )
+        return NotImplemented
+
+    def __sizeof__(self) -> int:
+        size = object.__sizeof__(self)
+        if self._offsets is not None:
+            size += self._offsets.buffer_info()[1] * self._offsets.itemsize
+        return size
+
+    def __repr__(self) -> str:
+        return f"MmapLineView({self.file_path!r})"
+
+    def __enter__(self) -> "MmapLineView":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Освобождает индекс; дальнейшие обращения выбрасывают ValueError."""
+        self._closed = True
+        self._offsets = None
+
+
+class MmapFileSystemAdapter(LocalFileSystemAdapter):
+    """Адаптер файловой системы, читающий файлы через mmap.
+
+    Возвращает MmapLineView: в памяти остаётся только индекс строк, а текст
+    декодируется при обработке. Индекс строится и UTF-8 проверяется сразу
+    при чтении, поэтому ошибки чтения обрабатываются здесь же.
+    """
+
+    def read_file(self, file_path: str) -> Sequence[str]:
+        """Возвращает ленивое представление строк файла."""
+        try:
+            return MmapLineView(file_path).load()
+        except Exception as e:
+            print(f"Ошибка при чтении файла {file_path}: {str(e)}")
+            return CompactLines.from_lines([])
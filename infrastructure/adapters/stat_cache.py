@@ -0,0 +1,82 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+from domain import StatRecord
+
+_MISSING = object()
+
+
+class StatCache:
+    """Сведения stat проверенных входных файлов на время запуска.
+
+    Записи добавляются только явной проверкой (stat_file или обход
+    директории) и живут, пока открыт хотя бы один scope: первый вход и
+    последний выход очищают кэш. Вне scope ничего не запоминается, поэтому
+    файлы результата, конфигурации между запусками и изменения на диске
+    между запусками всегда проверяются заново. Кэш можно разделять между
+    потоками.
+    """
+
+    def __init__(self):
+        self._records: Dict[str, Optional[StatRecord]] = {}
+        self._absolute_paths: Dict[str, str] = {}
+        self._active = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def scope(self) -> Iterator[None]:
+        """Открывает запуск, на время которого сведения stat запоминаются."""
+        with self._lock:
+            if not self._active:
+                self._clear()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active -= 1
+                if not self._active:
+                    self._clear()
+
+    @property
+    def active(self) -> bool:
+        """Открыт ли сейчас запуск."""
+        return self._active > 0
+
+    def stat(
+        self, path: str, stat_func: Callable[[str], Optional[StatRecord]]
+    ) -> Optional[StatRecord]:
+        """Возвращает сведения о файле, вызывая stat_func один раз за запуск."""
+        record = self.lookup(path, _MISSING)
+        if record is not _MISSING:
+            return record
+        record = stat_func(path)
+        self.remember(path, record)
+        return record
+
+    def lookup(self, path: str, default: Any = None) -> Any:
+        """Возвращает запомненные сведения (None - файла нет) или default."""
+        with self._lock:
+            return self._records.get(path, default)
+
+    def remember(self, path: str, record: Optional[StatRecord]) -> None:
+        """Запоминает сведения о файле, если запуск открыт."""
+        with self._lock:
+            if self._active:
+                self._records[path] = record
+
+    def absolute_path(self, path: str) -> str:
+        """Возвращает абсолютный путь, вызывая os.getcwd один раз за запуск."""
+        with self._lock:
+            absolute_path = self._absolute_paths.get(path)
+            if absolute_path is None:
+                absolute_path = os.path.abspath(path)
+                if self._active:
+                    self._absolute_paths[path] = absolute_path
+            return absolute_path
+
+    def _clear(self) -> None:
+        """Забывает сведения предыдущего запуска."""
+        self._records.clear()
+        self._absolute_paths.clear()
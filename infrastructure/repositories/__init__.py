@@ -1 +1,2 @@
 from .file_repository import FileRepository
+from .result_cache import ResultCache
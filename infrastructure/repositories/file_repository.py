@@ -1,24 +1,68 @@
-from typing import List, Dict, Optional
+import sys
+import threading
+from collections import OrderedDict
+from typing import List, Dict, NamedTuple, Sequence, Tuple
 from domain.models import FileContent
 from application.ports import FileSystemPort
 
 
+class _CacheEntry(NamedTuple):
+    """Запись кэша файлов."""
+
+    content: FileContent
+    signature: Tuple[int, int]
+    size: int
+
+
 class FileRepository:
-    """Репозиторий для работы с файлами."""
+    """Репозиторий для работы с файлами.
 
-    def __init__(self, file_system: FileSystemPort):
+    Кэш ограничен бюджетом в байтах и числом записей и вытесняет давно не
+    использованные файлы. Записи хранятся по абсолютному пути и проверяются
+    по (st_mtime_ns, st_size), поэтому изменённый на диске файл
+    перечитывается. Репозиторий можно разделять между потоками.
+    """
+
+    DEFAULT_MAX_CACHE_BYTES = 256 * 1024 * 1024
+    DEFAULT_MAX_CACHE_ENTRIES = 4096
+
+    def __init__(
+        self,
+        file_system: FileSystemPort,
+        max_cache_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+        max_cache_entries: int = DEFAULT_MAX_CACHE_ENTRIES,
+    ):
         self.file_system = file_system
-        self._cache: Dict[str, FileContent] = {}
+        self.max_cache_bytes = max_cache_bytes
+        self.max_cache_entries = max_cache_entries
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._cache_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
 
     def get_file_content(self, file_path: str, use_cache: bool = True) -> FileContent:
         """Получает содержимое файла."""
-        if use_cache and file_path in self._cache:
-            return self._cache[file_path]
+        signature = self.file_system.get_file_signature(file_path)
+        key = self.file_system.get_absolute_path(file_path)
+
+        if use_cache:
+            with self._lock:
+                entry = self._cache.get(key)
+                if entry is not None and entry.signature == signature:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return entry.content
+                self.misses += 1
 
         lines = self.file_system.read_file(file_path)
         file_content = FileContent(file_path=file_path, lines=lines)
 
-        self._cache[file_path] = file_content
+        with self._lock:
+            self._discard(key)
+            if signature is not None:
+                self._store(key, file_content, signature)
 
         return file_content
 
@@ -33,4 +77,48 @@ class FileRepository:
 
     def clear_cache(self) -> None:
         """Очищает кэш файлов."""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Возвращает счётчики кэша файлов."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._cache),
+            "bytes": self._cache_bytes,
+        }
+
+    def _store(
+        self, key: str, file_content: FileContent, signature: Tuple[int, int]
+    ) -> None:
+        """Помещает файл в кэш, вытесняя давно не использованные записи."""
+        size = self._estimate_size(file_content.lines)
+        if size > self.max_cache_bytes or self.max_cache_entries < 1:
+            return
+
+        while self._cache and (
+            self._cache_bytes + size > self.max_cache_bytes
+            or len(self._cache) >= self.max_cache_entries
+        ):
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= evicted.size
+            self.evictions += 1
+
+        self._cache[key] = _CacheEntry(file_content, signature, size)
+        self._cache_bytes += size
+
+    def _discard(self, key: str) -> None:
+        """Удаляет запись из кэша."""
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._cache_bytes -= entry.size
+
+    @staticmethod
+    def _estimate_size(lines: Sequence[str]) -> int:
+        """Оценивает объём памяти, занимаемый строками файла."""
+        if isinstance(lines, list):
+            return sys.getsizeof(lines) + sum(map(sys.getsizeof, lines))
+        return sys.getsizeof(lines)
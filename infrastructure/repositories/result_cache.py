@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import List, Optional, Tuple
+from domain.models import Config
+from application.ports import FileSystemPort
+
+
+class ResultCache:
+    """Постоянный кэш результатов обработки на диске.
+
+    Ключ строится из конфигурации, упорядоченного списка файлов и сигнатуры
+    каждого файла: (st_mtime_ns, st_size) или хэша содержимого. Значение -
+    готовый файл результата (в любом формате), который при попадании просто
+    копируется.
+    """
+
+    FORMAT_VERSION = 1
+    DEFAULT_CACHE_DIR = ".text_processor_cache"
+    DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+    HASH_CHUNK_SIZE = 1 << 20
+
+    def __init__(
+        self,
+        file_system: FileSystemPort,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        hash_contents: bool = False,
+    ):
+        self.file_system = file_system
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hash_contents = hash_contents
+        self._total_bytes: Optional[int] = None
+
+    def make_key(
+        self,
+        config_file: str,
+        config: Config,
+        file_paths: List[str],
+        output_format: str = "json",
+        padded: bool = False,
+    ) -> Optional[str]:
+        """Вычисляет ключ кэша или None, если какой-либо файл недоступен.
+
+        Формат результата и дополнение строк входят в ключ, так как такие
+        файлы результата не взаимозаменяемы. Для search в ключ входят шаблоны
+        и подпись файла шаблонов.
+        """
+        inputs = list(file_paths)
+        if config.patterns_file:
+            inputs.append(config.patterns_file)
+        signatures = []
+        for file_path in inputs:
+            signature = self._file_signature(file_path)
+            if signature is None:
+                return None
+            signatures.append(signature)
+
+        key_data = [
+            self.FORMAT_VERSION,
+            self.file_system.get_absolute_path(config_file),
+            config.id,
+            config.mode,
+            config.path,
+            config.action,
+            config.patterns,
+            config.patterns_file,
+            file_paths,
+            signatures,
+            output_format,
+            padded,
+        ]
+        encoded = json.dumps(key_data, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def fetch(self, key: str, output_path: str) -> bool:
+        """Копирует сохранённый результат в output_path, если он есть в кэше."""
+        entry_path = self._entry_path(key)
+        try:
+            shutil.copyfile(entry_path, output_path)
+            os.utime(entry_path)
+        except OSError:
+            return False
+        return True
+
+    def store(self, key: str, result_path: str) -> None:
+        """Сохраняет файл результата в кэш и вытесняет старые записи.
+
+        Результат больше бюджета не сохраняется: иначе вытеснение очистило бы
+        весь кэш вместе с новой записью.
+        """
+        size = os.path.getsize(result_path)
+        if size > self.max_bytes:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        total_bytes = self._current_total()
+        entry_path = self._entry_path(key)
+        try:
+            previous_size = os.path.getsize(entry_path)
+        except OSError:
+            previous_size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(result_path, tmp_path)
+            os.replace(tmp_path, entry_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        # Каталог сканируется только при превышении бюджета, а не при каждом
+        # сохранении.
+        self._total_bytes = total_bytes - previous_size + size
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """Удаляет давно не использованные записи сверх бюджета размера."""
+        entries = self._scan_entries()
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            os.remove(path)
+            total_size -= size
+        self._total_bytes = total_size
+
+    def clear(self) -> None:
+        """Очищает кэш результатов."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self._total_bytes = None
+
+    def _current_total(self) -> int:
+        """Возвращает суммарный размер записей, сканируя каталог один раз."""
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._scan_entries())
+        return self._total_bytes
+
+    def _scan_entries(self) -> List[Tuple[int, int, str]]:
+        """Возвращает записи кэша как (st_mtime_ns, размер, путь)."""
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def _entry_path(self, key: str) -> str:
+        """Возвращает путь к файлу записи кэша."""
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _file_signature(self, file_path: str) -> Optional[list]:
+        """Возвращает сигнатуру файла для ключа кэша."""
+        if not self.hash_contents:
+            signature = self.file_system.get_file_signature(file_path)
+            return list(signature) if signature is not None else None
+
+        digest = hashlib.sha256()
+        try:
+            with open(file_path, "rb") as file:
+                for chunk in iter(lambda: file.read(self.HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        return [digest.hexdigest()]
@@ -1,2 +1,10 @@
 from .cli import CLI
-from .formatters import ConsoleFormatter, JsonFormatter
+from .formatters import (
+    OUTPUT_FORMATTERS,
+    BinaryFormatter,
+    ConsoleFormatter,
+    CsvFormatter,
+    JsonFormatter,
+    NdjsonFormatter,
+    OutputFormatter,
+)
@@ -1,32 +1,127 @@
 import os
 import sys
-import json
-from typing import List, Optional, Tuple
-from domain import ProcessingResult
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:  # pragma: no cover - модуль CLI нужен и для справки без domain
+    from domain import ProcessingResult
 
 
 class CLI:
     """Интерфейс командной строки."""
 
+    HELP_ARGS = ["help", "-h", "--help", "/?"]
+    PROFILE_MODES = ["trace", "pstats", "memory"]
+    OUTPUT_FORMATS = ["json", "ndjson", "csv", "bin"]
+
     @staticmethod
     def parse_args() -> Tuple[str, Optional[str]]:
         """Разбор аргументов командной строки."""
-        if len(sys.argv) == 1 or (
-            len(sys.argv) == 2 and sys.argv[1].lower() in ["help", "-h", "--help", "/?"]
-        ):
+        args = CLI.positional_args()
+
+        if not args or (len(args) == 1 and args[0].lower() in CLI.HELP_ARGS):
             CLI.show_help()
             sys.exit(0)
 
-        if len(sys.argv) == 2:
-            return sys.argv[1], None
+        if len(args) == 1:
+            return args[0], None
 
-        if len(sys.argv) != 3:
+        if len(args) != 2:
             print(
                 "Неверные аргументы\nВоспользуйтесь командой 'python script.py' для справки"
             )
             sys.exit(1)
 
-        return sys.argv[1], sys.argv[2]
+        return args[0], args[1]
+
+    @staticmethod
+    def parse_options() -> Dict[str, Union[str, bool]]:
+        """Разбор параметров вида --name или --name=value."""
+        options = {}
+        for arg in sys.argv[1:]:
+            if CLI.is_option(arg):
+                name, separator, value = arg[2:].partition("=")
+                options[name.lower()] = value if separator else True
+        return options
+
+    @staticmethod
+    def split_config_ids(config_id: str) -> List[str]:
+        """Разбивает список ID конфигураций через запятую, убирая повторы."""
+        config_ids = []
+        for part in config_id.split(","):
+            part = part.strip()
+            if part and part not in config_ids:
+                config_ids.append(part)
+        return config_ids
+
+    @staticmethod
+    def parse_profile_modes(value: Union[str, bool, None]) -> List[str]:
+        """Разбирает значение --profile[=pstats,memory] в список режимов."""
+        if not value:
+            return []
+
+        modes = ["trace"]
+        if value is not True:
+            for mode in value.split(","):
+                mode = mode.strip().lower()
+                if mode not in CLI.PROFILE_MODES:
+                    raise ValueError(f"Неизвестный режим профилирования: {mode}")
+                if mode not in modes:
+                    modes.append(mode)
+        return modes
+
+    @staticmethod
+    def parse_output_format(value: Union[str, bool, None]) -> str:
+        """Разбирает значение --format=<формат>; по умолчанию json."""
+        if value is None:
+            return CLI.OUTPUT_FORMATS[0]
+
+        output_format = value.strip().lower() if value is not True else ""
+        if output_format not in CLI.OUTPUT_FORMATS:
+            raise ValueError(
+                f"Неизвестный формат результата: {output_format or '(не задан)'}"
+            )
+        return output_format
+
+    @staticmethod
+    def parse_memo_size(value: Union[str, bool, None]) -> Union[bool, int]:
+        """Разбирает значение --memo[=N]: False, True (размер по умолчанию) или N."""
+        if not value or value is True:
+            return bool(value)
+
+        try:
+            size = int(value)
+        except ValueError:
+            size = 0
+        if size < 1:
+            raise ValueError(f"Неверный размер кэша строк: {value}")
+        return size
+
+    @staticmethod
+    def parse_jobs(value: Union[str, bool, None]) -> int:
+        """Разбирает значение --jobs=N: целое число не меньше 1, по умолчанию 1."""
+        if value is None:
+            return 1
+
+        try:
+            jobs = int(value) if value is not True else 0
+        except ValueError:
+            jobs = 0
+        if jobs < 1:
+            raise ValueError(
+                f"Неверное число одновременных конфигураций: --jobs={value}, "
+                "ожидается целое число не меньше 1"
+            )
+        return jobs
+
+    @staticmethod
+    def positional_args() -> List[str]:
+        """Возвращает аргументы командной строки без параметров."""
+        return [arg for arg in sys.argv[1:] if not CLI.is_option(arg)]
+
+    @staticmethod
+    def is_option(arg: str) -> bool:
+        """Проверяет, является ли аргумент параметром вида --name."""
+        return arg.startswith("--") and arg.lower() not in CLI.HELP_ARGS
 
     @staticmethod
     def show_help() -> None:
@@ -35,24 +130,60 @@ class CLI:
 Программа для обработки текстовых файлов согласно заданной конфигурации.
 
 ИСПОЛЬЗОВАНИЕ:
-    python script.py <config_file> <config_id>
+    python script.py <config_file> <config_id> [параметры]
+    python script.py <config_file> --all [параметры]
     python script.py <config_file>
+    python script.py --serve[=<socket>]
     python script.py help
 
 АРГУМЕНТЫ:
     <config_file>    Путь к конфигурационному файлу
-    <config_id>      ID конфигурации для использования
+    <config_id>      ID конфигурации или несколько ID через запятую
     help             Показать эту справку
 
+ПАРАМЕТРЫ:
+    --all            Обработать все конфигурации из файла
+    --jobs=N         Выполнять до N конфигураций одновременно
+    --no-cache       Не использовать кэш результатов и разобранных конфигураций;
+                     без него при выполнении конфигураций создаётся каталог
+                     .text_processor_cache
+    --incremental    Пересчитать только изменившиеся файлы
+    --watch[=poll]   Следить за изменениями и перезапускать затронутые
+                     конфигурации (inotify или, с =poll, опрос os.stat)
+    --server[=<socket>]
+                     Выполнить через запущенный сервер (если он недоступен -
+                     обычным образом)
+    --serve[=<socket>]
+                     Запустить сервер с общими кэшами на Unix-сокете
+    --format=<формат>
+                     Формат результата: json (по умолчанию), ndjson, csv или
+                     bin (двоичный столбцовый)
+    --sparse         Сохранять только настоящие строки и число строк каждого
+                     файла (lineCounts), не дополняя короткие файлы пустыми
+                     значениями до самого длинного
+    --memo[=N]       Запоминать результат повторяющихся строк (до N строк,
+                     по умолчанию 100000) и хранить одинаковые значения одним
+                     объектом; попадания видны в счётчиках --profile
+    --profile[=pstats,memory]
+                     Сохранить рядом с результатом профиль этапов (.profile.json),
+                     дамп cProfile (.pstats) и пик памяти tracemalloc
+
 ФОРМАТЫ КОНФИГУРАЦИИ:
     Каждая конфигурация должна содержать:
     - ID (например, #1)
     - mode: dir или files
     - path: путь к директории или список файлов через запятую
-    - action: string, count или replace (необязательно, по умолчанию string)
+    - action: string, count, replace, stats или search
+      (необязательно, по умолчанию string)
+    - workers: число процессов для count и replace (необязательно, по умолчанию 1)
+    - recursive: true для обхода вложенных директорий в режиме dir (необязательно)
+    - include, exclude: glob-шаблоны через запятую для режима dir (необязательно)
+    - patterns: строки для поиска через запятую (для action: search)
+    - patterns_file: файл со строками для поиска, по одной на строку (для search)
 
 ПРИМЕРЫ:
     python script.py config.txt 1      # Использовать конфигурацию #1 из файла config.txt
+    python script.py config.txt 1,3    # Использовать конфигурации #1 и #3
     python script.py config.txt        # Показать конфигурации из файла
     python script.py help              # Показать эту справку
     """
@@ -76,8 +207,10 @@ class CLI:
         print("-" * 70)
 
     @staticmethod
-    def save_result(result: ProcessingResult) -> None:
+    def save_result(result: "ProcessingResult") -> None:
         """Сохранение результата в JSON файл."""
+        import json
+
         result_dict = {
             "configFile": result.config_file,
             "configurationID": result.config_id,
@@ -1,14 +1,39 @@
+from abc import ABC, abstractmethod
+import csv
+import io
 import json
 import os
-from typing import List
-from domain.models import Config, ProcessingResult
+import struct
+import sys
+from array import array
+from functools import partial
+from itertools import chain, count, zip_longest
+from operator import add
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:  # pragma: no cover - domain импортируется по месту
+    from domain.models import Config, ProcessingResult, ResultManifest
 
 
 class ConsoleFormatter:
     """Форматирование вывода в консоль."""
 
     @staticmethod
-    def format_configs(configs: List[Config], config_file: str) -> str:
+    def format_configs(configs: List["Config"], config_file: str) -> str:
         """Форматирует список конфигураций для вывода."""
         result = [
             f"\nДоступные конфигурации в файле {config_file}:",
@@ -35,36 +60,602 @@ class ConsoleFormatter:
         return f"Ошибка: {error_message}"
 
 
-class JsonFormatter:
-    """Форматирование данных в JSON."""
+def result_table(
+    out: Any,
+) -> Tuple[List[str], Iterator[Tuple[str, Sequence]], bool]:
+    """Представляет out результата в виде таблицы.
 
-    @staticmethod
-    def format_result(result: ProcessingResult) -> str:
-        """Преобразует результат обработки в JSON строку."""
-        result_dict = {
-            "configFile": result.config_file,
-            "configurationID": result.config_id,
-            "configurationData": result.config_data,
-            "out": result.out,
-        }
+    Возвращает номера файлов, ленивый перебор пар (номер строки, значения по
+    файлам) и признак числовых значений. Столбцовый результат перебирается
+    напрямую по столбцам, без словарей строк.
+    """
+    from domain.models import ColumnarOut
+
+    if isinstance(out, ColumnarOut):
+        columnar = out.result
+        keys = [str(file_num) for file_num in range(1, len(columnar.columns) + 1)]
+        values = zip_longest(*columnar.columns, fillvalue=columnar.padding)
+        return keys, zip(map(str, count(1)), values), columnar.action == "count"
+
+    items = iter(out.items() if isinstance(out, Mapping) else out)
+    first = next(items, None)
+    if first is None:
+        return [], iter(()), True
+
+    keys = list(first[1])
+    numeric = all(type(value) is int for value in first[1].values())
+    rows = ((line, list(row.values())) for line, row in chain([first], items))
+    return keys, rows, numeric
+
+
+def sparse_table(
+    result: "ProcessingResult",
+) -> Tuple[List[str], Iterator[Tuple[str, Dict[str, Any]]], bool]:
+    """Представляет разреженный out результата в виде таблицы.
+
+    Возвращает номера всех файлов (по line_counts), ленивый перебор пар
+    (номер строки, словарь только настоящих ячеек) и признак числовых значений.
+    """
+    from domain.models import ColumnarOut
+
+    keys = [str(file_num) for file_num in range(1, len(result.line_counts) + 1)]
+    out = result.out
+    if isinstance(out, ColumnarOut):
+        return keys, iter(out.items()), out.result.action == "count"
+
+    items = iter(out.items() if isinstance(out, Mapping) else out)
+    first = next(items, None)
+    if first is None:
+        return keys, iter(()), True
+    numeric = all(type(value) is int for value in first[1].values())
+    return keys, chain([first], items), numeric
 
-        return json.dumps(result_dict, indent=2, ensure_ascii=False)
+
+def result_summary(out: Any) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Возвращает (действие, сводка) для stats и search или None для строк."""
+    from domain.models import SearchResult, StatsResult
+
+    if isinstance(out, StatsResult):
+        return "stats", out.to_dict()
+    if isinstance(out, SearchResult):
+        return "search", out.to_dict()
+    return None
+
+
+class OutputFormatter(ABC):
+    """Потоковая запись результата обработки в файл одного формата."""
+
+    EXTENSION = "json"
+    BINARY = False
+    BUFFER_SIZE = 1 << 20
 
     @staticmethod
-    def save_to_file(result: ProcessingResult, file_path: str = None) -> str:
-        """Сохраняет результат в JSON файл."""
+    @abstractmethod
+    def write_result(file: IO, result: "ProcessingResult") -> None:
+        """Потоково записывает результат обработки в открытый файл."""
+        pass
+
+    @classmethod
+    def format_result(cls, result: "ProcessingResult") -> Union[str, bytes]:
+        """Преобразует результат обработки в строку (или байты) формата."""
+        buffer = io.BytesIO() if cls.BINARY else io.StringIO()
+        cls.write_result(buffer, result)
+        return buffer.getvalue()
+
+    @classmethod
+    def get_output_path(
+        cls, config_id: str, file_path: str = None, extension: str = None
+    ) -> str:
+        """Возвращает путь к файлу результата, создавая каталог results."""
         results_dir = "results"
-        if not os.path.exists(results_dir):
-            os.makedirs(results_dir)
+        os.makedirs(results_dir, exist_ok=True)
 
         if file_path is None:
             file_path = os.path.join(
-                results_dir, f"result_config_{result.config_id}.json"
+                results_dir, f"result_config_{config_id}.{extension or cls.EXTENSION}"
             )
         elif not os.path.dirname(file_path):
             file_path = os.path.join(results_dir, file_path)
 
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(JsonFormatter.format_result(result))
+        return file_path
+
+    @classmethod
+    def save_to_file(cls, result: "ProcessingResult", file_path: str = None) -> str:
+        """Сохраняет результат в файл с расширением формата."""
+        file_path = cls.get_output_path(result.config_id, file_path)
+
+        if cls.BINARY:
+            f = open(file_path, "wb", buffering=cls.BUFFER_SIZE)
+        else:
+            f = open(
+                file_path,
+                "w",
+                encoding="utf-8",
+                newline="",
+                buffering=cls.BUFFER_SIZE,
+            )
+        with f:
+            cls.write_result(f, result)
 
         return file_path
+
+    @classmethod
+    def load_out(cls, file_path: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Загружает out сохранённого результата или None, если формат не позволяет."""
+        return None
+
+    @staticmethod
+    def result_header(result: "ProcessingResult") -> Dict[str, Any]:
+        """Возвращает сведения о конфигурации для заголовка результата."""
+        return {
+            "configFile": result.config_file,
+            "configurationID": result.config_id,
+            "configurationData": result.config_data,
+        }
+
+
+class JsonFormatter(OutputFormatter):
+    """Форматирование данных в JSON."""
+
+    EXTENSION = "json"
+
+    @staticmethod
+    def write_result(file: TextIO, result: "ProcessingResult") -> None:
+        """Потоково записывает результат обработки в JSON построчно."""
+        header = json.dumps(
+            OutputFormatter.result_header(result), indent=2, ensure_ascii=False
+        )
+        file.write(header[: -len("\n}")])
+        file.write(',\n  "out": {')
+
+        summary = result_summary(result.out)
+        if summary is not None:
+            rows = summary[1].items()
+        elif isinstance(result.out, Mapping):
+            rows = result.out.items()
+        else:
+            rows = result.out
+        separator = "\n    "
+        for line_num, line_result in rows:
+            file.write(separator)
+            file.write(json.dumps(line_num, ensure_ascii=False))
+            file.write(": ")
+            row = json.dumps(line_result, indent=2, ensure_ascii=False)
+            file.write(row.replace("\n", "\n    "))
+            separator = ",\n    "
+
+        file.write("}" if separator == "\n    " else "\n  }")
+        if result.line_counts is not None:
+            file.write(',\n  "lineCounts": ')
+            file.write(json.dumps(result.line_counts))
+        file.write("\n}")
+
+    @classmethod
+    def load_out(cls, file_path: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Загружает out сохранённого JSON результата."""
+        return cls.load_result(file_path)["out"]
+
+    @staticmethod
+    def load_result(file_path: str) -> Dict[str, Any]:
+        """Загружает ранее сохранённый результат из JSON файла."""
+        with open(file_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def get_manifest_path(result_path: str) -> str:
+        """Возвращает путь к файлу сведений о входных данных результата."""
+        root, _ = os.path.splitext(result_path)
+        return f"{root}.manifest.json"
+
+    @staticmethod
+    def get_trace_path(result_path: str) -> str:
+        """Возвращает путь к файлу профиля этапов для результата."""
+        root, _ = os.path.splitext(result_path)
+        return f"{root}.profile.json"
+
+    @staticmethod
+    def get_pstats_path(result_path: str) -> str:
+        """Возвращает путь к дампу cProfile для результата."""
+        root, _ = os.path.splitext(result_path)
+        return f"{root}.pstats"
+
+    @staticmethod
+    def save_trace(trace: Dict[str, Any], file_path: str) -> None:
+        """Сохраняет профиль этапов обработки в JSON файл."""
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(trace, f, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    def save_manifest(manifest: "ResultManifest", file_path: str) -> None:
+        """Сохраняет сведения о входных данных результата."""
+        manifest_dict = {
+            "action": manifest.action,
+            "files": manifest.files,
+            "signatures": manifest.signatures,
+            "lineCounts": manifest.line_counts,
+            "resultSignature": manifest.result_signature,
+        }
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(manifest_dict, f, ensure_ascii=False)
+
+    @staticmethod
+    def load_manifest(file_path: str) -> Optional["ResultManifest"]:
+        """Загружает сведения о входных данных результата, если они есть."""
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                manifest_dict = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        from domain.models import ResultManifest
+
+        def to_signature(value):
+            return tuple(value) if value is not None else None
+
+        return ResultManifest(
+            action=manifest_dict["action"],
+            files=manifest_dict["files"],
+            signatures=[to_signature(value) for value in manifest_dict["signatures"]],
+            line_counts=manifest_dict["lineCounts"],
+            result_signature=to_signature(manifest_dict["resultSignature"]),
+        )
+
+
+class NdjsonFormatter(OutputFormatter):
+    """Форматирование результата в NDJSON.
+
+    Первая строка - сведения о конфигурации и номера файлов (files), далее по
+    одному компактному объекту {"line": N, "<номер файла>": значение, ...} на
+    номер строки. В разреженном результате (sparse в заголовке) в строке есть
+    только файлы, где она существует, а последняя строка - {"lineCounts": [...]}.
+    Сводка stats или search (stats или search в заголовке, шаблоны search - там
+    же) записывается по объекту {"file": N, ...} на файл и последней строкой
+    {"corpus": {...}}.
+    """
+
+    EXTENSION = "ndjson"
+
+    @staticmethod
+    def write_result(file: TextIO, result: "ProcessingResult") -> None:
+        """Потоково записывает результат обработки по строке JSON на номер строки."""
+        summary = result_summary(result.out)
+        if summary is not None:
+            NdjsonFormatter._write_summary(file, result, *summary)
+            return
+        if result.line_counts is not None:
+            NdjsonFormatter._write_sparse(file, result)
+            return
+
+        keys, rows, numeric = result_table(result.out)
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        file.write(encode(dict(OutputFormatter.result_header(result), files=keys)))
+        file.write("\n")
+
+        # Строку собираем из заранее закодированных ключей: int быстрее всего
+        # превращается в JSON через str, строки - через кодировщик.
+        encode_value = str if numeric else encode
+        prefixes = [f",{encode(key)}:" for key in keys]
+        join = "".join
+        for line_num, values in rows:
+            file.write(
+                '{"line":'
+                + line_num
+                + join(map(add, prefixes, map(encode_value, values)))
+                + "}\n"
+            )
+
+    @staticmethod
+    def _write_summary(
+        file: TextIO, result: "ProcessingResult", action: str, summary: Dict[str, Any]
+    ) -> None:
+        """Записывает сводку: строка на файл и строка по всем файлам."""
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        header = dict(
+            OutputFormatter.result_header(result), files=list(summary["files"])
+        )
+        header[action] = True
+        header.update(
+            (key, value)
+            for key, value in summary.items()
+            if key not in ("files", "corpus")
+        )
+        file.write(encode(header))
+        file.write("\n")
+        for file_num, file_summary in summary["files"].items():
+            file.write(encode(dict(file=int(file_num), **file_summary)))
+            file.write("\n")
+        file.write(encode({"corpus": summary["corpus"]}))
+        file.write("\n")
+
+    @staticmethod
+    def _write_sparse(file: TextIO, result: "ProcessingResult") -> None:
+        """Записывает разреженный результат: только настоящие ячейки строк."""
+        keys, rows, numeric = sparse_table(result)
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        header = dict(OutputFormatter.result_header(result), files=keys, sparse=True)
+        file.write(encode(header))
+        file.write("\n")
+
+        encode_value = str if numeric else encode
+        prefixes = {key: f",{encode(key)}:" for key in keys}
+        join = "".join
+        for line_num, row in rows:
+            cells = [prefixes[key] + encode_value(value) for key, value in row.items()]
+            file.write('{"line":' + line_num + join(cells) + "}\n")
+        file.write(encode({"lineCounts": result.line_counts}))
+        file.write("\n")
+
+    @classmethod
+    def load_out(cls, file_path: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Загружает out сохранённого NDJSON результата."""
+        out = {}
+        with open(file_path, "r", encoding="utf-8") as f:
+            f.readline()
+            for line in f:
+                row = json.loads(line)
+                if "line" in row:
+                    out[str(row.pop("line"))] = row
+        return out
+
+
+class CsvFormatter(OutputFormatter):
+    """Форматирование результата в CSV: столбец line и по столбцу на файл.
+
+    Разреженный результат записывается в длинном виде line,file,value - по
+    строке CSV на настоящую ячейку. Сводка stats - строка со счётчиками
+    (STATS_COLUMNS) на файл и строка corpus, без гистограммы и самых длинных
+    строк; вхождения search - длинный вид file,line,pattern,count. Сведения
+    о конфигурации и типы значений в CSV не сохраняются, поэтому загрузить
+    out обратно (для --incremental) нельзя.
+    """
+
+    EXTENSION = "csv"
+    STATS_COLUMNS = ["lines", "words", "chars", "emptyLines", "maxLength", "meanLength"]
+
+    @staticmethod
+    def write_result(file: TextIO, result: "ProcessingResult") -> None:
+        """Потоково записывает результат обработки построчно в CSV."""
+        writer = csv.writer(file, lineterminator="\n")
+        summary = result_summary(result.out)
+        if summary is not None and summary[0] == "search":
+            writer.writerow(["file", "line", "pattern", "count"])
+            writer.writerows(
+                (file_num, line_num, pattern, count)
+                for file_num, matches in summary[1]["files"].items()
+                for line_num, line in matches["lines"].items()
+                for pattern, count in line.items()
+            )
+            return
+        if summary is not None:
+            summary = summary[1]
+            columns = CsvFormatter.STATS_COLUMNS
+            writer.writerow(["file", *columns])
+            files = list(summary["files"].items()) + [("corpus", summary["corpus"])]
+            writer.writerows(
+                [file_num, *(stats[column] for column in columns)]
+                for file_num, stats in files
+            )
+            return
+        if result.line_counts is not None:
+            _, rows, _ = sparse_table(result)
+            writer.writerow(["line", "file", "value"])
+            writer.writerows(
+                (line_num, file_num, value)
+                for line_num, row in rows
+                for file_num, value in row.items()
+            )
+            return
+
+        keys, rows, _ = result_table(result.out)
+        writer.writerow(["line", *keys])
+        writer.writerows((line_num, *values) for line_num, values in rows)
+
+
+class BinaryFormatter(OutputFormatter):
+    """Компактный двоичный столбцовый формат.
+
+    Файл начинается с MAGIC, за ним длина (uint32) и JSON заголовок со
+    сведениями о конфигурации, номерами файлов (files) и типом значений
+    (type: int64 или utf8). Далее идут блоки до BLOCK_ROWS строк: число строк
+    блока n (uint32, 0 - конец файла), затем по каждому файлу n значений int64
+    или n длин uint32 и n строк UTF-8 подряд. Все числа little-endian, номера
+    строк идут подряд с 1.
+
+    В разреженном результате (sparse в заголовке) перед значениями каждого
+    файла в блоке записывается их число k (uint32): строки файла в блоке -
+    это первые k строк блока, ячейки дополнения не хранятся.
+
+    Сводки stats и search невелики и целиком хранятся в заголовке (type: stats
+    или search, out), блоков у них нет.
+    """
+
+    EXTENSION = "bin"
+    BINARY = True
+    MAGIC = b"TPCOL\x00\x00\x01"
+    BLOCK_ROWS = 1 << 16
+
+    _UINT32 = struct.Struct("<I")
+
+    @classmethod
+    def write_result(cls, file: IO[bytes], result: "ProcessingResult") -> None:
+        """Потоково записывает результат обработки блоками по столбцам."""
+        summary = result_summary(result.out)
+        if summary is not None:
+            action, out = summary
+            header = dict(OutputFormatter.result_header(result), type=action, out=out)
+            cls._write_header(file, header)
+            file.write(cls._UINT32.pack(0))
+            return
+
+        sparse = result.line_counts is not None
+        if sparse:
+            keys, rows, numeric = sparse_table(result)
+        else:
+            keys, rows, numeric = result_table(result.out)
+        header = dict(
+            OutputFormatter.result_header(result),
+            files=keys,
+            type="int64" if numeric else "utf8",
+        )
+        if sparse:
+            header["sparse"] = True
+        cls._write_header(file, header)
+
+        write_column = cls._write_int_column if numeric else cls._write_str_column
+        write_block = (
+            partial(cls._write_sparse_block, keys=keys) if sparse else cls._write_block
+        )
+        block = []
+        for _, values in rows:
+            block.append(values)
+            if len(block) == cls.BLOCK_ROWS:
+                write_block(file, block, write_column)
+                block = []
+        if block:
+            write_block(file, block, write_column)
+        file.write(cls._UINT32.pack(0))
+
+    @classmethod
+    def _write_header(cls, file: IO[bytes], header: Dict[str, Any]) -> None:
+        """Записывает MAGIC, длину и JSON заголовка."""
+        encoded_header = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        file.write(cls.MAGIC)
+        file.write(cls._UINT32.pack(len(encoded_header)))
+        file.write(encoded_header)
+
+    @classmethod
+    def _write_block(
+        cls,
+        file: IO[bytes],
+        block: List[Sequence],
+        write_column: Callable[[IO[bytes], Sequence], None],
+    ) -> None:
+        """Записывает блок строк по столбцам."""
+        file.write(cls._UINT32.pack(len(block)))
+        for column in zip(*block):
+            write_column(file, column)
+
+    @classmethod
+    def _write_sparse_block(
+        cls,
+        file: IO[bytes],
+        block: List[Dict[str, Any]],
+        write_column: Callable[[IO[bytes], Sequence], None],
+        keys: List[str],
+    ) -> None:
+        """Записывает блок разреженных строк: по файлу число значений и значения."""
+        columns: Dict[str, List[Any]] = {key: [] for key in keys}
+        for row in block:
+            for key, value in row.items():
+                columns[key].append(value)
+        file.write(cls._UINT32.pack(len(block)))
+        for key in keys:
+            column = columns[key]
+            file.write(cls._UINT32.pack(len(column)))
+            write_column(file, column)
+
+    @staticmethod
+    def _write_int_column(file: IO[bytes], values: Sequence[int]) -> None:
+        """Записывает значения столбца блока как int64."""
+        column = array("q", values)
+        if sys.byteorder == "big":  # pragma: no cover
+            column.byteswap()
+        file.write(column.tobytes())
+
+    @staticmethod
+    def _write_str_column(file: IO[bytes], values: Sequence[str]) -> None:
+        """Записывает длины и байты UTF-8 строк столбца блока."""
+        encoded = [value.encode("utf-8", "surrogatepass") for value in values]
+        lengths = array("I", map(len, encoded))
+        if sys.byteorder == "big":  # pragma: no cover
+            lengths.byteswap()
+        file.write(lengths.tobytes())
+        file.write(b"".join(encoded))
+
+    @classmethod
+    def load_result(cls, file_path: str) -> Dict[str, Any]:
+        """Загружает двоичный результат в виде словаря, как JSON результат."""
+        with open(file_path, "rb") as f:
+            data = f.read()
+        if not data.startswith(cls.MAGIC):
+            raise ValueError(f"Неизвестный формат файла результата: {file_path}")
+
+        offset = len(cls.MAGIC)
+        (header_size,) = cls._UINT32.unpack_from(data, offset)
+        offset += cls._UINT32.size
+        header_end = offset + header_size
+        header = json.loads(data[offset:header_end].decode("utf-8"))
+        offset = header_end
+
+        value_type = header.pop("type")
+        if value_type in ("stats", "search"):
+            return header
+
+        keys = header.pop("files")
+        numeric = value_type == "int64"
+        sparse = header.pop("sparse", False)
+        line_counts = [0] * len(keys)
+        out: Dict[str, Dict[str, Any]] = {}
+        line_num = 0
+        while True:
+            (block_rows,) = cls._UINT32.unpack_from(data, offset)
+            offset += cls._UINT32.size
+            if not block_rows:
+                break
+            if not sparse:
+                columns = []
+                for _ in keys:
+                    column, offset = cls._read_column(data, offset, block_rows, numeric)
+                    columns.append(column)
+                for values in zip(*columns):
+                    line_num += 1
+                    out[str(line_num)] = dict(zip(keys, values))
+                continue
+
+            rows: List[Dict[str, Any]] = [{} for _ in range(block_rows)]
+            for file_idx, key in enumerate(keys):
+                (size,) = cls._UINT32.unpack_from(data, offset)
+                offset += cls._UINT32.size
+                column, offset = cls._read_column(data, offset, size, numeric)
+                line_counts[file_idx] += size
+                for row, value in zip(rows, column):
+                    row[key] = value
+            for row in rows:
+                line_num += 1
+                out[str(line_num)] = row
+
+        header["out"] = out
+        if sparse:
+            header["lineCounts"] = line_counts
+        return header
+
+    @staticmethod
+    def _read_column(
+        data: bytes, offset: int, size: int, numeric: bool
+    ) -> Tuple[List[Union[int, str]], int]:
+        """Читает столбец блока и возвращает его значения и новое смещение."""
+        item_type = "q" if numeric else "I"
+        column = array(item_type)
+        end = offset + size * column.itemsize
+        column.frombytes(data[offset:end])
+        if sys.byteorder == "big":  # pragma: no cover
+            column.byteswap()
+        if numeric:
+            return column.tolist(), end
+
+        values = []
+        for length in column:
+            start, end = end, end + length
+            values.append(data[start:end].decode("utf-8", "surrogatepass"))
+        return values, end
+
+    @classmethod
+    def load_out(cls, file_path: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Загружает out сохранённого двоичного результата."""
+        return cls.load_result(file_path)["out"]
+
+
+OUTPUT_FORMATTERS = {
+    formatter.EXTENSION: formatter
+    for formatter in (JsonFormatter, NdjsonFormatter, CsvFormatter, BinaryFormatter)
+}
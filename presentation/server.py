@@ -0,0 +1,337 @@
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+from presentation.formatters import ConsoleFormatter
+
+if TYPE_CHECKING:  # pragma: no cover - клиенту domain не нужен
+    from domain import Config
+
+SOCKET_ENV = "TEXT_PROCESSOR_SOCKET"
+
+
+def default_socket_path() -> str:
+    """Возвращает путь к сокету сервера по умолчанию.
+
+    Сокет лежит в $XDG_RUNTIME_DIR, а без него - в личном каталоге
+    text_processor-<uid> во временном каталоге, который сервер создаёт с
+    правами 0700.
+    """
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "text_processor.sock")
+    user = os.getuid() if hasattr(os, "getuid") else "user"
+    return os.path.join(tempfile.gettempdir(), f"text_processor-{user}", "server.sock")
+
+
+def check_socket_owner(socket_path: str) -> None:
+    """Проверяет, что сокет и его каталог не принадлежат другому пользователю.
+
+    Каталог может принадлежать и root (например, /tmp). Иначе выбрасывается
+    PermissionError: такой сокет может подменить чужой процесс.
+    """
+    if not hasattr(os, "getuid"):
+        return
+    uid = os.getuid()
+    socket_dir = os.path.dirname(os.path.abspath(socket_path))
+    for path, owners in ((socket_dir, (uid, 0)), (socket_path, (uid,))):
+        try:
+            owner = os.lstat(path).st_uid
+        except FileNotFoundError:
+            continue
+        if owner not in owners:
+            raise PermissionError(
+                f"Путь сокета принадлежит другому пользователю: {path}"
+            )
+
+
+class ServerError(Exception):
+    """Ошибка обработки запроса на сервере."""
+
+    def __init__(self, message: str, code: int = 1):
+        super().__init__(message)
+        self.code = code
+
+
+class _DirectoryGate:
+    """Пропускает одновременно только запросы с одинаковым рабочим каталогом.
+
+    Пути в конфигурациях и каталог results относительны текущего каталога
+    процесса, поэтому запросы из разных каталогов выполняются по очереди.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._cwd: Optional[str] = None
+        self._active = 0
+
+    @contextmanager
+    def enter(self, cwd: str) -> Iterator[None]:
+        """Делает cwd текущим каталогом на время запроса."""
+        with self._condition:
+            while self._active and self._cwd != cwd:
+                self._condition.wait()
+            if self._cwd != cwd:
+                os.chdir(cwd)
+                self._cwd = cwd
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                self._condition.notify_all()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Обрабатывает один запрос: строка JSON на входе и на выходе."""
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+            response = self.server.text_processor.handle_request(request)
+        except ServerError as e:
+            response = {"ok": False, "error": str(e), "code": e.code}
+        except Exception as e:
+            response = {"ok": False, "error": str(e), "code": 1}
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8"))
+        self.wfile.write(b"\n")
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Многопоточный сервер на Unix-сокете."""
+
+    daemon_threads = True
+
+
+class TextProcessorServer:
+    """Сервер, выполняющий конфигурации в одном долгоживущем процессе.
+
+    Приложение (TextProcessorApp) создаётся один раз, поэтому кэш файлов,
+    кэш результатов и разобранные конфигурации переживают запросы. Запрос -
+    строка JSON с полем command: ping, list, run или shutdown. Один и тот же
+    файл результата не записывается двумя запросами одновременно.
+    """
+
+    def __init__(self, app, socket_path: str = None):
+        self.app = app
+        self.socket_path = socket_path or default_socket_path()
+        self._gate = _DirectoryGate()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._configs: Dict[str, Tuple[Any, List["Config"]]] = {}
+        self._configs_guard = threading.Lock()
+        self._server: Optional[_UnixServer] = None
+        self._profile_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Открывает сокет, удаляя оставшийся от завершившегося сервера.
+
+        Отсутствующий каталог сокета создаётся с правами 0700, сам сокет - с
+        правами 0600. Сокет или каталог другого пользователя не используются.
+        """
+        socket_dir = os.path.dirname(os.path.abspath(self.socket_path))
+        if not os.path.isdir(socket_dir):
+            os.makedirs(socket_dir, mode=0o700)
+        try:
+            check_socket_owner(self.socket_path)
+        except PermissionError as e:
+            raise ServerError(str(e))
+        if os.path.exists(self.socket_path):
+            if ServerClient(self.socket_path).is_available():
+                raise ServerError(f"Сервер уже запущен: {self.socket_path}")
+            os.remove(self.socket_path)
+        umask = os.umask(0o177)
+        try:
+            self._server = _UnixServer(self.socket_path, _RequestHandler)
+        finally:
+            os.umask(umask)
+        self._server.text_processor = self
+
+    def serve_forever(self) -> None:
+        """Обрабатывает запросы до вызова shutdown."""
+        if self._server is None:
+            self.start()
+        try:
+            self._server.serve_forever()
+        finally:
+            self.close()
+
+    def shutdown(self) -> None:
+        """Останавливает цикл обработки запросов из другого потока."""
+        if self._server is not None:
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def close(self) -> None:
+        """Закрывает сокет и удаляет его файл."""
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+            try:
+                os.remove(self.socket_path)
+            except OSError:
+                pass
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Выполняет запрос и возвращает ответ для отправки клиенту."""
+        command = request.get("command", "run")
+        if command == "ping":
+            return {"ok": True, "pid": os.getpid()}
+        if command == "shutdown":
+            self.shutdown()
+            return {"ok": True}
+        if command not in ("list", "run"):
+            raise ServerError(f"Неизвестная команда: {command}")
+
+        config_file = request["config_file"]
+        with self._gate.enter(request.get("cwd") or os.getcwd()):
+            configs = self.load_configs(config_file)
+            if command == "list":
+                output = ConsoleFormatter.format_configs(configs, config_file)
+                return {"ok": True, "output": output}
+
+            results = []
+            config_ids = request.get("config_ids")
+            for config in self.select_configs(configs, config_ids, config_file):
+                output_path = os.path.abspath(
+                    self.app.formatter.get_output_path(config.id)
+                )
+                with self._lock_for(output_path), self._profile_guard():
+                    results.append(
+                        (
+                            config.id,
+                            self._run_config(
+                                config_file,
+                                config,
+                                bool(request.get("incremental")),
+                            ),
+                        )
+                    )
+            return {"ok": True, "results": results}
+
+    def _run_config(self, config_file: str, config: "Config", incremental: bool) -> str:
+        """Выполняет конфигурацию, с профилем, если сервер запущен с --profile."""
+        if self.app.profile:
+            return self.app.run_config_profiled(config_file, config, incremental)
+        return self.app.run_config(config_file, config, incremental)
+
+    def _profile_guard(self):
+        """Возвращает блокировку для режимов профиля, глобальных для процесса.
+
+        cProfile и tracemalloc нельзя включать в нескольких запросах сразу,
+        поэтому с pstats и memory конфигурации выполняются по одной.
+        """
+        if self.app.profile & {"pstats", "memory"}:
+            return self._profile_lock
+        return nullcontext()
+
+    def load_configs(self, config_file: str) -> List["Config"]:
+        """Возвращает разобранные конфигурации из памяти, если файл не менялся."""
+        config_path = os.path.abspath(config_file)
+        signature = self.app.file_system.get_file_signature(config_path)
+        with self._configs_guard:
+            cached = self._configs.get(config_path)
+        if cached is not None and signature is not None and cached[0] == signature:
+            return cached[1]
+
+        configs = self.app.config_service.read_configs(config_file)
+        with self._configs_guard:
+            self._configs[config_path] = (signature, configs)
+        return configs
+
+    def select_configs(
+        self,
+        configs: List["Config"],
+        config_ids: Optional[List[str]],
+        config_file: str = "",
+    ) -> List["Config"]:
+        """Выбирает конфигурации по ID; None означает все конфигурации."""
+        if config_ids is None:
+            return configs
+
+        selected = []
+        for config_id in config_ids:
+            config = self.app.config_service.get_config_by_id(configs, config_id)
+            if config is None:
+                raise ServerError(
+                    f"Конфигурация с ID {config_id} не найдена в файле {config_file}"
+                )
+            selected.append(config)
+        return selected
+
+    def _lock_for(self, output_path: str) -> threading.Lock:
+        """Возвращает блокировку файла результата."""
+        with self._locks_guard:
+            return self._locks.setdefault(output_path, threading.Lock())
+
+
+class ServerClient:
+    """Тонкий клиент сервера обработки."""
+
+    BUFFER_SIZE = 64 * 1024
+
+    def __init__(self, socket_path: str = None, timeout: float = None):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+
+    def request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Отправляет запрос и возвращает ответ сервера.
+
+        Если сервер недоступен, выбрасывается OSError, а если сокет или его
+        каталог принадлежат другому пользователю - PermissionError.
+        """
+        check_socket_owner(self.socket_path)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(self.timeout)
+            client.connect(self.socket_path)
+            client.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+            client.sendall(b"\n")
+
+            chunks = []
+            while True:
+                chunk = client.recv(self.BUFFER_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                if chunk.endswith(b"\n"):
+                    break
+        if not chunks:
+            raise ConnectionError("Сервер закрыл соединение без ответа")
+        return json.loads(b"".join(chunks))
+
+    def run(
+        self,
+        config_file: str,
+        config_ids: Optional[List[str]],
+        incremental: bool = False,
+    ) -> Dict[str, Any]:
+        """Просит сервер выполнить конфигурации в текущем каталоге."""
+        return self.request(
+            {
+                "command": "run",
+                "cwd": os.getcwd(),
+                "config_file": config_file,
+                "config_ids": config_ids,
+                "incremental": incremental,
+            }
+        )
+
+    def list_configs(self, config_file: str) -> Dict[str, Any]:
+        """Просит сервер вернуть описание конфигураций файла."""
+        return self.request(
+            {"command": "list", "cwd": os.getcwd(), "config_file": config_file}
+        )
+
+    def is_available(self) -> bool:
+        """Проверяет, отвечает ли сервер."""
+        try:
+            return bool(self.request({"command": "ping"}).get("ok"))
+        except (OSError, ValueError):
+            return False
@@ -1,57 +1,526 @@
 #!/usr/bin/env python
+import os
 import sys
-import traceback
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from domain import TextProcessingService
-from application.services import ConfigService, FileProcessorService
-from infrastructure.adapters import LocalFileSystemAdapter, ConfigFileAdapter
-from infrastructure.repositories import FileRepository
-from presentation import CLI, ConsoleFormatter, JsonFormatter
+from presentation import OUTPUT_FORMATTERS, CLI, ConsoleFormatter, JsonFormatter
 
+# Слои приложения импортируются там, где они нужны: справка и запрос к серверу
+# не должны платить за импорт domain, NumPy, пулов потоков и адаптеров.
+if TYPE_CHECKING:  # pragma: no cover
+    from domain import Config
+    from application.ports import FileWatcherPort
+    from application.services import NullProfiler
 
-def main():
-    try:
-        file_system = LocalFileSystemAdapter()
-        config_adapter = ConfigFileAdapter(file_system)
-        file_repository = FileRepository(file_system)
-        text_service = TextProcessingService()
 
-        config_service = ConfigService(config_adapter, file_system)
-        file_processor = FileProcessorService(file_system, text_service)
+class TextProcessorApp:
+    """Связывает слои приложения и выполняет конфигурации."""
 
-        config_file, config_id = CLI.parse_args()
+    def __init__(
+        self,
+        use_result_cache: bool = True,
+        profile: Iterable[str] = (),
+        output_format: str = JsonFormatter.EXTENSION,
+        sparse: bool = False,
+        memo: Union[bool, int] = False,
+    ):
+        from domain import TextProcessingService
+        from application.services import (
+            ConfigService,
+            FileProcessorService,
+            IncrementalProcessorService,
+            LineMemo,
+            NullProfiler,
+        )
+        from infrastructure.adapters import (
+            ConfigFileAdapter,
+            LocalFileSystemAdapter,
+            MmapFileSystemAdapter,
+            StatCache,
+        )
+        from infrastructure.repositories import FileRepository, ResultCache
 
-        configs = config_service.read_configs(config_file)
+        # Оба адаптера делят сведения stat, проверенные в одном запуске.
+        self.stat_cache = StatCache()
+        self.file_system = LocalFileSystemAdapter(self.stat_cache)
+        # Без кэша результатов не пишется и кэш разобранных конфигураций.
+        config_cache_dir = None
+        if use_result_cache:
+            config_cache_dir = os.path.join(ResultCache.DEFAULT_CACHE_DIR, "configs")
+        self.config_adapter = ConfigFileAdapter(
+            self.file_system, cache_dir=config_cache_dir
+        )
+        self.file_repository = FileRepository(MmapFileSystemAdapter(self.stat_cache))
+        self.text_service = TextProcessingService()
 
-        if config_id is None:
-            formatted_configs = ConsoleFormatter.format_configs(configs, config_file)
-            print(formatted_configs)
-            sys.exit(0)
+        self.config_service = ConfigService(self.config_adapter, self.file_system)
+        # memo: False - без кэша строк, True - размер по умолчанию, число - размер.
+        self.line_memo = None
+        if memo:
+            self.line_memo = LineMemo() if memo is True else LineMemo(memo)
+        self.file_processor = FileProcessorService(
+            self.file_system, self.text_service, self.line_memo
+        )
+        self.incremental_processor = IncrementalProcessorService(
+            self.file_repository.file_system, self.file_processor
+        )
+        self.result_cache = ResultCache(self.file_system) if use_result_cache else None
+        self.profile = set(profile)
+        self.output_format = output_format
+        self.formatter = OUTPUT_FORMATTERS[output_format]
+        self.sparse = sparse
+        self.null_profiler = NullProfiler()
+
+    def run_config(
+        self,
+        config_file: str,
+        config: "Config",
+        incremental: bool = False,
+        profiler: "NullProfiler" = None,
+    ) -> str:
+        """Обрабатывает файлы одной конфигурации и сохраняет результат.
 
-        selected_config = config_service.get_config_by_id(configs, config_id)
-        if not selected_config:
-            error_msg = ConsoleFormatter.format_error(
-                f"Конфигурация с ID {config_id} не найдена в файле {config_file}"
+        Входные файлы проверяются одним stat за запуск: дальше их подпись,
+        размер и существование берутся из StatCache.
+        """
+        with self.stat_cache.scope():
+            return self._run_config(config_file, config, incremental, profiler)
+
+    def _run_config(
+        self,
+        config_file: str,
+        config: "Config",
+        incremental: bool,
+        profiler: Optional["NullProfiler"],
+    ) -> str:
+        """Выполняет run_config внутри запуска StatCache."""
+        if profiler is None:
+            profiler = self.null_profiler
+        with profiler.stage("get_files_from_config"):
+            file_paths = self.config_service.get_files_from_config(config)
+        profiler.count("files", len(file_paths))
+        # Сводки stats и search пересчитываются целиком: в них нет столбцов.
+        summary = config.action in self.file_processor.SUMMARY_ACTIONS
+        if incremental and not summary:
+            return self.run_config_incremental(
+                config_file, config, file_paths, profiler
             )
-            print(error_msg)
-            sys.exit(1)
 
-        file_paths = config_service.get_files_from_config(selected_config)
+        output_path = self.formatter.get_output_path(config.id)
+
+        cache_key = None
+        if self.result_cache is not None:
+            with profiler.stage("result_cache_fetch"):
+                cache_key = self.result_cache.make_key(
+                    config_file, config, file_paths, self.output_format, not self.sparse
+                )
+                cache_hit = cache_key is not None and self.result_cache.fetch(
+                    cache_key, output_path
+                )
+            profiler.count("result_cache_hits" if cache_hit else "result_cache_misses")
+            if cache_hit:
+                return output_path
 
-        files_content = file_repository.get_multiple_files(file_paths)
+        if config.action == self.file_processor.STATS_ACTION:
+            with profiler.stage("process_files"):
+                processed_data = self.file_processor.stream_stats(file_paths)
+            line_counts = None
+            if profiler.enabled:
+                profiler.count("lines_processed", processed_data.corpus.lines)
+        elif config.action == self.file_processor.SEARCH_ACTION:
+            patterns = self.config_service.get_search_patterns(config)
+            with profiler.stage("process_files"):
+                processed_data = self.file_processor.stream_matches(
+                    file_paths, patterns
+                )
+            line_counts = None
+            profiler.count("patterns", len(patterns))
+        elif self.file_processor.should_stream(file_paths):
+            profiler.count("streamed", 1)
+            line_counts = [] if self.sparse else None
+            if profiler.enabled:
+                counted = [] if line_counts is None else line_counts
+                rows = self.file_processor.iter_rows(
+                    file_paths, config.action, counted, pad=not self.sparse
+                )
+                processed_data = self._profile_rows(rows, profiler, counted)
+            else:
+                processed_data = self.file_processor.iter_rows(
+                    file_paths, config.action, line_counts
+                )
+        else:
+            hits, misses = self.file_repository.hits, self.file_repository.misses
+            with profiler.stage("get_multiple_files"):
+                files_content = self.file_repository.get_multiple_files(file_paths)
+            with profiler.stage("process_files"):
+                columnar = self.file_processor.process_files_columnar(
+                    files_content, config.action, config.workers
+                )
+            if self.sparse:
+                processed_data, line_counts = columnar.sparse_out, columnar.line_counts
+            else:
+                processed_data, line_counts = columnar.out, None
 
-        processed_data = file_processor.process_files(
-            files_content, selected_config.action
+            if profiler.enabled:
+                profiler.count("file_cache_hits", self.file_repository.hits - hits)
+                profiler.count(
+                    "file_cache_misses", self.file_repository.misses - misses
+                )
+                profiler.count(
+                    "bytes_read",
+                    sum(map(self.file_system.get_file_size, file_paths)),
+                )
+                lines_processed = sum(columnar.line_counts)
+                profiler.count("lines_processed", lines_processed)
+                profiler.count(
+                    "cells_produced",
+                    (
+                        lines_processed
+                        if self.sparse
+                        else columnar.max_lines * len(columnar.columns)
+                    ),
+                )
+
+        result = self.file_processor.create_processing_result(
+            config_file, config, processed_data, line_counts
         )
 
-        result = file_processor.create_processing_result(
-            config_file, selected_config, processed_data
+        with profiler.stage("save_to_file"):
+            output_path = self.formatter.save_to_file(result, output_path)
+        if cache_key is not None:
+            with profiler.stage("result_cache_store"):
+                self.result_cache.store(cache_key, output_path)
+        return output_path
+
+    @staticmethod
+    def _profile_rows(
+        rows: Iterator[Tuple[str, Dict[str, Union[str, int]]]],
+        profiler: "NullProfiler",
+        line_counts: List[int],
+    ) -> Iterator[Tuple[str, Dict[str, Union[str, int]]]]:
+        """Пропускает строки потокового результата, замеряя их обработку.
+
+        При потоковой записи файлы обрабатываются внутри save_to_file, поэтому
+        время обработки набирается по вызовам next() и пишется этапом
+        process_files, который входит во время save_to_file. Строки и ячейки
+        результата считаются по мере перебора.
+        """
+        from time import perf_counter
+
+        seconds = 0.0
+        cells = 0
+        try:
+            while True:
+                start = perf_counter()
+                row = next(rows, None)
+                seconds += perf_counter() - start
+                if row is None:
+                    break
+                cells += len(row[1])
+                yield row
+        finally:
+            rows.close()
+            profiler.add_time("process_files", seconds)
+            profiler.count("lines_processed", sum(line_counts))
+            profiler.count("cells_produced", cells)
+
+    def run_config_profiled(
+        self, config_file: str, config: "Config", incremental: bool = False
+    ) -> str:
+        """Обрабатывает конфигурацию и сохраняет рядом с результатом профиль.
+
+        Профиль этапов пишется в <результат>.profile.json, а при режиме
+        pstats ещё и дамп cProfile в <результат>.pstats. С кэшем строк в
+        счётчики попадают его попадания, промахи и вытеснения за запуск.
+        """
+        import cProfile
+        from application.services import Profiler
+
+        profiler = Profiler(trace_memory="memory" in self.profile)
+        memo_before = None
+        if self.line_memo is not None:
+            memo_before = self.line_memo.cache_stats()
+        cprofile = cProfile.Profile() if "pstats" in self.profile else None
+        if cprofile is not None:
+            cprofile.enable()
+        try:
+            output_path = self.run_config(config_file, config, incremental, profiler)
+        finally:
+            if cprofile is not None:
+                cprofile.disable()
+            if memo_before is not None:
+                memo_after = self.line_memo.cache_stats()
+                for name in ("hits", "misses", "evictions"):
+                    profiler.count(f"memo_{name}", memo_after[name] - memo_before[name])
+            trace = profiler.finish()
+
+        trace = dict(configurationID=config.id, action=config.action, **trace)
+        if cprofile is not None:
+            trace["pstats"] = JsonFormatter.get_pstats_path(output_path)
+            cprofile.dump_stats(trace["pstats"])
+        JsonFormatter.save_trace(trace, JsonFormatter.get_trace_path(output_path))
+        return output_path
+
+    def run_configs(
+        self,
+        config_file: str,
+        configs: List["Config"],
+        jobs: int = 1,
+        incremental: bool = False,
+    ) -> List[Tuple[str, str]]:
+        """Выполняет несколько конфигураций с общим кэшем прочитанных файлов.
+
+        cProfile и tracemalloc действуют на весь процесс, поэтому при их
+        использовании конфигурации выполняются последовательно.
+        """
+        run_config = self.run_config_profiled if self.profile else self.run_config
+
+        def run(config: "Config") -> Tuple[str, str]:
+            return config.id, run_config(config_file, config, incremental)
+
+        if jobs <= 1 or len(configs) <= 1 or self.profile & {"pstats", "memory"}:
+            return [run(config) for config in configs]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            return list(executor.map(run, configs))
+
+    def run_config_incremental(
+        self,
+        config_file: str,
+        config: "Config",
+        file_paths: List[str],
+        profiler: "NullProfiler" = None,
+    ) -> str:
+        """Пересчитывает только столбцы изменившихся файлов."""
+        if profiler is None:
+            profiler = self.null_profiler
+        output_path = self.formatter.get_output_path(config.id)
+        manifest_path = JsonFormatter.get_manifest_path(output_path)
+
+        manifest = JsonFormatter.load_manifest(manifest_path)
+        previous_out = None
+        if manifest is not None and manifest.result_signature == (
+            self.file_system.get_file_signature(output_path)
+        ):
+            previous_out = self.formatter.load_out(output_path)
+
+        with profiler.stage("incremental_process_files"):
+            processed_data, manifest, stale = self.incremental_processor.process_files(
+                file_paths, config.action, previous_out, manifest, self.sparse
+            )
+        profiler.count("stale_files", len(stale))
+        result = self.file_processor.create_processing_result(
+            config_file,
+            config,
+            processed_data,
+            manifest.line_counts if self.sparse else None,
         )
 
-        output_path = JsonFormatter.save_to_file(result)
+        with profiler.stage("save_to_file"):
+            output_path = self.formatter.save_to_file(result, output_path)
+        manifest.result_signature = self.file_system.get_file_signature(output_path)
+        JsonFormatter.save_manifest(manifest, manifest_path)
+        return output_path
+
+    def watch(
+        self,
+        config_file: str,
+        config_ids: Optional[List[str]] = None,
+        jobs: int = 1,
+        incremental: bool = False,
+        file_watcher: "FileWatcherPort" = None,
+        max_cycles: int = None,
+        timeout: float = None,
+    ) -> None:
+        """Выполняет конфигурации и перезапускает их при изменении входных данных.
+
+        Приложение и его кэши живут между запусками, поэтому неизменившиеся
+        файлы и конфигурации повторно не читаются.
+        """
+        from application.services import WatchService
+        from infrastructure.adapters import create_file_watcher
+
+        if file_watcher is None:
+            file_watcher = create_file_watcher()
+
+        def on_error(error: Exception) -> None:
+            print(ConsoleFormatter.format_error(str(error)))
+
+        def run(configs: List["Config"]) -> None:
+            try:
+                results = self.run_configs(config_file, configs, jobs, incremental)
+            except Exception as e:
+                on_error(e)
+                return
+            for _, output_path in results:
+                print(f"Результат сохранен в: {output_path}")
+
+        watch_service = WatchService(self.config_service, file_watcher)
+        try:
+            watch_service.watch(
+                config_file, config_ids, run, on_error, max_cycles, timeout
+            )
+        except KeyboardInterrupt:
+            pass
+        finally:
+            file_watcher.close()
+
+
+# Параметры, которые сервер не применяет к отдельному запросу: с ними команда
+# выполняется в этом процессе, а не уходит на сервер с его настройками.
+LOCAL_ONLY_OPTIONS = (
+    "watch",
+    "profile",
+    "format",
+    "sparse",
+    "memo",
+    "no-cache",
+    "jobs",
+)
+
+
+def serve(options: Dict[str, Union[str, bool]]) -> None:
+    """Запускает сервер с общими кэшами на Unix-сокете."""
+    from presentation.server import TextProcessorServer
+
+    app = TextProcessorApp(
+        use_result_cache=not options.get("no-cache"),
+        profile=CLI.parse_profile_modes(options.get("profile")),
+        output_format=CLI.parse_output_format(options.get("format")),
+        sparse=bool(options.get("sparse")),
+        memo=CLI.parse_memo_size(options.get("memo")),
+    )
+    socket_path = options["serve"] if options["serve"] is not True else None
+    server = TextProcessorServer(app, socket_path)
+    server.start()
+    print(f"Сервер запущен: {server.socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def run_via_server(
+    config_file: str, config_id: Optional[str], options: Dict[str, Union[str, bool]]
+) -> bool:
+    """Выполняет команду через сервер; возвращает False, если он недоступен."""
+    from presentation.server import ServerClient
+
+    socket_path = options["server"] if options["server"] is not True else None
+    client = ServerClient(socket_path)
+    try:
+        if options.get("all"):
+            response = client.run(config_file, None, bool(options.get("incremental")))
+        elif config_id is None:
+            response = client.list_configs(config_file)
+        else:
+            response = client.run(
+                config_file,
+                CLI.split_config_ids(config_id),
+                bool(options.get("incremental")),
+            )
+    except PermissionError as e:
+        print(ConsoleFormatter.format_error(str(e)))
+        return False
+    except OSError:
+        return False
+
+    if not response["ok"]:
+        print(ConsoleFormatter.format_error(response["error"]))
+        sys.exit(response.get("code", 1))
+    if "output" in response:
+        print(response["output"])
+    for _, output_path in response.get("results", []):
         print(f"Результат сохранен в: {output_path}")
+    return True
+
+
+def main():
+    try:
+        options = CLI.parse_options()
+        if options.get("serve"):
+            serve(options)
+            return
+
+        config_file, config_id = CLI.parse_args()
+        if (
+            options.get("server")
+            and not any(options.get(name) for name in LOCAL_ONLY_OPTIONS)
+            and run_via_server(config_file, config_id, options)
+        ):
+            return
+
+        # Список конфигураций не обращается к кэшу результатов, поэтому и кэш
+        # разобранных конфигураций для него не пишется.
+        list_only = config_id is None and not options.get("all")
+        app = TextProcessorApp(
+            use_result_cache=not options.get("no-cache") and not list_only,
+            profile=CLI.parse_profile_modes(options.get("profile")),
+            output_format=CLI.parse_output_format(options.get("format")),
+            sparse=bool(options.get("sparse")),
+            memo=CLI.parse_memo_size(options.get("memo")),
+        )
+        jobs = CLI.parse_jobs(options.get("jobs"))
+        configs = app.config_service.read_configs(config_file)
+
+        if options.get("all"):
+            selected_configs = configs
+        elif config_id is None:
+            formatted_configs = ConsoleFormatter.format_configs(configs, config_file)
+            print(formatted_configs)
+            sys.exit(0)
+        else:
+            selected_configs = []
+            for selected_id in CLI.split_config_ids(config_id):
+                selected_config = app.config_service.get_config_by_id(
+                    configs, selected_id
+                )
+                if not selected_config:
+                    error_msg = ConsoleFormatter.format_error(
+                        f"Конфигурация с ID {selected_id} не найдена в файле {config_file}"
+                    )
+                    print(error_msg)
+                    sys.exit(1)
+                selected_configs.append(selected_config)
+
+        if options.get("watch"):
+            from infrastructure.adapters import PollingFileWatcher
+
+            print("Отслеживание изменений, для выхода нажмите Ctrl+C")
+            app.watch(
+                config_file,
+                None if options.get("all") else [c.id for c in selected_configs],
+                jobs=jobs,
+                incremental=bool(options.get("incremental")),
+                file_watcher=(
+                    PollingFileWatcher() if options.get("watch") == "poll" else None
+                ),
+            )
+            return
+
+        results = app.run_configs(
+            config_file,
+            selected_configs,
+            jobs=jobs,
+            incremental=bool(options.get("incremental")),
+        )
+        for _, output_path in results:
+            print(f"Результат сохранен в: {output_path}")
 
     except Exception as e:
+        import traceback
+
         print(ConsoleFormatter.format_error(str(e)))
         traceback.print_exc()
         sys.exit(1)
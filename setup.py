@@ -14,5 +14,8 @@ setup(
     },
     test_suite="tests",
     tests_require=["pytest", "pytest-cov"],
-    extras_require={"dev": ["pytest", "pytest-cov", "black", "flake8"]},
+    extras_require={
+        "dev": ["pytest", "pytest-cov", "black", "flake8"],
+        "fast": ["numpy"],
+    },
 )
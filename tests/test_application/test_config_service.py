@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import Mock
-from domain import Config
+from domain import Config, StatRecord
 from application.services import ConfigService
 from application.ports import ConfigPort, FileSystemPort
 
@@ -63,14 +63,34 @@ class TestConfigService:
         expected_files = ["./test/file1.txt", "./test/file2.txt"]
 
         self.file_system_port.dir_exists.return_value = True
-        self.file_system_port.list_files.return_value = expected_files
+        self.file_system_port.iter_files.return_value = iter(expected_files[::-1])
 
         result = self.service.get_files_from_config(config)
 
         self.file_system_port.dir_exists.assert_called_once_with(config.path)
-        self.file_system_port.list_files.assert_called_once_with(config.path)
+        self.file_system_port.iter_files.assert_called_once_with(
+            config.path, recursive=False, include=[], exclude=[]
+        )
         assert result == expected_files
 
+    def test_get_files_from_config_dir_mode_filters(self):
+        """Тест передачи рекурсии и шаблонов в файловую систему."""
+        config = Config(
+            id="1",
+            mode="dir",
+            path="./test",
+            recursive=True,
+            include="*.txt, *.md,",
+            exclude=" tmp ",
+        )
+        self.file_system_port.dir_exists.return_value = True
+        self.file_system_port.iter_files.return_value = iter([])
+
+        assert self.service.get_files_from_config(config) == []
+        self.file_system_port.iter_files.assert_called_once_with(
+            "./test", recursive=True, include=["*.txt", "*.md"], exclude=["tmp"]
+        )
+
     def test_get_files_from_config_dir_not_found(self):
         """Тест обработки ошибки при отсутствии директории."""
         config = Config(id="1", mode="dir", path="./non_existent", action="string")
@@ -82,7 +102,7 @@ class TestConfigService:
 
         assert f"Директория не найдена: {config.path}" in str(exc_info.value)
         self.file_system_port.dir_exists.assert_called_once_with(config.path)
-        self.file_system_port.list_files.assert_not_called()
+        self.file_system_port.iter_files.assert_not_called()
 
     def test_get_files_from_config_files_mode(self):
         """Тест получения файлов в режиме списка файлов."""
@@ -90,13 +110,28 @@ class TestConfigService:
         expected_files = ["./test/file1.txt", "./test/file2.txt"]
         config = Config(id="1", mode="files", path=file_paths, action="string")
 
-        self.file_system_port.file_exists.return_value = True
+        self.file_system_port.stat_file.return_value = StatRecord(True, 3, 1)
 
         result = self.service.get_files_from_config(config)
 
-        assert self.file_system_port.file_exists.call_count == 2
+        assert self.file_system_port.stat_file.call_count == 2
+        self.file_system_port.file_exists.assert_not_called()
         assert result == sorted(expected_files)
 
+    def test_get_files_from_config_files_mode_not_found(self):
+        """Тест ошибки, если файл списка отсутствует или не является файлом."""
+        config = Config(id="1", mode="files", path="a.txt, dir", action="string")
+
+        for record in (None, StatRecord(False, 0, 1)):
+            self.file_system_port.stat_file.side_effect = lambda path: (
+                StatRecord(True, 3, 1) if path == "a.txt" else record
+            )
+
+            with pytest.raises(FileNotFoundError) as exc_info:
+                self.service.get_files_from_config(config)
+
+            assert "Файл не найден: dir" in str(exc_info.value)
+
     def test_get_files_from_config_invalid_mode(self):
         """Тест обработки ошибки при неверном режиме."""
         config = Config(id="1", mode="invalid", path="./test", action="string")
@@ -105,3 +140,43 @@ class TestConfigService:
             self.service.get_files_from_config(config)
 
         assert f"Неподдерживаемый режим: {config.mode}" in str(exc_info.value)
+
+    def test_get_search_patterns(self):
+        """Тест сбора шаблонов из конфигурации и файла без повторов."""
+        config = Config(
+            id="1",
+            mode="files",
+            path="a.txt",
+            action="search",
+            patterns="error, warn,,",
+            patterns_file="patterns.txt",
+        )
+        self.file_system_port.file_exists.return_value = True
+        self.file_system_port.read_file.return_value = [
+            "  fail ",
+            "",
+            "error",
+            "warn\n",
+        ]
+
+        result = self.service.get_search_patterns(config)
+
+        self.file_system_port.read_file.assert_called_once_with("patterns.txt")
+        assert result == ["error", "warn", "fail"]
+        assert self.service.get_search_patterns(
+            Config("2", "files", "a.txt", patterns="x")
+        ) == ["x"]
+
+    def test_get_search_patterns_errors(self):
+        """Тест ошибок при отсутствии файла шаблонов и самих шаблонов."""
+        self.file_system_port.file_exists.return_value = False
+
+        with pytest.raises(FileNotFoundError) as exc_info:
+            self.service.get_search_patterns(
+                Config("1", "files", "a.txt", patterns_file="missing.txt")
+            )
+        assert "Файл шаблонов не найден: missing.txt" in str(exc_info.value)
+
+        with pytest.raises(ValueError) as exc_info:
+            self.service.get_search_patterns(Config("1", "files", "a.txt"))
+        assert "не заданы шаблоны" in str(exc_info.value)
@@ -1,7 +1,9 @@
-from unittest.mock import Mock
-from domain import FileContent, Config, TextProcessingService
+from array import array
+from unittest.mock import Mock, patch
+from domain import CompactLines, FileContent, Config, SearchResult, StatsResult
+from domain import TextProcessingService
 from application.ports import FileSystemPort
-from application.services import FileProcessorService
+from application.services import FileProcessorService, LineMemo
 
 
 class TestFileProcessorService:
@@ -55,7 +57,9 @@ class TestFileProcessorService:
             FileContent(file_path="file2.txt", lines=["six seven eight nine"]),
         ]
 
-        self.text_service.count_words.side_effect = lambda text: len(text.split())
+        self.text_service.count_words_bulk.side_effect = lambda lines: [
+            len(text.split()) for text in lines
+        ]
 
         result = self.service.process_files(files_content, "count")
 
@@ -71,9 +75,9 @@ class TestFileProcessorService:
             FileContent(file_path="file2.txt", lines=["ghi"]),
         ]
 
-        self.text_service.replace_letters.side_effect = (
-            lambda text, file_num: f"replaced_{file_num}_{text}"
-        )
+        self.text_service.replace_lines.side_effect = lambda lines, file_num: [
+            f"replaced_{file_num}_{text}" for text in lines
+        ]
 
         result = self.service.process_files(files_content, "replace")
 
@@ -82,6 +86,265 @@ class TestFileProcessorService:
         assert result["2"]["1"] == "replaced_1_def"
         assert result["2"]["2"] == ""
 
+    def test_process_files_replace_with_real_service(self):
+        """Тест действия 'replace' с настоящим сервисом обработки текста."""
+        service = FileProcessorService(self.file_system_port, TextProcessingService())
+        files_content = [
+            FileContent(file_path="file1.txt", lines=["Hello, World!", "Б z"]),
+            FileContent(file_path="file2.txt", lines=["abc"]),
+        ]
+
+        result = service.process_files(files_content, "replace")
+
+        assert result == {
+            "1": {"1": "96131316, 241619135!", "2": "345"},
+            "2": {"1": "Б 27", "2": ""},
+        }
+
+    def test_process_files_unknown_action(self):
+        """Тест обработки файлов с неизвестным действием."""
+        files_content = [
+            FileContent(file_path="file1.txt", lines=["a", "b"]),
+            FileContent(file_path="file2.txt", lines=["c"]),
+        ]
+
+        result = self.service.process_files(files_content, "unknown")
+
+        assert result == {"1": {"1": "", "2": ""}, "2": {"1": "", "2": ""}}
+
+    def test_process_files_empty(self):
+        """Тест обработки пустого списка файлов."""
+        assert self.service.process_files([], "string") == {}
+
+    def test_iter_rows_matches_process_files(self):
+        """Тест совпадения потоковой обработки с обычной."""
+        service = FileProcessorService(self.file_system_port, TextProcessingService())
+        files = {
+            "file1.txt": ["one two", "Hello, World!", "третья строка"],
+            "file2.txt": ["abc"],
+            "file3.txt": [],
+        }
+        self.file_system_port.iter_lines.side_effect = lambda path: iter(files[path])
+        files_content = [
+            FileContent(file_path=path, lines=lines) for path, lines in files.items()
+        ]
+
+        for action in ("string", "count", "replace", "unknown"):
+            rows = service.iter_rows(list(files), action)
+
+            assert dict(rows) == service.process_files(files_content, action)
+
+    def test_line_memo_matches_plain_processing(self):
+        """Тест совпадения результата с кэшем строк и без него."""
+        memo = LineMemo()
+        service = FileProcessorService(
+            self.file_system_port, TextProcessingService(), memo
+        )
+        plain = FileProcessorService(self.file_system_port, TextProcessingService())
+        files = {
+            "file1.txt": ["one two", "Hello", "one two", "Hello"],
+            "file2.txt": ["Hello", "one two"],
+        }
+        self.file_system_port.iter_lines.side_effect = lambda path: iter(files[path])
+        files_content = [
+            FileContent(file_path=path, lines=CompactLines.from_lines(lines))
+            for path, lines in files.items()
+        ]
+
+        for action in ("string", "count", "replace", "unknown"):
+            expected = plain.process_files_columnar(files_content, action)
+            columnar = service.process_files_columnar(files_content, action)
+
+            assert columnar.columns == expected.columns
+            assert dict(service.iter_rows(list(files), action)) == expected.out
+
+        count_column = service.process_lines(files["file1.txt"], "count", 1)
+        assert isinstance(count_column, array) and count_column.typecode == "q"
+        # replace зависит от номера файла, string и count - только от строки.
+        assert memo.cache_stats()["entries"] == 2 + 2 + 4
+        # 3 действия по 12 строк (обычная и потоковая обработка) и ещё 4 строки.
+        assert memo.cache_stats()["hits"] == 3 * 12 + 4 - 8
+
+    def test_iter_rows_sparse(self):
+        """Тест потоковой обработки без дополнения коротких файлов."""
+        files = {"file1.txt": ["a b"], "file2.txt": [], "file3.txt": ["c", "d e"]}
+        self.file_system_port.iter_lines.side_effect = lambda path: iter(files[path])
+        service = FileProcessorService(self.file_system_port, TextProcessingService())
+        line_counts = []
+
+        rows = service.iter_rows(list(files), "count", line_counts)
+
+        assert line_counts == [0, 0, 0]
+        assert list(rows) == [("1", {"1": 2, "3": 1}), ("2", {"3": 2})]
+        assert line_counts == [1, 0, 2]
+
+    def test_build_rows_sparse(self):
+        """Тест сборки строк без ячеек дополнения."""
+        rows = self.service.build_rows([["a"], ["b", "c"]], "string", sparse=True)
+
+        assert rows == {"1": {"1": "a", "2": "b"}, "2": {"2": "c"}}
+
+    def test_process_files_stats(self):
+        """Тест действия stats для прочитанных и потоково читаемых файлов."""
+        service = FileProcessorService(self.file_system_port, TextProcessingService())
+        service.BATCH_LINES = 2
+        files = {
+            "file1.txt": ["one two", "", "третья строка здесь"],
+            "file2.txt": ["abc"],
+            "file3.txt": [],
+        }
+        self.file_system_port.iter_lines.side_effect = lambda path: iter(files[path])
+        files_content = [
+            FileContent(file_path=path, lines=CompactLines.from_lines(lines))
+            for path, lines in files.items()
+        ]
+
+        stats = service.process_files(files_content, "stats")
+        streamed = service.stream_stats(list(files))
+
+        assert isinstance(stats, StatsResult)
+        assert stats.to_dict() == streamed.to_dict()
+        summary = stats.to_dict()
+        assert summary["files"]["1"]["words"] == 5
+        assert summary["files"]["1"]["longest"][0] == {"line": 3, "length": 19}
+        assert summary["files"]["3"]["lines"] == 0
+        assert summary["corpus"]["lines"] == 4
+
+    def test_process_files_search(self):
+        """Тест действия search по порциям строк и при потоковом чтении."""
+        service = FileProcessorService(self.file_system_port, TextProcessingService())
+        service.BATCH_LINES = 2
+        files = {
+            "file1.txt": ["ushers", "", "his hers", "she"],
+            "file2.txt": ["nothing"],
+        }
+        self.file_system_port.iter_lines.side_effect = lambda path: iter(files[path])
+        files_content = [
+            FileContent(file_path=path, lines=CompactLines.from_lines(lines))
+            for path, lines in files.items()
+        ]
+        patterns = ["he", "she", "his", "hers", "he"]
+
+        found = service.process_files(files_content, "search", patterns=patterns)
+        streamed = service.stream_matches(list(files), patterns)
+
+        assert isinstance(found, SearchResult)
+        assert found.to_dict() == streamed.to_dict()
+        summary = found.to_dict()
+        assert summary["patterns"] == ["he", "she", "his", "hers"]
+        assert summary["files"]["1"]["lines"] == {
+            "1": {"she": 1, "he": 1, "hers": 1},
+            "3": {"his": 1, "he": 1, "hers": 1},
+            "4": {"she": 1, "he": 1},
+        }
+        assert summary["files"]["2"]["matches"] == 0
+        assert summary["corpus"]["patterns"] == {"he": 3, "she": 2, "his": 1, "hers": 2}
+
+    def test_search_many_patterns_and_none(self):
+        """Тест поиска автоматом для большого набора и поиска без шаблонов."""
+        service = FileProcessorService(self.file_system_port, TextProcessingService())
+        lines = [f"w{index} w{index + 1}" for index in range(100)]
+        patterns = [f"w{index} " for index in range(100)]
+
+        found = service.collect_matches([lines], patterns).to_dict()
+        empty = service.collect_matches([lines], []).to_dict()
+
+        assert found["corpus"]["matches"] == 100
+        assert found["files"]["1"]["lines"]["100"] == {"w99 ": 1}
+        assert empty["corpus"] == {"matches": 0, "matchedFiles": 0, "patterns": {}}
+
+    def test_iter_rows_padded_line_counts(self):
+        """Тест подсчёта строк файлов при потоковой обработке с дополнением."""
+        files = {"file1.txt": ["a b"], "file2.txt": [], "file3.txt": ["c", "d e"]}
+        self.file_system_port.iter_lines.side_effect = lambda path: iter(files[path])
+        service = FileProcessorService(self.file_system_port, TextProcessingService())
+        line_counts = []
+
+        rows = service.iter_rows(list(files), "count", line_counts, pad=True)
+
+        assert list(rows) == [
+            ("1", {"1": 2, "2": 0, "3": 1}),
+            ("2", {"1": 0, "2": 0, "3": 2}),
+        ]
+        assert line_counts == [1, 0, 2]
+        sparse_rows = service.iter_rows(list(files), "count", pad=False)
+        assert list(sparse_rows) == [("1", {"1": 2, "3": 1}), ("2", {"3": 2})]
+
+    def test_iter_rows_is_lazy(self):
+        """Тест ленивого чтения строк при потоковой обработке."""
+        consumed = []
+
+        def iter_lines(path):
+            for line in ["a", "b", "c"]:
+                consumed.append((path, line))
+                yield line
+
+        self.file_system_port.iter_lines.side_effect = iter_lines
+
+        rows = self.service.iter_rows(["file1.txt", "file2.txt"], "string")
+        first = next(rows)
+
+        assert first == ("1", {"1": "a", "2": "a"})
+        assert consumed == [("file1.txt", "a"), ("file2.txt", "a")]
+        rows.close()
+
+    def test_should_stream(self):
+        """Тест выбора потокового режима по суммарному размеру файлов."""
+        threshold = FileProcessorService.STREAMING_THRESHOLD
+        self.file_system_port.get_file_size.return_value = threshold // 2
+
+        assert self.service.should_stream(["file1.txt", "file2.txt"]) is False
+        assert self.service.should_stream(["file1.txt", "file2.txt", "file3.txt"])
+        assert self.service.should_stream([]) is False
+
+    def test_iter_rows_no_files(self):
+        """Тест потоковой обработки пустого списка файлов."""
+        assert list(self.service.iter_rows([], "count")) == []
+
+    def test_process_files_parallel_matches_serial(self):
+        """Тест совпадения параллельной обработки с последовательной."""
+        service = FileProcessorService(self.file_system_port, TextProcessingService())
+        service.PARALLEL_THRESHOLD = 0
+        files_content = [
+            FileContent(
+                file_path="file1.txt",
+                lines=[f"Line {i} of file one" for i in range(37)],
+            ),
+            FileContent(file_path="file2.txt", lines=["abc XYZ", "", "два слова"]),
+            FileContent(file_path="file3.txt", lines=[]),
+        ]
+
+        for action in ("count", "replace"):
+            serial = service.process_files(files_content, action)
+            parallel = service.process_files(files_content, action, workers=3)
+
+            assert parallel == serial
+            assert list(parallel) == list(serial)
+
+    def test_process_files_below_parallel_threshold(self):
+        """Тест отказа от пула процессов для небольших входных данных."""
+        files_content = [FileContent(file_path="file1.txt", lines=["one two"])]
+        self.text_service.count_words_bulk.side_effect = lambda lines: [
+            len(text.split()) for text in lines
+        ]
+
+        with patch("concurrent.futures.ProcessPoolExecutor") as mock_executor:
+            result = self.service.process_files(files_content, "count", workers=8)
+
+            mock_executor.assert_not_called()
+        assert result == {"1": {"1": 2}}
+
+    def test_should_parallelize(self):
+        """Тест условий запуска параллельной обработки."""
+        self.service.PARALLEL_THRESHOLD = 2
+        files_content = [FileContent(file_path="file1.txt", lines=["a", "b"])]
+
+        assert self.service.should_parallelize(files_content, "count", 2) is True
+        assert self.service.should_parallelize(files_content, "replace", 2) is True
+        assert self.service.should_parallelize(files_content, "string", 2) is False
+        assert self.service.should_parallelize(files_content, "count", 1) is False
+        assert self.service.should_parallelize(files_content[:0], "count", 2) is False
+
     def test_create_processing_result(self):
         """Тест создания объекта с результатами обработки."""
         config_file = "config.txt"
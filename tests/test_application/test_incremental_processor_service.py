@@ -0,0 +1,118 @@
+from unittest.mock import Mock
+from domain import ResultManifest, TextProcessingService
+from application.ports import FileSystemPort
+from application.services import FileProcessorService, IncrementalProcessorService
+
+
+class TestIncrementalProcessorService:
+    """Тесты для сервиса инкрементальной переобработки."""
+
+    def setup_method(self):
+        """Настройка перед каждым тестом."""
+        self.files = {
+            "a.txt": ["one two", "three"],
+            "b.txt": ["abc"],
+            "c.txt": ["x y z", "", "end"],
+        }
+        self.signatures = {"a.txt": (1, 10), "b.txt": (2, 20), "c.txt": (3, 30)}
+        self.file_system_port = Mock(spec=FileSystemPort)
+        self.file_system_port.read_file.side_effect = lambda path: self.files[path]
+        self.file_system_port.get_file_signature.side_effect = (
+            lambda path: self.signatures.get(path)
+        )
+        self.file_processor = FileProcessorService(
+            self.file_system_port, TextProcessingService()
+        )
+        self.service = IncrementalProcessorService(
+            self.file_system_port, self.file_processor
+        )
+
+    def full_run(self, file_paths, action):
+        """Выполняет полный пересчёт для сравнения."""
+        return self.service.process_files(file_paths, action, None, None)
+
+    def test_first_run_processes_everything(self):
+        """Тест полного пересчёта при отсутствии предыдущего результата."""
+        out, manifest, stale = self.full_run(["a.txt", "b.txt"], "count")
+
+        assert stale == [0, 1]
+        assert out == {"1": {"1": 2, "2": 1}, "2": {"1": 1, "2": 0}}
+        assert manifest.files == ["a.txt", "b.txt"]
+        assert manifest.signatures == [(1, 10), (2, 20)]
+        assert manifest.line_counts == [2, 1]
+
+    def test_sparse_rows(self):
+        """Тест пересчёта с разреженным предыдущим результатом."""
+        paths = ["a.txt", "b.txt"]
+        out, manifest, _ = self.service.process_files(
+            paths, "count", None, None, sparse=True
+        )
+        self.files["a.txt"] = ["one"]
+        self.signatures["a.txt"] = (5, 50)
+
+        new_out, new_manifest, stale = self.service.process_files(
+            paths, "count", out, manifest, sparse=True
+        )
+
+        assert out == {"1": {"1": 2, "2": 1}, "2": {"1": 1}}
+        assert stale == [0]
+        assert new_out == {"1": {"1": 1, "2": 1}}
+        assert new_manifest.line_counts == [1, 1]
+
+    def test_only_changed_file_is_reprocessed(self):
+        """Тест пересчёта только изменившегося файла."""
+        paths = ["a.txt", "b.txt", "c.txt"]
+        out, manifest, _ = self.full_run(paths, "replace")
+        self.files["b.txt"] = ["def", "ghi"]
+        self.signatures["b.txt"] = (4, 40)
+        self.file_system_port.read_file.reset_mock()
+
+        new_out, _, stale = self.service.process_files(paths, "replace", out, manifest)
+
+        assert stale == [1]
+        self.file_system_port.read_file.assert_called_once_with("b.txt")
+        assert new_out == self.full_run(paths, "replace")[0]
+
+    def test_index_shift_and_removal(self):
+        """Тест пересчёта сдвинувшихся столбцов при удалении файла."""
+        out, manifest, _ = self.full_run(["a.txt", "b.txt", "c.txt"], "replace")
+
+        new_out, new_manifest, stale = self.service.process_files(
+            ["a.txt", "c.txt"], "replace", out, manifest
+        )
+
+        assert stale == [1]
+        assert new_out == self.full_run(["a.txt", "c.txt"], "replace")[0]
+        assert new_manifest.line_counts == [2, 3]
+
+    def test_added_file_and_padding(self):
+        """Тест добавления файла и сохранения нулей дополнения."""
+        out, manifest, _ = self.full_run(["a.txt", "b.txt"], "count")
+
+        new_out, _, stale = self.service.process_files(
+            ["a.txt", "b.txt", "c.txt"], "count", out, manifest
+        )
+
+        assert stale == [2]
+        assert new_out == self.full_run(["a.txt", "b.txt", "c.txt"], "count")[0]
+
+    def test_action_change_reprocesses_everything(self):
+        """Тест полного пересчёта при смене действия."""
+        out, manifest, _ = self.full_run(["a.txt", "b.txt"], "count")
+
+        new_out, _, stale = self.service.process_files(
+            ["a.txt", "b.txt"], "string", out, manifest
+        )
+
+        assert stale == [0, 1]
+        assert new_out == self.full_run(["a.txt", "b.txt"], "string")[0]
+
+    def test_missing_signature_is_stale(self):
+        """Тест пересчёта файла без сигнатуры."""
+        manifest = ResultManifest(
+            action="count", files=["d.txt"], signatures=[None], line_counts=[0]
+        )
+
+        stale = self.service.find_stale_columns(["d.txt"], [None], "count", manifest)
+
+        assert stale == [0]
@@ -0,0 +1,81 @@
+import sys
+from array import array
+import pytest
+from domain import CompactLines
+from application.services import LineMemo
+
+
+class TestLineMemo:
+    """Тесты для кэша результатов обработки строк."""
+
+    def test_map_lines_computes_new_lines_once(self):
+        """Тест вычисления только новых строк и счётчиков по строкам."""
+        memo = LineMemo()
+        memo.BATCH_LINES = 2
+        calls = []
+
+        def compute(lines):
+            calls.append(list(lines))
+            return [line.upper() for line in lines]
+
+        first = memo.map_lines("replace", 1, ["a", "b", "a", "a", "c"], compute)
+        second = memo.map_lines(
+            "replace", 1, CompactLines.from_lines(["c", "a"]), compute
+        )
+
+        assert first == ["A", "B", "A", "A", "C"]
+        assert second == ["C", "A"]
+        assert calls == [["a", "b"], ["c"]]
+        assert memo.cache_stats() == {
+            "hits": 4,
+            "misses": 3,
+            "evictions": 0,
+            "entries": 3,
+            "hit_rate": 4 / 7,
+        }
+
+    def test_key_includes_action_and_file(self):
+        """Тест раздельных записей для разных действий и файлов."""
+        memo = LineMemo()
+
+        memo.map_lines("replace", 1, ["a"], lambda lines: ["1"])
+        memo.map_lines("replace", 2, ["a"], lambda lines: ["2"])
+        values = memo.map_lines("count", 0, ["a"], lambda lines: array("q", [7]))
+
+        assert values == [7]
+        assert memo.map_lines("replace", 2, ["a"], lambda lines: ["x"]) == ["2"]
+        assert memo.cache_stats()["entries"] == 3
+
+    def test_lru_eviction(self):
+        """Тест вытеснения давно не использованных строк."""
+        memo = LineMemo(max_entries=2)
+        handler = memo.wrap("string", 0, str.upper)
+
+        assert [handler(line) for line in "abab"] == ["A", "B", "A", "B"]
+        handler("c")
+        assert memo.map_lines("string", 0, ["b"], lambda lines: ["x"]) == ["B"]
+        assert memo.map_lines("string", 0, ["a"], lambda lines: ["x"]) == ["x"]
+        assert memo.cache_stats()["evictions"] == 2
+        assert memo.cache_stats()["hits"] == 3
+
+    def test_values_are_interned(self):
+        """Тест хранения одинаковых значений одним объектом."""
+        memo = LineMemo(max_entries=1)
+        value = "".join(["re", "sult"])
+        handler = memo.wrap("replace", 1, lambda line: "".join(["re", "sult"]))
+
+        first = handler("x")
+        second = memo.map_lines("replace", 2, ["y"], lambda lines: [value])[0]
+
+        assert first is second is sys.intern("result")
+
+    def test_clear_and_invalid_size(self):
+        """Тест очистки кэша и ошибки при неположительном размере."""
+        memo = LineMemo()
+        memo.map_lines("string", 0, ["a"], list)
+        memo.clear()
+
+        assert memo.cache_stats()["entries"] == 0
+        assert LineMemo().cache_stats()["hit_rate"] == 0.0
+        with pytest.raises(ValueError):
+            LineMemo(max_entries=0)
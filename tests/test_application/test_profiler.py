@@ -0,0 +1,56 @@
+import tracemalloc
+from application.services import NullProfiler, Profiler
+
+
+class TestProfiler:
+    """Тесты для профилировщика этапов."""
+
+    def test_null_profiler(self):
+        """Тест выключенного профилирования."""
+        profiler = NullProfiler()
+
+        with profiler.stage("read") as stage:
+            profiler.count("lines", 10)
+
+        assert profiler.enabled is False
+        assert stage is profiler.stage("process")
+
+    def test_stages_and_counters(self):
+        """Тест накопления времени этапов и счётчиков."""
+        profiler = Profiler()
+
+        for _ in range(2):
+            with profiler.stage("read"):
+                profiler.count("lines", 10)
+        profiler.count("files")
+        trace = profiler.finish()
+
+        assert trace["stages"]["read"]["calls"] == 2
+        assert trace["stages"]["read"]["seconds"] >= 0
+        assert trace["counters"] == {"lines": 20, "files": 1}
+        assert trace["total_seconds"] >= trace["stages"]["read"]["seconds"]
+        assert trace["memory"]["peak_rss_bytes"] > 0
+        assert "tracemalloc_peak_bytes" not in trace["memory"]
+
+    def test_stage_records_time_on_error(self):
+        """Тест учёта времени этапа, завершившегося исключением."""
+        profiler = Profiler()
+
+        try:
+            with profiler.stage("process"):
+                raise RuntimeError("ошибка")
+        except RuntimeError:
+            pass
+
+        assert profiler.stages["process"]["calls"] == 1
+
+    def test_trace_memory(self):
+        """Тест замера пика памяти через tracemalloc."""
+        profiler = Profiler(trace_memory=True)
+        data = [0] * 100_000
+
+        trace = profiler.finish()
+
+        assert len(data) == 100_000
+        assert trace["memory"]["tracemalloc_peak_bytes"] >= 100_000 * 8
+        assert not tracemalloc.is_tracing()
@@ -0,0 +1,163 @@
+import os
+from unittest.mock import Mock
+from domain import Config, StatRecord
+from application.ports import ConfigPort, FileSystemPort, FileWatcherPort
+from application.services import ConfigService, WatchService
+
+
+class FakeWatcher(FileWatcherPort):
+    """Наблюдатель, возвращающий заранее заданные пачки изменений."""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.watched = []
+        self.timeouts = []
+
+    def watch(self, paths):
+        self.watched.append(set(paths))
+
+    def wait(self, timeout=None):
+        self.timeouts.append(timeout)
+        return set(self.batches.pop(0)) if self.batches else set()
+
+    def close(self):
+        pass
+
+
+class TestWatchService:
+    """Тесты для сервиса отслеживания изменений."""
+
+    def setup_method(self):
+        """Настройка перед каждым тестом."""
+        self.config_port = Mock(spec=ConfigPort)
+        self.file_system_port = Mock(spec=FileSystemPort)
+        self.file_system_port.file_exists.return_value = True
+        self.file_system_port.stat_file.side_effect = lambda path: (
+            StatRecord(True, 0, 0) if self.file_system_port.file_exists(path) else None
+        )
+        self.file_system_port.dir_exists.return_value = True
+        self.file_system_port.iter_files.side_effect = lambda path, **kwargs: iter(
+            [os.path.join(path, "a.txt"), os.path.join(path, "sub", "b.txt")]
+        )
+        self.config_port.get_config_by_id.side_effect = lambda configs, config_id: next(
+            (config for config in configs if config.id == config_id), None
+        )
+        self.config_service = ConfigService(self.config_port, self.file_system_port)
+
+        self.dir_config = Config(id="1", mode="dir", path="/data")
+        self.files_config = Config(id="2", mode="files", path="/data/a.txt, /x.txt")
+        self.other_config = Config(id="3", mode="files", path="/y.txt")
+        self.config_port.read_configs.return_value = [
+            self.dir_config,
+            self.files_config,
+            self.other_config,
+        ]
+
+    def run_watch(self, batches, config_ids=None, max_cycles=None):
+        """Запускает наблюдение и возвращает список перезапусков."""
+        watcher = FakeWatcher(batches)
+        runs = []
+        errors = []
+        WatchService(self.config_service, watcher, debounce=0.01).watch(
+            "/config.txt",
+            config_ids,
+            lambda configs: runs.append([config.id for config in configs]),
+            errors.append,
+            max_cycles=len(batches) if max_cycles is None else max_cycles,
+        )
+        return runs, watcher, errors
+
+    def test_runs_only_affected_configs(self):
+        """Тест перезапуска только конфигураций с изменившимися файлами."""
+        runs, watcher, _ = self.run_watch(
+            [
+                ["/x.txt"],
+                [],
+                ["/data/new.txt"],
+                [],
+                ["/data/sub/b.txt", "/data/a.txt"],
+                [],
+                ["/unrelated.txt"],
+                [],
+            ],
+            max_cycles=4,
+        )
+
+        assert runs == [["1", "2", "3"], ["2"], ["1"], ["1", "2"]]
+        assert watcher.watched[0] == {
+            "/config.txt",
+            "/data",
+            "/data/a.txt",
+            "/data/sub/b.txt",
+            "/x.txt",
+            "/y.txt",
+        }
+
+    def test_debounces_bursts(self):
+        """Тест объединения пачки изменений в один перезапуск."""
+        runs, watcher, _ = self.run_watch(
+            [["/x.txt"], ["/y.txt"], ["/x.txt"], []], max_cycles=1
+        )
+
+        assert runs == [["1", "2", "3"], ["2", "3"]]
+        assert watcher.timeouts == [None, 0.01, 0.01, 0.01]
+
+    def test_recursive_directory(self):
+        """Тест отслеживания вложенных директорий в рекурсивном режиме."""
+        recursive_config = Config(id="1", mode="dir", path="/data", recursive=True)
+        self.config_port.read_configs.return_value = [recursive_config]
+
+        runs, watcher, _ = self.run_watch(
+            [["/data/sub/new.txt"], [], ["/other/sub/c.txt"], []], max_cycles=2
+        )
+
+        assert runs == [["1"], ["1"]]
+        assert "/data/sub" in watcher.watched[0]
+
+    def test_config_file_changes(self):
+        """Тест перезапуска изменённых и добавленных конфигураций."""
+        changed_config = Config(id="2", mode="files", path="/x.txt", action="count")
+        new_config = Config(id="4", mode="files", path="/z.txt")
+        self.config_port.read_configs.side_effect = [
+            [self.dir_config, self.files_config, self.other_config],
+            [self.dir_config, changed_config, self.other_config, new_config],
+            OSError("файл занят"),
+        ]
+
+        runs, watcher, errors = self.run_watch(
+            [["/config.txt", "/y.txt"], [], ["/config.txt"], []], max_cycles=2
+        )
+
+        assert runs == [["1", "2", "3"], ["2", "3", "4"]]
+        assert "/z.txt" in watcher.watched[-1]
+        assert len(errors) == 1
+
+    def test_selected_config_ids(self):
+        """Тест наблюдения только за выбранными конфигурациями."""
+        runs, watcher, _ = self.run_watch(
+            [["/y.txt"], [], ["/x.txt"], []], config_ids=["2", "5"], max_cycles=2
+        )
+
+        assert runs == [["2"], ["2"]]
+        assert "/y.txt" not in watcher.watched[0]
+
+    def test_missing_inputs_are_watched(self):
+        """Тест отслеживания ещё не созданных файлов и директорий."""
+        self.file_system_port.file_exists.side_effect = lambda path: path.startswith(
+            "/config"
+        )
+        self.file_system_port.dir_exists.return_value = False
+
+        runs, watcher, _ = self.run_watch([["/x.txt"], []], max_cycles=1)
+
+        assert runs == [["1", "2", "3"], ["2"]]
+        assert {"/data", "/data/a.txt", "/x.txt"} <= watcher.watched[0]
+
+    def test_patterns_file_changes(self):
+        """Тест перезапуска search при изменении файла шаблонов."""
+        self.other_config.patterns_file = "/patterns.txt"
+
+        runs, watcher, _ = self.run_watch([["/patterns.txt"]])
+
+        assert runs == [["1", "2", "3"], ["3"]]
+        assert "/patterns.txt" in watcher.watched[0]
@@ -0,0 +1,46 @@
+from application.services import ConfigService
+from benchmarks import CorpusSpec, generate_corpus
+from infrastructure.adapters import ConfigFileAdapter, LocalFileSystemAdapter
+
+
+class TestCorpus:
+    """Тесты для генератора синтетического корпуса."""
+
+    def test_generate_corpus_is_deterministic(self, tmp_path):
+        """Тест совпадения корпусов с одинаковыми параметрами."""
+        spec = CorpusSpec(files=2, lines=50, line_length=20, configs=3, seed=7)
+
+        first = generate_corpus(str(tmp_path / "a"), spec)
+        second = generate_corpus(str(tmp_path / "b"), spec)
+        other = generate_corpus(str(tmp_path / "c"), CorpusSpec(files=2, seed=8))
+
+        contents = [
+            [open(path, encoding="utf-8").read() for path in corpus.file_paths]
+            for corpus in (first, second, other)
+        ]
+        assert contents[0] == contents[1]
+        assert contents[0] != contents[2]
+        assert first.total_lines == 100
+        assert first.total_bytes == sum(
+            len(text.encode("utf-8")) for text in contents[0]
+        )
+
+    def test_generated_configs_are_readable(self, tmp_path):
+        """Тест чтения сгенерированных конфигураций самим приложением."""
+        spec = CorpusSpec(files=3, lines=5, configs=4)
+        corpus = generate_corpus(str(tmp_path), spec)
+        file_system = LocalFileSystemAdapter()
+        service = ConfigService(ConfigFileAdapter(file_system), file_system)
+
+        configs = service.read_configs(corpus.config_path)
+
+        assert [config.id for config in configs] == ["1", "2", "3", "4"]
+        assert [config.action for config in configs] == [
+            "string",
+            "count",
+            "replace",
+            "string",
+        ]
+        assert [config.mode for config in configs] == ["dir", "files", "dir", "files"]
+        for config in configs:
+            assert service.get_files_from_config(config) == corpus.file_paths
@@ -0,0 +1,37 @@
+from benchmarks.corpus import CorpusSpec
+from benchmarks.formats import format_table, main, measure_formats
+
+
+class TestFormats:
+    """Тесты для бенчмарка форматов результата."""
+
+    def test_measure_formats(self, tmp_path):
+        """Тест размеров и времени записи для всех форматов."""
+        spec = CorpusSpec(files=2, lines=50, configs=1)
+
+        results = measure_formats(spec, str(tmp_path), repeat=1, actions=["count"])
+
+        rows = {row["format"]: row for row in results["formats"]}
+        assert set(rows) == {"json", "ndjson", "csv", "bin"}
+        assert all(row["bytes"] > 0 and row["seconds"] > 0 for row in rows.values())
+        assert rows["csv"]["bytes"] < rows["json"]["bytes"]
+        assert "1.00" in format_table(results)
+
+    def test_main(self, tmp_path, capsys):
+        """Тест запуска из командной строки."""
+        output = tmp_path / "formats.json"
+
+        code = main(
+            [
+                "--files=1",
+                "--lines=5",
+                "--repeat=1",
+                "--actions=string",
+                "--formats=csv,bin",
+                f"--output={output}",
+            ]
+        )
+
+        assert code == 0
+        assert output.exists()
+        assert "bin" in capsys.readouterr().out
@@ -0,0 +1,33 @@
+from benchmarks.corpus import CorpusSpec
+from benchmarks.latency import main, measure_latency, summarize
+
+
+class TestLatency:
+    """Тесты для бенчмарка задержки запуска."""
+
+    def test_summarize(self):
+        """Тест сводки замеров."""
+        stats = summarize([0.3, 0.1, 0.2])
+
+        assert stats["runs"] == 3
+        assert stats["min"] == 0.1
+        assert stats["median"] == 0.2
+        assert stats["p95"] == 0.3
+
+    def test_measure_latency(self, tmp_path):
+        """Тест замера задержки на маленьком корпусе."""
+        spec = CorpusSpec(files=1, lines=10, configs=1)
+
+        results = measure_latency(spec, 1, str(tmp_path))
+
+        assert set(results["latency"]) == {"cold_cli", "cli_via_server", "client_call"}
+        assert results["latency"]["client_call"]["runs"] == 1
+        assert not (tmp_path / "server.sock").exists()
+
+    def test_main(self, tmp_path, capsys):
+        """Тест запуска из командной строки."""
+        output = tmp_path / "latency.json"
+
+        assert main(["--files=1", "--lines=5", "--runs=1", f"--output={output}"]) == 0
+        assert output.exists()
+        assert "client_call" in capsys.readouterr().out
@@ -0,0 +1,111 @@
+import json
+import pytest
+from benchmarks import (
+    BenchmarkRunner,
+    CorpusSpec,
+    compare_results,
+    format_report,
+    generate_corpus,
+    load_results,
+    measure,
+    save_results,
+)
+from benchmarks.__main__ import main
+
+
+def make_results(**seconds):
+    """Создаёт минимальные результаты бенчмарка с заданным временем этапов."""
+    return {"stages": {name: {"seconds": value} for name, value in seconds.items()}}
+
+
+class TestBenchmarkRunner:
+    """Тесты для запуска бенчмарка этапов обработки."""
+
+    def test_measure(self):
+        """Тест замеров времени и пиковой памяти."""
+        value, timings, peak = measure(lambda: [0] * 10_000, repeat=2)
+
+        assert value == [0] * 10_000
+        assert len(timings) == 2
+        assert peak >= 10_000 * 8
+
+        assert measure(lambda: 1, repeat=1, trace_memory=False)[2] is None
+
+    @pytest.mark.parametrize("reader", ["local", "mmap"])
+    def test_run(self, tmp_path, reader):
+        """Тест показателей всех этапов на маленьком корпусе."""
+        corpus = generate_corpus(str(tmp_path), CorpusSpec(files=2, lines=20))
+
+        results = BenchmarkRunner(corpus, repeat=1, reader=reader).run()
+
+        assert results["corpus"]["total_lines"] == 40
+        assert results["environment"]["reader"] == reader
+        assert list(results["stages"]) == [
+            "config_parse",
+            "listing",
+            "read",
+            "process_string",
+            "serialize_string",
+            "write_string",
+            "process_count",
+            "serialize_count",
+            "write_count",
+            "process_replace",
+            "serialize_replace",
+            "write_replace",
+        ]
+        read = results["stages"]["read"]
+        assert read["items"] == 40
+        assert read["bytes"] == corpus.total_bytes
+        assert read["peak_memory_bytes"] > 0
+        written = tmp_path / "results" / "result_count.json"
+        assert json.loads(written.read_text(encoding="utf-8"))["configurationID"] == (
+            "count"
+        )
+        assert results["stages"]["write_count"]["bytes"] == len(written.read_bytes())
+        assert "process_count" in format_report(results)
+
+    def test_unknown_reader(self, tmp_path):
+        """Тест ошибки при неизвестном способе чтения файлов."""
+        corpus = generate_corpus(str(tmp_path), CorpusSpec(files=1, lines=1))
+
+        with pytest.raises(ValueError):
+            BenchmarkRunner(corpus, reader="unknown")
+
+    def test_compare_results(self):
+        """Тест поиска замедлившихся этапов относительно базового прогона."""
+        baseline = make_results(read=1.0, process=0.0001, write=1.0, old=1.0)
+        current = make_results(read=1.5, process=0.0005, write=1.05, new=1.0)
+
+        rows = {row["stage"]: row for row in compare_results(current, baseline)}
+
+        assert set(rows) == {"read", "process", "write"}
+        assert rows["read"]["regressed"] is True
+        assert rows["read"]["ratio"] == pytest.approx(1.5)
+        assert rows["process"]["regressed"] is False
+        assert rows["write"]["regressed"] is False
+
+        zero = compare_results(make_results(read=1.0), make_results(read=0.0))
+        assert zero[0]["ratio"] is None and zero[0]["regressed"] is False
+
+    def test_main_with_baseline(self, tmp_path, capsys):
+        """Тест сохранения результатов и сравнения с базовым прогоном из CLI."""
+        output = tmp_path / "bench.json"
+        args = ["--files", "1", "--lines", "10", "--repeat", "1", "--no-memory"]
+
+        assert main(args + ["--actions", "count", "--output", str(output)]) == 0
+        results = load_results(str(output))
+        assert "process_count" in results["stages"]
+        assert "process_replace" not in results["stages"]
+
+        slow = dict(results, stages={})
+        for name, stage in results["stages"].items():
+            slow["stages"][name] = dict(stage, seconds=stage["seconds"] / 1000)
+        save_results(slow, str(output))
+
+        assert main(args + ["--baseline", str(output), "--min-delta", "0"]) == 1
+        report = capsys.readouterr().out
+        assert "ЗАМЕДЛЕНИЕ" in report
+
+        assert main(args + ["--lines", "5", "--baseline", str(output)]) in (0, 1)
+        assert "параметры корпуса" in capsys.readouterr().out
@@ -0,0 +1,58 @@
+import pytest
+from benchmarks.corpus import CorpusSpec
+from benchmarks.search import format_table, main, make_patterns, measure_search
+
+
+class TestSearch:
+    """Тесты для бенчмарка поиска набора шаблонов."""
+
+    def test_make_patterns(self):
+        """Тест создания заданного числа разных шаблонов."""
+        patterns = make_patterns(300)
+
+        assert len(set(patterns)) == 300
+        assert make_patterns(300) == patterns
+
+    def test_measure_search(self, tmp_path):
+        """Тест совпадения числа вхождений у всех способов поиска."""
+        spec = CorpusSpec(files=2, lines=30, configs=1)
+
+        results = measure_search(spec, str(tmp_path), 1, [2, 60])
+
+        rows = results["search"]
+        assert [row["method"] for row in rows[:4]] == [
+            "naive",
+            "regex",
+            "aho_corasick",
+            "action",
+        ]
+        for count in (2, 60):
+            matches = {row["matches"] for row in rows if row["patterns"] == count}
+            assert len(matches) == 1 and matches.pop() > 0
+        assert results["corpus"]["total_chars"] > 0
+        assert "1.00" in format_table(results)
+
+    def test_main(self, tmp_path, capsys):
+        """Тест запуска из командной строки."""
+        output = tmp_path / "search.json"
+
+        code = main(
+            [
+                "--files=1",
+                "--lines=5",
+                "--repeat=1",
+                "--patterns=3",
+                f"--output={output}",
+            ]
+        )
+
+        assert code == 0
+        assert output.exists()
+        assert "aho_corasick" in capsys.readouterr().out
+
+    def test_main_invalid_patterns(self, capsys):
+        """Тест ошибки в списке чисел шаблонов."""
+        with pytest.raises(SystemExit):
+            main(["--patterns=1,x"])
+
+        assert "неверный список" in capsys.readouterr().err
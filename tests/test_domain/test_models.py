@@ -1,4 +1,20 @@
-from domain import Config, FileContent, ProcessingResult
+import json
+import pickle
+import sys
+import tracemalloc
+from array import array
+import pytest
+from domain import (
+    ColumnarResult,
+    CompactLines,
+    Config,
+    FileContent,
+    FileMatches,
+    FileStats,
+    ProcessingResult,
+    SearchResult,
+    StatsResult,
+)
 
 
 class TestConfig:
@@ -18,6 +34,7 @@ class TestConfig:
         config = Config(id="1", mode="dir", path="./test")
 
         assert config.action == "string"
+        assert config.workers == 1
 
 
 class TestFileContent:
@@ -30,6 +47,92 @@ class TestFileContent:
         assert file_content.file_path == "test.txt"
         assert file_content.lines == ["line1", "line2"]
 
+    def test_file_content_has_slots(self):
+        """Тест отсутствия словаря атрибутов у FileContent."""
+        file_content = FileContent(file_path="test.txt", lines=[])
+
+        assert not hasattr(file_content, "__dict__")
+
+
+class TestCompactLines:
+    """Тесты для компактного представления строк файла."""
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("", []),
+            ("\n", [""]),
+            ("a\nb\n", ["a", "b"]),
+            ("a\nb", ["a", "b"]),
+            ("\n\nx\n", ["", "", "x"]),
+            ("Привет\t мир\u2028!\n", ["Привет\t мир\u2028!"]),
+        ],
+    )
+    def test_from_text_matches_readlines(self, text, expected):
+        """Тест совпадения строк с разбиением по readlines."""
+        lines = CompactLines.from_text(text)
+
+        assert len(lines) == len(expected)
+        assert list(lines) == expected
+        assert [lines[i] for i in range(len(lines))] == expected
+        assert lines == expected
+        assert lines == tuple(expected)
+
+    @pytest.mark.parametrize(
+        "text", ["a", "a\nb", "\n\nx", "x\n\n", "длинная строка\n" * 100]
+    )
+    def test_from_text_keeps_text(self, text):
+        """Тест построения индекса без разбиения и повторной склейки текста."""
+        lines = CompactLines.from_text(text)
+        body = text[:-1] if text.endswith("\n") else text
+        expected = CompactLines.from_lines(body.split("\n"))
+
+        assert lines.offsets == expected.offsets
+        assert lines.text == expected.text
+        if not text.endswith("\n"):
+            assert lines.text is text
+
+    def test_indexing_and_slices(self):
+        """Тест отрицательных индексов и срезов."""
+        lines = CompactLines.from_lines(["a", "bb", "", "ccc"])
+
+        assert lines[-1] == "ccc"
+        assert lines[1:3] == ["bb", ""]
+        assert isinstance(lines[1:3], CompactLines)
+        assert lines[1:3][1] == ""
+        assert lines[::2] == ["a", ""]
+        assert lines[3:1] == []
+        with pytest.raises(IndexError):
+            lines[4]
+
+    def test_tolist(self):
+        """Тест списка строк, в том числе со строкой, содержащей \\n."""
+        lines = CompactLines.from_lines(["a", "", "б"])
+
+        assert lines.tolist() == ["a", "", "б"]
+        assert lines[1:2].tolist() == [""]
+        assert CompactLines.from_lines([]).tolist() == []
+        assert CompactLines.from_lines(["a\nb", "c"]).tolist() == ["a\nb", "c"]
+
+    def test_equality_and_pickle(self):
+        """Тест сравнения и сериализации."""
+        lines = CompactLines.from_lines(["a", "b"])
+
+        assert lines == CompactLines.from_text("a\nb\n")
+        assert lines != CompactLines.from_lines(["a"])
+        assert (lines == "a\nb") is False
+        assert pickle.loads(pickle.dumps(lines)) == lines
+        assert "CompactLines" in repr(lines)
+
+    def test_real_size_is_compact(self):
+        """Тест того, что компактное хранение меньше списка строк."""
+        source = [f"line {i}" for i in range(1000)]
+        lines = CompactLines.from_lines(source)
+        list_size = sys.getsizeof(source) + sum(map(sys.getsizeof, source))
+
+        assert sys.getsizeof(lines) >= sys.getsizeof(lines._text)
+        assert sys.getsizeof(lines) * 3 < list_size
+
 
 class TestProcessingResult:
     """Тесты для модели ProcessingResult."""
@@ -50,3 +153,187 @@ class TestProcessingResult:
         assert result.config_id == "1"
         assert result.config_data == config_data
         assert result.out == out_data
+
+
+class TestColumnarResult:
+    """Тесты для столбцового представления результата."""
+
+    def test_count_columns_are_typed_arrays(self):
+        """Тест хранения столбцов count в массивах array('q')."""
+        result = ColumnarResult(action="count", columns=[[3, 2], array("q", [4])])
+
+        assert all(isinstance(column, array) for column in result.columns)
+        assert all(column.typecode == "q" for column in result.columns)
+        assert result.line_counts == [2, 1]
+        assert result.max_lines == 2
+
+    def test_out_view_keeps_existing_shape(self):
+        """Тест совпадения представления out с прежним словарём."""
+        result = ColumnarResult(action="count", columns=[[3, 2], [4]])
+
+        out = result.out
+
+        assert out == {"1": {"1": 3, "2": 4}, "2": {"1": 2, "2": 0}}
+        assert list(out) == ["1", "2"]
+        assert len(out) == 2
+        assert out["2"]["2"] == 0
+        assert "1" in out and "3" not in out and "01" not in out and 1 not in out
+        assert list(out.items()) == list(result.rows())
+        assert json.loads(json.dumps(dict(out))) == out
+        assert "ColumnarOut" in repr(out)
+        with pytest.raises(KeyError):
+            out["0"]
+
+    def test_sparse_out_skips_padding(self):
+        """Тест разреженного представления без ячеек дополнения."""
+        result = ColumnarResult(action="count", columns=[[3], [], [4, 5, 6], [7, 8]])
+
+        out = result.sparse_out
+
+        assert out == {
+            "1": {"1": 3, "3": 4, "4": 7},
+            "2": {"3": 5, "4": 8},
+            "3": {"3": 6},
+        }
+        assert list(out.items()) == list(result.sparse_rows())
+        assert out["2"] == result.sparse_row(2) == {"3": 5, "4": 8}
+        assert len(out) == 3
+        assert "'3': 6" in repr(out)
+        assert ColumnarResult(action="string", columns=[[], []]).sparse_out == {}
+
+    def test_string_padding_and_empty(self):
+        """Тест дополнения строковых столбцов и пустого результата."""
+        result = ColumnarResult(action="string", columns=[["a"], ["b", "c"]])
+
+        assert result.out == {"1": {"1": "a", "2": "b"}, "2": {"1": "", "2": "c"}}
+        assert ColumnarResult(action="string", columns=[]).out == {}
+
+    def test_count_memory_is_smaller_than_dict_of_dicts(self):
+        """Тест многократной экономии памяти относительно словаря словарей."""
+        columns = [list(range(2000)) for _ in range(20)]
+
+        tracemalloc.start()
+        result = ColumnarResult(action="count", columns=columns)
+        columnar_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        out = dict(result.rows())
+        dict_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        assert len(out) == 2000
+        assert dict_size > 5 * columnar_size
+
+
+class TestFileStats:
+    """Тесты для статистики строк файла."""
+
+    def test_update_in_batches(self):
+        """Тест совпадения статистики, собранной порциями и за раз."""
+        lengths = [0, 5, 1, 3, 12, 5, 0, 8]
+        whole = FileStats(file_num=2, top_n=3)
+        whole.update(lengths, 11)
+        batched = FileStats(file_num=2, top_n=3)
+        for start in range(0, len(lengths), 3):
+            end = start + 3
+            batched.update(lengths[start:end], 0)
+        batched.words = 11
+
+        assert batched == whole
+        assert whole.to_dict() == {
+            "lines": 8,
+            "words": 11,
+            "chars": 34,
+            "emptyLines": 2,
+            "maxLength": 12,
+            "meanLength": 4.25,
+            "histogram": {"0": 2, "1": 1, "2-3": 1, "4-7": 2, "8-15": 2},
+            "longest": [
+                {"line": 5, "length": 12},
+                {"line": 8, "length": 8},
+                {"line": 2, "length": 5},
+            ],
+        }
+
+    def test_empty(self):
+        """Тест статистики пустого файла."""
+        assert FileStats().to_dict() == {
+            "lines": 0,
+            "words": 0,
+            "chars": 0,
+            "emptyLines": 0,
+            "maxLength": 0,
+            "meanLength": 0,
+            "histogram": {},
+            "longest": [],
+        }
+
+    def test_stats_result_corpus(self):
+        """Тест сводки по всем файлам с номерами файлов у самых длинных строк."""
+        first = FileStats(file_num=1, top_n=2)
+        first.update([4, 9], 3)
+        second = FileStats(file_num=2, top_n=2)
+        second.update([9, 1, 2], 4)
+
+        out = StatsResult([first, second]).to_dict()
+
+        assert list(out["files"]) == ["1", "2"]
+        assert out["files"]["2"]["lines"] == 3
+        corpus = out["corpus"]
+        assert (corpus["lines"], corpus["words"], corpus["chars"]) == (5, 7, 25)
+        assert corpus["histogram"] == {"1": 1, "2-3": 1, "4-7": 1, "8-15": 2}
+        assert corpus["longest"] == [
+            {"file": 1, "line": 2, "length": 9},
+            {"file": 2, "line": 1, "length": 9},
+        ]
+        assert StatsResult([]).to_dict() == {
+            "files": {},
+            "corpus": FileStats().to_dict(),
+        }
+
+
+class TestSearchResult:
+    """Тесты для вхождений шаблонов поиска."""
+
+    def test_file_matches(self):
+        """Тест учёта вхождений по строкам и пересчёта итогов."""
+        matches = FileMatches()
+        matches.add(3, "ab")
+        matches.add(3, "ab")
+        matches.add(7, "c")
+
+        assert matches.to_dict() == {
+            "matches": 3,
+            "matchedLines": 2,
+            "patterns": {"ab": 2, "c": 1},
+            "lines": {"3": {"ab": 2}, "7": {"c": 1}},
+        }
+
+        rebuilt = FileMatches(lines=matches.lines)
+        rebuilt.count_patterns()
+        assert rebuilt == matches
+
+    def test_search_result_corpus(self):
+        """Тест сводки по файлам с нулями для шаблонов без вхождений."""
+        first = FileMatches()
+        first.add(1, "ab")
+        second = FileMatches()
+        second.add(2, "ab")
+        second.add(2, "c")
+
+        out = SearchResult(["ab", "c", "zz"], [first, FileMatches(), second]).to_dict()
+
+        assert out["patterns"] == ["ab", "c", "zz"]
+        assert list(out["files"]) == ["1", "2", "3"]
+        assert out["files"]["2"] == {
+            "matches": 0,
+            "matchedLines": 0,
+            "patterns": {},
+            "lines": {},
+        }
+        assert out["corpus"] == {
+            "matches": 3,
+            "matchedFiles": 2,
+            "patterns": {"ab": 2, "c": 1, "zz": 0},
+        }
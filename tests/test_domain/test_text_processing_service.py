@@ -1,4 +1,35 @@
-from domain import TextProcessingService
+from array import array
+from unittest.mock import patch
+import pytest
+import random
+from domain import AhoCorasickMatcher, CompactLines, RegexMatcher
+from domain import TextProcessingService, compile_patterns
+from domain import services
+
+
+def naive_matches(text, patterns):
+    """Все вхождения шаблонов поиском каждого шаблона по отдельности."""
+    matches = []
+    for pattern in patterns:
+        start = text.find(pattern)
+        while start != -1:
+            matches.append((start, pattern))
+            start = text.find(pattern, start + 1)
+    return sorted(matches)
+
+
+def reference_replace_letters(text, file_number):
+    """Исходная посимвольная реализация замены букв."""
+    result = ""
+    for char in text:
+        order = ord(char)
+        if 65 <= order <= 90:
+            result += str(order - 64 + file_number)
+        elif 97 <= order <= 122:
+            result += str(order - 96 + file_number)
+        else:
+            result += char
+    return result
 
 
 class TestTextProcessingService:
@@ -18,6 +49,37 @@ class TestTextProcessingService:
 
         assert service.replace_letters("Hello, World!", 1) == "96131316, 241619135!"
 
+    def test_replace_letters_matches_reference(self):
+        """Тест совпадения табличной замены с посимвольной реализацией."""
+        service = TextProcessingService()
+        text = "".join(chr(code) for code in range(0, 0x500)) + "\U0001f600"
+
+        for file_number in (0, 1, 2, 17, 1000, -5):
+            assert service.replace_letters(text, file_number) == (
+                reference_replace_letters(text, file_number)
+            )
+
+    def test_replace_table_is_cached(self):
+        """Тест кэширования таблицы замены по номеру файла."""
+        service = TextProcessingService()
+
+        table = service.get_replace_table(3)
+
+        assert service.get_replace_table(3) is table
+        assert table[ord("A")] == "4"
+        assert table[ord("z")] == "29"
+        assert len(table) == 52
+
+    def test_replace_lines(self):
+        """Тест пакетной замены букв в списке строк."""
+        service = TextProcessingService()
+        lines = ["ABC", "", "A-1 Б", "Hello, World!"]
+
+        assert service.replace_lines(lines, 1) == [
+            service.replace_letters(line, 1) for line in lines
+        ]
+        assert service.replace_lines([], 1) == []
+
     def test_count_words(self):
         """Тест подсчета слов в строке."""
         service = TextProcessingService()
@@ -29,3 +91,99 @@ class TestTextProcessingService:
         assert service.count_words("   ") == 0
 
         assert service.count_words("hello, world! How are you?") == 5
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_count_words_bulk_matches_split(self, use_numpy):
+        """Тест совпадения пакетного подсчёта слов с str.split()."""
+        if use_numpy:
+            pytest.importorskip("numpy")
+            numpy_module = services.load_numpy()
+        else:
+            numpy_module = None
+        whitespace = [chr(code) for code in range(0x3001) if chr(code).isspace()]
+        lines = [
+            "",
+            " ",
+            "one",
+            "one two  three",
+            "  leading and trailing  ",
+            "tabs\there\vand\x0cform\rfeed",
+            "юникод\u00a0пробелы\u2003и\u3000идеографический",
+            "\x1cunit\x1dseparators\x1e\x1f",
+            "non\u200bbreaking\ufeffzero width",
+            "emoji 😀 и суррогат \ud800 тоже",
+            "".join(whitespace),
+            "x".join(whitespace),
+        ]
+
+        with patch.object(services, "np", numpy_module):
+            for source in (
+                lines,
+                CompactLines.from_lines(lines),
+                CompactLines.from_lines(lines[:6] + lines[7:8]),
+                CompactLines.from_lines([]),
+                lines[:1],
+                [],
+            ):
+                counts = TextProcessingService.count_words_bulk(source)
+
+                assert isinstance(counts, array)
+                assert counts.typecode == "q"
+                assert list(counts) == [len(line.split()) for line in source]
+
+    def test_whitespace_table_covers_all_unicode(self):
+        """Тест отсутствия пробельных символов выше U+3000."""
+        assert all(not chr(code).isspace() for code in range(0x3001, 0x110000, 1))
+
+
+class TestMatchers:
+    """Тесты для поиска набора шаблонов."""
+
+    @pytest.mark.parametrize("matcher_class", [RegexMatcher, AhoCorasickMatcher])
+    def test_overlapping_and_prefix_patterns(self, matcher_class):
+        """Тест поиска перекрывающихся шаблонов и шаблонов-префиксов."""
+        patterns = ["he", "she", "his", "hers", "h", "сон"]
+        text = "ushers\nhis\nсонсон"
+
+        matches = list(matcher_class(patterns).finditer(text))
+
+        assert sorted(matches) == naive_matches(text, patterns)
+
+    @pytest.mark.parametrize("matcher_class", [RegexMatcher, AhoCorasickMatcher])
+    def test_matches_naive_search(self, matcher_class):
+        """Тест совпадения с поиском каждого шаблона по отдельности."""
+        rng = random.Random(7)
+        for _ in range(200):
+            patterns = list(
+                {
+                    "".join(rng.choice("abc") for _ in range(rng.randint(1, 4)))
+                    for _ in range(rng.randint(1, 6))
+                }
+            )
+            text = "".join(rng.choice("abc\n") for _ in range(rng.randint(0, 40)))
+
+            matches = list(matcher_class(patterns).finditer(text))
+
+            assert sorted(matches) == naive_matches(text, patterns)
+
+    def test_match_order(self):
+        """Тест порядка вхождений: выражение - по началу, автомат - по концу."""
+        patterns = ["abcd", "bc"]
+
+        assert list(RegexMatcher(patterns).finditer("abcd")) == [
+            (0, "abcd"),
+            (1, "bc"),
+        ]
+        assert list(AhoCorasickMatcher(patterns).finditer("abcd")) == [
+            (1, "bc"),
+            (0, "abcd"),
+        ]
+
+    def test_compile_patterns(self):
+        """Тест выбора матчера по числу шаблонов и кэширования компиляции."""
+        small = tuple(f"p{index}" for index in range(services.REGEX_MAX_PATTERNS))
+        large = small + ("extra",)
+
+        assert isinstance(compile_patterns(small), RegexMatcher)
+        assert isinstance(compile_patterns(large), AhoCorasickMatcher)
+        assert compile_patterns(large) is compile_patterns(large)
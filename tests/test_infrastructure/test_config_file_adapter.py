@@ -1,6 +1,8 @@
-from unittest.mock import Mock
+import os
+import pytest
+from unittest.mock import Mock, patch
 from application.ports import FileSystemPort
-from infrastructure.adapters import ConfigFileAdapter
+from infrastructure.adapters import ConfigFileAdapter, LocalFileSystemAdapter
 from domain import Config
 
 
@@ -68,6 +70,86 @@ class TestConfigFileAdapter:
 
         assert len(configs) == 0
 
+    def test_read_configs_workers(self):
+        """Тест чтения числа рабочих процессов из конфигурации."""
+        config_content = [
+            "#1",
+            "#mode: dir",
+            "#path: ./test_files",
+            "#workers: 8",
+            "",
+            "#2",
+            "#mode: dir",
+            "#path: ./test_files",
+        ]
+
+        self.file_system_port.read_file.return_value = config_content
+
+        configs = self.adapter.read_configs("config.txt")
+
+        assert [config.workers for config in configs] == [8, 1]
+
+    @pytest.mark.parametrize("workers", ["many", "-2", "0", "1.5", "²"])
+    def test_read_configs_invalid_workers(self, workers):
+        """Тест ошибки при неверном числе рабочих процессов."""
+        self.file_system_port.read_file.return_value = [
+            "#7",
+            "#mode: dir",
+            "#path: ./test_files",
+            f"#workers: {workers}",
+        ]
+
+        with pytest.raises(ValueError, match="конфигурации 7"):
+            self.adapter.read_configs("config.txt")
+
+    def test_read_configs_discovery_options(self):
+        """Тест чтения параметров обхода директории из конфигурации."""
+        config_content = [
+            "#1",
+            "#mode: dir",
+            "#path: ./test_files",
+            "#recursive: Yes",
+            "#include: *.txt, *.md",
+            "#exclude: tmp",
+            "",
+            "#2",
+            "#mode: dir",
+            "#path: ./test_files",
+            "#recursive: no",
+        ]
+
+        self.file_system_port.read_file.return_value = config_content
+
+        first, second = self.adapter.read_configs("config.txt")
+
+        assert (first.recursive, first.include, first.exclude) == (
+            True,
+            "*.txt, *.md",
+            "tmp",
+        )
+        assert (second.recursive, second.include, second.exclude) == (False, "", "")
+
+    def test_read_configs_search_patterns(self):
+        """Тест чтения шаблонов действия search из конфигурации."""
+        config_content = [
+            "#1",
+            "#mode: dir",
+            "#path: ./test_files",
+            "#action: search",
+            "#patterns: error, warn",
+            "#patterns_file: patterns.txt",
+        ]
+
+        self.file_system_port.read_file.return_value = config_content
+
+        (config,) = self.adapter.read_configs("config.txt")
+
+        assert (config.action, config.patterns, config.patterns_file) == (
+            "search",
+            "error, warn",
+            "patterns.txt",
+        )
+
     def test_get_config_by_id_found(self):
         """Тест поиска конфигурации по ID (успешный случай)."""
         configs = [
@@ -97,3 +179,91 @@ class TestConfigFileAdapter:
         config = self.adapter.get_config_by_id(configs, "3")
 
         assert config is None
+
+    def test_read_configs_parser_quirks(self):
+        """Тест особых случаев разбора, совпадающих с прежним парсером."""
+        config_content = [
+            "  #7  ",
+            "#mode: dir",
+            "#path: ./leading",
+            "#8 ",
+            "#mode: files",
+            "#9",
+            "mode: files",
+            "path: a.txt:b.txt",
+            "# comment",
+            "#ACTION : Count",
+            "id: 10",
+        ]
+
+        self.file_system_port.read_file.return_value = config_content
+
+        configs = self.adapter.read_configs("config.txt")
+
+        assert configs == [
+            Config(id="7", mode="files", path="./leading"),
+            Config(id="10", mode="files", path="a.txt:b.txt", action="Count"),
+        ]
+
+    def test_get_config_by_id_uses_index(self):
+        """Тест поиска по индексу для списка, возвращённого read_configs."""
+        self.file_system_port.read_file.return_value = [
+            "#1",
+            "#mode: dir",
+            "#path: ./first",
+            "#1",
+            "#mode: dir",
+            "#path: ./duplicate",
+            "#2",
+            "#mode: dir",
+            "#path: ./second",
+        ]
+        configs = self.adapter.read_configs("config.txt")
+
+        with patch.object(Config, "__eq__", side_effect=AssertionError):
+            assert self.adapter.get_config_by_id(configs, "1").path == "./first"
+            assert self.adapter.get_config_by_id(configs, "2").path == "./second"
+            assert self.adapter.get_config_by_id(configs, "3") is None
+
+        configs.pop()
+        assert self.adapter.get_config_by_id(configs, "2") is None
+
+    def test_read_configs_sidecar_cache(self, tmp_path):
+        """Тест повторного использования разобранных конфигураций из кэша."""
+        config_path = tmp_path / "config.txt"
+        config_path.write_text(
+            "#1\n#mode: dir\n#path: ./test\n#workers: 2\n", encoding="utf-8"
+        )
+        file_system = LocalFileSystemAdapter()
+        cache_dir = str(tmp_path / "cache")
+        adapter = ConfigFileAdapter(file_system, cache_dir=cache_dir)
+
+        first = adapter.read_configs(str(config_path))
+
+        with patch.object(file_system, "read_file") as mock_read:
+            second = ConfigFileAdapter(file_system, cache_dir=cache_dir).read_configs(
+                str(config_path)
+            )
+            mock_read.assert_not_called()
+        assert second == first == [Config(id="1", mode="dir", path="./test", workers=2)]
+        assert len(os.listdir(cache_dir)) == 1
+
+        config_path.write_text(
+            "#1\n#mode: files\n#path: ./changed.txt\n", encoding="utf-8"
+        )
+        third = adapter.read_configs(str(config_path))
+
+        assert third == [Config(id="1", mode="files", path="./changed.txt")]
+
+    def test_read_configs_sidecar_cache_unavailable(self, tmp_path):
+        """Тест работы без кэша при недоступном каталоге кэша."""
+        blocker = tmp_path / "blocker"
+        blocker.write_text("", encoding="utf-8")
+        config_path = tmp_path / "config.txt"
+        config_path.write_text("#1\n#mode: dir\n#path: ./test\n", encoding="utf-8")
+        adapter = ConfigFileAdapter(
+            LocalFileSystemAdapter(), cache_dir=str(blocker / "cache")
+        )
+
+        assert adapter.read_configs(str(config_path))[0].path == "./test"
+        assert adapter.read_configs(str(config_path))[0].path == "./test"
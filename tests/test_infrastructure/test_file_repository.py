@@ -1,5 +1,9 @@
+import os
+import sys
 from unittest.mock import Mock
+from domain import CompactLines
 from application.ports import FileSystemPort
+from infrastructure.adapters import LocalFileSystemAdapter, MmapLineView
 from infrastructure.repositories import FileRepository
 
 
@@ -9,6 +13,7 @@ class TestFileRepository:
     def setup_method(self):
         """Настройка перед каждым тестом."""
         self.file_system = Mock(spec=FileSystemPort)
+        self.file_system.get_absolute_path.side_effect = lambda path: path
         self.repository = FileRepository(self.file_system)
 
     def test_get_file_content_without_cache(self):
@@ -72,3 +77,108 @@ class TestFileRepository:
         self.repository.clear_cache()
 
         assert not self.repository._cache
+
+    def test_get_file_content_changed_on_disk(self):
+        """Тест перечитывания файла, изменившегося на диске."""
+        file_path = "test.txt"
+        self.file_system.get_file_signature.side_effect = [(1, 10), (1, 10), (2, 12)]
+        self.file_system.read_file.side_effect = [["old"], ["new"]]
+
+        first = self.repository.get_file_content(file_path)
+        second = self.repository.get_file_content(file_path)
+        third = self.repository.get_file_content(file_path)
+
+        assert first.lines == ["old"]
+        assert second is first
+        assert third.lines == ["new"]
+        assert self.file_system.read_file.call_count == 2
+        assert self.repository.cache_stats()["hits"] == 1
+        assert self.repository.cache_stats()["misses"] == 2
+
+    def test_lru_eviction_by_byte_budget(self):
+        """Тест вытеснения давно не использованных файлов по бюджету памяти."""
+        self.file_system.get_file_signature.return_value = (1, 1)
+        self.file_system.read_file.side_effect = lambda path: [path * 100]
+        entry_size = FileRepository._estimate_size(["a.txt" * 100])
+        repository = FileRepository(self.file_system, max_cache_bytes=entry_size * 2)
+
+        repository.get_file_content("a.txt")
+        repository.get_file_content("b.txt")
+        repository.get_file_content("a.txt")
+        repository.get_file_content("c.txt")
+
+        assert list(repository._cache) == ["a.txt", "c.txt"]
+        stats = repository.cache_stats()
+        assert stats["evictions"] == 1
+        assert stats["entries"] == 2
+        assert stats["bytes"] <= repository.max_cache_bytes
+
+    def test_lru_eviction_by_entry_limit(self):
+        """Тест вытеснения давно не использованных файлов по числу записей."""
+        self.file_system.get_file_signature.return_value = (1, 1)
+        self.file_system.read_file.side_effect = lambda path: [path]
+        repository = FileRepository(self.file_system, max_cache_entries=2)
+
+        for path in ("a.txt", "b.txt", "a.txt", "c.txt"):
+            repository.get_file_content(path)
+
+        assert list(repository._cache) == ["a.txt", "c.txt"]
+        assert repository.cache_stats()["evictions"] == 1
+
+    def test_file_larger_than_budget_not_cached(self):
+        """Тест отказа от кэширования файла больше бюджета."""
+        self.file_system.get_file_signature.return_value = (1, 1)
+        self.file_system.read_file.return_value = ["x" * 1000]
+        repository = FileRepository(self.file_system, max_cache_bytes=100)
+
+        result = repository.get_file_content("big.txt")
+
+        assert result.lines == ["x" * 1000]
+        assert not repository._cache
+        assert repository.cache_stats()["bytes"] == 0
+
+    def test_missing_file_not_cached(self):
+        """Тест отказа от кэширования отсутствующего файла."""
+        self.file_system.get_file_signature.return_value = None
+        self.file_system.read_file.return_value = []
+
+        self.repository.get_file_content("missing.txt")
+
+        assert not self.repository._cache
+
+    def test_use_cache_false_refreshes_entry(self):
+        """Тест обновления записи кэша при чтении без кэша."""
+        self.file_system.get_file_signature.return_value = (1, 1)
+        self.file_system.read_file.side_effect = [["old"], ["new"]]
+
+        self.repository.get_file_content("test.txt")
+        self.repository.get_file_content("test.txt", use_cache=False)
+        result = self.repository.get_file_content("test.txt")
+
+        assert result.lines == ["new"]
+        assert self.repository.cache_stats()["entries"] == 1
+        assert self.repository.cache_stats()["hits"] == 1
+
+    def test_cache_accounts_compact_lines_size(self):
+        """Тест учёта реального размера компактного представления строк."""
+        lines = CompactLines.from_lines([f"line {i}" for i in range(100)])
+        self.file_system.get_file_signature.return_value = (1, 1)
+        self.file_system.read_file.return_value = lines
+
+        self.repository.get_file_content("test.txt")
+
+        assert self.repository.cache_stats()["bytes"] == sys.getsizeof(lines)
+        assert sys.getsizeof(lines) > len(lines._text)
+
+    def test_cache_accounts_line_index_size(self, tmp_path):
+        """Тест учёта MmapLineView по размеру индекса строк, а не файла."""
+        file_path = tmp_path / "test.txt"
+        file_path.write_text("line\n" * 1000, encoding="utf-8")
+        view = MmapLineView(str(file_path)).load()
+        self.file_system.get_file_signature.return_value = (1, 5000)
+        self.file_system.read_file.return_value = view
+
+        self.repository.get_file_content(str(file_path))
+
+        assert self.repository.cache_stats()["bytes"] == sys.getsizeof(view)
+        assert 1001 * 8 <= sys.getsizeof(view) < 1001 * 8 + 200
@@ -1,6 +1,8 @@
 import os
+import pytest
 from unittest.mock import patch, mock_open
-from infrastructure.adapters import LocalFileSystemAdapter
+from domain import CompactLines, StatRecord
+from infrastructure.adapters import LocalFileSystemAdapter, StatCache
 
 
 class TestLocalFileSystemAdapter:
@@ -30,20 +32,77 @@ class TestLocalFileSystemAdapter:
         with patch("os.path.isdir", return_value=False):
             assert self.adapter.dir_exists("non_existing_dir") is False
 
-    def test_list_files(self):
+    def make_tree(self, tmp_path):
+        """Создаёт дерево каталогов с файлами для перечисления."""
+        for relative_path in (
+            "b.txt",
+            "a.txt",
+            "notes.md",
+            "sub/c.txt",
+            "sub/deep/d.txt",
+            "tmp/e.txt",
+        ):
+            file_path = tmp_path / relative_path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text("x", encoding="utf-8")
+        return str(tmp_path)
+
+    def test_list_files(self, tmp_path):
         """Тест получения списка файлов в директории."""
-        dir_content = ["file1.txt", "file2.txt", "subdir"]
-        expected_files = [
-            os.path.join("test_dir", "file1.txt"),
-            os.path.join("test_dir", "file2.txt"),
-        ]
+        dir_path = self.make_tree(tmp_path)
 
-        with patch("os.listdir", return_value=dir_content), patch(
-            "os.path.isfile", side_effect=lambda path: not path.endswith("subdir")
-        ):
-            files = self.adapter.list_files("test_dir")
+        files = self.adapter.list_files(dir_path)
+
+        assert files == [
+            os.path.join(dir_path, "a.txt"),
+            os.path.join(dir_path, "b.txt"),
+            os.path.join(dir_path, "notes.md"),
+        ]
 
-            assert files == expected_files
+    def test_iter_files_does_not_stat_entries(self, tmp_path):
+        """Тест перечисления файлов без отдельного stat для каждой записи."""
+        dir_path = self.make_tree(tmp_path)
+
+        with patch("os.path.isfile") as mock_isfile, patch("os.stat") as mock_stat:
+            files = self.adapter.iter_files(dir_path)
+            assert not isinstance(files, list)
+            assert len(list(files)) == 3
+
+        mock_isfile.assert_not_called()
+        mock_stat.assert_not_called()
+
+    def test_iter_files_recursive_with_patterns(self, tmp_path):
+        """Тест рекурсивного обхода с шаблонами include и exclude."""
+        dir_path = self.make_tree(tmp_path)
+
+        def relative(**kwargs):
+            files = self.adapter.iter_files(dir_path, **kwargs)
+            return sorted(os.path.relpath(path, dir_path) for path in files)
+
+        assert relative(recursive=True) == [
+            "a.txt",
+            "b.txt",
+            "notes.md",
+            os.path.join("sub", "c.txt"),
+            os.path.join("sub", "deep", "d.txt"),
+            os.path.join("tmp", "e.txt"),
+        ]
+        assert relative(recursive=True, include=["*.md", "sub/deep/*"]) == [
+            "notes.md",
+            os.path.join("sub", "deep", "d.txt"),
+        ]
+        assert relative(recursive=True, include=["*.txt"], exclude=["tmp", "b.*"]) == [
+            "a.txt",
+            os.path.join("sub", "c.txt"),
+            os.path.join("sub", "deep", "d.txt"),
+        ]
+        assert relative(recursive=True, exclude=["sub/deep"]) == [
+            "a.txt",
+            "b.txt",
+            "notes.md",
+            os.path.join("sub", "c.txt"),
+            os.path.join("tmp", "e.txt"),
+        ]
 
     def test_read_file(self):
         """Тест чтения содержимого файла."""
@@ -54,6 +113,25 @@ class TestLocalFileSystemAdapter:
             lines = self.adapter.read_file("test.txt")
 
             assert lines == expected_lines
+            assert isinstance(lines, CompactLines)
+
+    def test_iter_lines(self):
+        """Тест ленивого построчного чтения файла."""
+        file_content = "line1\nline2\nline3\n"
+
+        with patch("builtins.open", mock_open(read_data=file_content)):
+            lines = self.adapter.iter_lines("test.txt")
+
+            assert next(lines) == "line1"
+            assert list(lines) == ["line2", "line3"]
+
+    def test_iter_lines_error(self):
+        """Тест обработки ошибки при построчном чтении файла."""
+        with patch("builtins.open", side_effect=OSError("boom")), patch(
+            "builtins.print"
+        ) as mock_print:
+            assert list(self.adapter.iter_lines("missing.txt")) == []
+            mock_print.assert_called_once()
 
     def test_write_file(self):
         """Тест записи содержимого в файл."""
@@ -66,6 +144,23 @@ class TestLocalFileSystemAdapter:
             mock_file.assert_called_once_with(file_path, "w", encoding="utf-8")
             mock_file().write.assert_called_once_with(file_content)
 
+    def test_get_file_size(self):
+        """Тест получения размера файла."""
+        with patch("os.path.getsize", return_value=42):
+            assert self.adapter.get_file_size("file.txt") == 42
+
+    def test_get_file_signature(self, tmp_path):
+        """Тест получения сигнатуры файла."""
+        file_path = tmp_path / "test.txt"
+        file_path.write_text("abc", encoding="utf-8")
+        stat = os.stat(file_path)
+
+        assert self.adapter.get_file_signature(str(file_path)) == (
+            stat.st_mtime_ns,
+            3,
+        )
+        assert self.adapter.get_file_signature(str(tmp_path / "missing")) is None
+
     def test_get_absolute_path(self):
         """Тест получения абсолютного пути."""
         with patch("os.path.abspath", return_value="/absolute/path/to/file.txt"):
@@ -73,3 +168,59 @@ class TestLocalFileSystemAdapter:
                 self.adapter.get_absolute_path("file.txt")
                 == "/absolute/path/to/file.txt"
             )
+
+    def test_stat_file(self, tmp_path):
+        """Тест сведений stat для файла, директории и отсутствующего пути."""
+        file_path = tmp_path / "test.txt"
+        file_path.write_text("abc", encoding="utf-8")
+        stat = os.stat(file_path)
+
+        record = self.adapter.stat_file(str(file_path))
+
+        assert record == StatRecord(True, 3, stat.st_mtime_ns)
+        assert record.signature == (stat.st_mtime_ns, 3)
+        assert self.adapter.stat_file(str(tmp_path)).is_file is False
+        assert self.adapter.stat_file(str(tmp_path / "missing")) is None
+
+    def test_stat_cache_reuses_validation(self, tmp_path):
+        """Тест одного stat на файл за запуск при общем StatCache."""
+        file_path = str(tmp_path / "test.txt")
+        missing_path = str(tmp_path / "missing.txt")
+        (tmp_path / "test.txt").write_text("abc", encoding="utf-8")
+        adapter = LocalFileSystemAdapter(StatCache())
+
+        with adapter.stat_cache.scope():
+            with patch("os.stat", wraps=os.stat) as mock_stat:
+                record = adapter.stat_file(file_path)
+                assert adapter.stat_file(missing_path) is None
+                assert adapter.file_exists(file_path) is True
+                assert adapter.file_exists(missing_path) is False
+                assert adapter.get_file_size(file_path) == 3
+                assert adapter.get_file_signature(file_path) == record.signature
+                assert adapter.get_file_signature(missing_path) is None
+                assert adapter.stat_file(file_path) is record
+            assert mock_stat.call_count == 2
+
+            with pytest.raises(FileNotFoundError):
+                adapter.get_file_size(missing_path)
+
+        with patch("os.stat", wraps=os.stat) as mock_stat:
+            assert adapter.get_file_size(file_path) == 3
+            adapter.stat_file(file_path)
+        assert mock_stat.call_count == 2
+
+    def test_iter_files_remembers_entries_in_scope(self, tmp_path):
+        """Тест запоминания сведений найденных файлов при обходе в запуске."""
+        dir_path = self.make_tree(tmp_path)
+        adapter = LocalFileSystemAdapter(StatCache())
+
+        with adapter.stat_cache.scope():
+            files = sorted(adapter.iter_files(dir_path))
+            with patch("os.stat") as mock_stat:
+                sizes = [adapter.get_file_size(path) for path in files]
+                signatures = [adapter.get_file_signature(path) for path in files]
+
+        mock_stat.assert_not_called()
+        assert sizes == [1, 1, 1]
+        assert signatures[0] == (os.stat(files[0]).st_mtime_ns, 1)
+        assert adapter.stat_cache.lookup(files[0]) is None
@@ -0,0 +1,130 @@
+import os
+import pytest
+from unittest.mock import patch
+from infrastructure.adapters import (
+    InotifyFileWatcher,
+    PollingFileWatcher,
+    create_file_watcher,
+)
+
+
+def make_inotify_watcher():
+    """Создаёт наблюдатель inotify или пропускает тест, если он недоступен."""
+    try:
+        return InotifyFileWatcher()
+    except OSError:
+        pytest.skip("inotify недоступен")
+
+
+class TestPollingFileWatcher:
+    """Тесты для наблюдателя, опрашивающего os.stat."""
+
+    def test_detects_changes(self, tmp_path):
+        """Тест обнаружения изменения, создания и удаления файлов."""
+        existing = tmp_path / "a.txt"
+        missing = tmp_path / "b.txt"
+        existing.write_text("a", encoding="utf-8")
+        watcher = PollingFileWatcher(interval=0.01)
+        watcher.watch([str(existing), str(missing), str(tmp_path)])
+
+        assert watcher.wait(timeout=0.03) == set()
+
+        existing.write_text("changed", encoding="utf-8")
+        assert watcher.wait(timeout=1) == {str(existing)}
+
+        missing.write_text("b", encoding="utf-8")
+        assert watcher.wait(timeout=1) == {str(missing), str(tmp_path)}
+
+        existing.unlink()
+        assert watcher.wait(timeout=1) == {str(existing), str(tmp_path)}
+        watcher.close()
+
+    def test_rewatch_keeps_known_snapshot(self, tmp_path):
+        """Тест сохранения изменений, случившихся до повторного watch."""
+        file_path = tmp_path / "a.txt"
+        file_path.write_text("a", encoding="utf-8")
+        watcher = PollingFileWatcher(interval=0.01)
+        watcher.watch([str(file_path)])
+
+        file_path.write_text("changed", encoding="utf-8")
+        watcher.watch([str(file_path), str(tmp_path / "new.txt")])
+
+        assert watcher.wait(timeout=1) == {str(file_path)}
+
+
+class TestInotifyFileWatcher:
+    """Тесты для наблюдателя на основе inotify."""
+
+    def test_detects_file_changes(self, tmp_path):
+        """Тест событий для отслеживаемых файлов и директорий."""
+        files_dir = tmp_path / "files"
+        files_dir.mkdir()
+        watched = tmp_path / "a.txt"
+        ignored = tmp_path / "ignored.txt"
+        watched.write_text("a", encoding="utf-8")
+        watcher = make_inotify_watcher()
+        try:
+            watcher.watch([str(watched), str(files_dir)])
+            assert watcher.wait(timeout=0.01) == set()
+
+            ignored.write_text("x", encoding="utf-8")
+            watched.write_text("changed", encoding="utf-8")
+            assert watcher.wait(timeout=1) == {str(watched)}
+
+            (files_dir / "new.txt").write_text("new", encoding="utf-8")
+            assert watcher.wait(timeout=1) == {
+                str(files_dir),
+                str(files_dir / "new.txt"),
+            }
+
+            replacement = tmp_path / "a.tmp"
+            replacement.write_text("replaced", encoding="utf-8")
+            os.replace(replacement, watched)
+            assert str(watched) in watcher.wait(timeout=1)
+
+            watcher.watch([str(watched)])
+            (files_dir / "other.txt").write_text("x", encoding="utf-8")
+            assert watcher.wait(timeout=0.05) == set()
+        finally:
+            watcher.close()
+            watcher.close()
+
+    def test_directory_removed_and_overflow(self, tmp_path):
+        """Тест удаления директории и переполнения очереди событий."""
+        files_dir = tmp_path / "files"
+        files_dir.mkdir()
+        watched = tmp_path / "a.txt"
+        watcher = make_inotify_watcher()
+        try:
+            watcher.watch([str(files_dir), str(watched)])
+            files_dir.rmdir()
+            assert str(files_dir) in watcher.wait(timeout=1)
+            assert str(files_dir) not in watcher._dirs
+
+            changed = set()
+            overflow = watcher._EVENT.pack(-1, watcher.IN_Q_OVERFLOW, 0, 0)
+            watcher._parse_events(overflow, changed)
+            assert changed == {str(files_dir), str(watched)}
+        finally:
+            watcher.close()
+
+
+class TestCreateFileWatcher:
+    """Тесты для выбора наблюдателя."""
+
+    def test_falls_back_to_polling(self):
+        """Тест перехода на опрос, если inotify недоступен."""
+        with patch(
+            "infrastructure.adapters.file_watcher_adapter.InotifyFileWatcher",
+            side_effect=OSError,
+        ):
+            watcher = create_file_watcher(poll_interval=0.5)
+
+        assert isinstance(watcher, PollingFileWatcher)
+        assert watcher.interval == 0.5
+
+    def test_inotify_unavailable(self):
+        """Тест ошибки создания наблюдателя без inotify в libc."""
+        with patch("ctypes.CDLL", return_value=object()):
+            with pytest.raises(OSError):
+                InotifyFileWatcher()
@@ -0,0 +1,182 @@
+import mmap
+import os
+import sys
+import pytest
+from unittest.mock import Mock, patch
+from domain import CompactLines, FileContent, TextProcessingService
+from application.ports import FileSystemPort
+from application.services import FileProcessorService
+from infrastructure.adapters import (
+    LocalFileSystemAdapter,
+    MmapFileSystemAdapter,
+    MmapLineView,
+)
+
+
+class TestMmapFileSystemAdapter:
+    """Тесты для адаптера файловой системы на основе mmap."""
+
+    def setup_method(self):
+        """Настройка перед каждым тестом."""
+        self.adapter = MmapFileSystemAdapter()
+        self.local_adapter = LocalFileSystemAdapter()
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            b"",
+            b"line1\nline2\nline3\n",
+            b"line1\nline2",
+            b"\n\n\n",
+            b"windows\r\nline\r\n",
+            b"old mac\rline\r",
+            b"mixed\r\n\rend\n\r\n",
+            "Привет, мир!\nabc\n".encode("utf-8"),
+        ],
+    )
+    def test_read_file_matches_local_adapter(self, tmp_path, content):
+        """Тест совпадения строк с обычным чтением файла."""
+        file_path = tmp_path / "test.txt"
+        file_path.write_bytes(content)
+
+        view = self.adapter.read_file(str(file_path))
+
+        expected = self.local_adapter.read_file(str(file_path))
+        assert isinstance(view, MmapLineView)
+        assert len(view) == len(expected)
+        assert list(view) == expected
+        assert view == expected
+        assert [view[i] for i in range(len(view))] == expected
+        assert isinstance(view[:], CompactLines)
+        assert view[:] == expected
+        assert view[1:] == expected[1:]
+
+    def test_index_is_built_lazily(self, tmp_path):
+        """Тест ленивого построения индекса строк."""
+        file_path = tmp_path / "test.txt"
+        file_path.write_text("a\nb\nc\n", encoding="utf-8")
+
+        view = MmapLineView(str(file_path))
+
+        assert view._offsets is None
+        assert view[1] == "b"
+        assert view._offsets.typecode == "Q"
+        assert view.__sizeof__() >= 4 * view._offsets.itemsize
+        assert list(view._offsets) == [0, 2, 4, 6]
+
+    def test_getitem_negative_and_slice(self, tmp_path):
+        """Тест отрицательных индексов и срезов."""
+        file_path = tmp_path / "test.txt"
+        file_path.write_text("a\nb\nc\n", encoding="utf-8")
+
+        view = MmapLineView(str(file_path))
+
+        assert view[-1] == "c"
+        assert view[1:] == ["b", "c"]
+        assert view[::2] == ["a", "c"]
+        with pytest.raises(IndexError):
+            view[3]
+
+    def test_close(self, tmp_path):
+        """Тест освобождения отображения файла."""
+        file_path = tmp_path / "test.txt"
+        file_path.write_text("a\nb\n", encoding="utf-8")
+
+        view = self.adapter.read_file(str(file_path))
+        view.close()
+
+        assert "test.txt" in repr(view)
+        assert (view == 42) is False
+        with pytest.raises(ValueError):
+            len(view)
+        with pytest.raises(ValueError):
+            view[0]
+        with MmapLineView(str(file_path)) as other:
+            assert other[1] == "b"
+        with pytest.raises(ValueError):
+            list(other)
+
+    def test_changed_file_raises(self, tmp_path):
+        """Тест ошибки при обращении к изменённому после чтения файлу."""
+        file_path = tmp_path / "test.txt"
+        file_path.write_text("a\nb\n", encoding="utf-8")
+        view = self.adapter.read_file(str(file_path))
+
+        file_path.write_text("a\nb\nc\n", encoding="utf-8")
+
+        with pytest.raises(OSError, match="изменился"):
+            view[0]
+
+    def test_iterates_in_batches(self, tmp_path, monkeypatch):
+        """Тест перебора строк порциями, каждая за одно отображение файла."""
+        monkeypatch.setattr(MmapLineView, "BATCH_LINES", 2)
+        file_path = tmp_path / "test.txt"
+        file_path.write_text("a\nb\r\nc\rd\ne", encoding="utf-8")
+        view = self.adapter.read_file(str(file_path))
+
+        with patch("mmap.mmap", wraps=mmap.mmap) as mock_mmap:
+            assert list(view) == ["a", "b", "c", "d", "e"]
+
+        assert mock_mmap.call_count == 3
+
+    def test_read_file_closes_mapping(self, tmp_path):
+        """Тест того, что прочитанные файлы не держат открытых дескрипторов."""
+        paths = []
+        for index in range(50):
+            file_path = tmp_path / f"file{index}.txt"
+            file_path.write_text(f"line {index}\n", encoding="utf-8")
+            paths.append(str(file_path))
+        open_fds = len(os.listdir("/proc/self/fd"))
+
+        contents = [self.adapter.read_file(path) for path in paths]
+        assert len(os.listdir("/proc/self/fd")) == open_fds
+
+        assert contents[7] == ["line 7"]
+        assert sys.getsizeof(contents[7]) < 200
+        assert len(os.listdir("/proc/self/fd")) == open_fds
+
+    def test_read_file_invalid_utf8(self, tmp_path):
+        """Тест ошибки декодирования: файл считается пустым, как раньше."""
+        file_path = tmp_path / "test.txt"
+        file_path.write_bytes(b"ok\n\xff\xfe\n")
+
+        with patch("builtins.print") as mock_print:
+            lines = self.adapter.read_file(str(file_path))
+            assert self.local_adapter.read_file(str(file_path)) == []
+
+        assert isinstance(lines, CompactLines) and len(lines) == 0
+
+        assert "Ошибка при чтении файла" in mock_print.call_args_list[0].args[0]
+
+    def test_read_file_error(self):
+        """Тест обработки ошибки при чтении отсутствующего файла."""
+        with patch("builtins.print") as mock_print:
+            assert self.adapter.read_file("non_existing_file.txt") == []
+            mock_print.assert_called_once()
+
+    def test_process_files_on_view(self, tmp_path):
+        """Тест обработки файлов, представленных через mmap."""
+        file1 = tmp_path / "file1.txt"
+        file2 = tmp_path / "file2.txt"
+        file1.write_text("one two\nHello, World!\n", encoding="utf-8")
+        file2.write_text("abc", encoding="utf-8")
+        service = FileProcessorService(
+            Mock(spec=FileSystemPort), TextProcessingService()
+        )
+
+        for action in ("string", "count", "replace"):
+            views = [
+                FileContent(file_path=str(path), lines=MmapLineView(str(path)))
+                for path in (file1, file2)
+            ]
+            lists = [
+                FileContent(
+                    file_path=str(path), lines=self.local_adapter.read_file(str(path))
+                )
+                for path in (file1, file2)
+            ]
+
+            assert service.process_files(views, action) == service.process_files(
+                lists, action
+            )
+        assert isinstance(views[0].lines, MmapLineView)
@@ -0,0 +1,169 @@
+import os
+from dataclasses import replace
+from unittest.mock import Mock
+from domain import Config
+from application.ports import FileSystemPort
+from infrastructure.adapters import LocalFileSystemAdapter
+from infrastructure.repositories import ResultCache
+
+
+class TestResultCache:
+    """Тесты для постоянного кэша результатов."""
+
+    def setup_method(self):
+        """Настройка перед каждым тестом."""
+        self.config = Config(id="1", mode="files", path="a.txt", action="count")
+
+    def make_cache(self, tmp_path, **kwargs):
+        """Создаёт кэш во временном каталоге."""
+        return ResultCache(
+            LocalFileSystemAdapter(), cache_dir=str(tmp_path / "cache"), **kwargs
+        )
+
+    def test_make_key_depends_on_inputs(self, tmp_path):
+        """Тест зависимости ключа от действия, списка и состояния файлов."""
+        file_a = tmp_path / "a.txt"
+        file_b = tmp_path / "b.txt"
+        file_a.write_text("one", encoding="utf-8")
+        file_b.write_text("two", encoding="utf-8")
+        cache = self.make_cache(tmp_path)
+        paths = [str(file_a), str(file_b)]
+
+        key = cache.make_key("config.txt", self.config, paths)
+        replace_config = Config(id="1", mode="files", path="a.txt", action="replace")
+
+        assert key == cache.make_key("config.txt", self.config, paths)
+        assert key != cache.make_key("config.txt", replace_config, paths)
+        assert key != cache.make_key("config.txt", self.config, paths[::-1])
+        assert key == cache.make_key("config.txt", self.config, paths, "json")
+        assert key != cache.make_key("config.txt", self.config, paths, "csv")
+
+        file_a.write_text("changed", encoding="utf-8")
+        assert key != cache.make_key("config.txt", self.config, paths)
+
+    def test_make_key_depends_on_patterns(self, tmp_path):
+        """Тест зависимости ключа search от шаблонов и файла шаблонов."""
+        file_a = tmp_path / "a.txt"
+        patterns_file = tmp_path / "patterns.txt"
+        file_a.write_text("one", encoding="utf-8")
+        patterns_file.write_text("one", encoding="utf-8")
+        cache = self.make_cache(tmp_path)
+        paths = [str(file_a)]
+        config = Config(
+            id="1",
+            mode="files",
+            path="a.txt",
+            action="search",
+            patterns="on",
+            patterns_file=str(patterns_file),
+        )
+
+        key = cache.make_key("config.txt", config, paths)
+        other = replace(config, patterns="ne")
+
+        assert key != cache.make_key("config.txt", other, paths)
+        patterns_file.write_text("two", encoding="utf-8")
+        assert key != cache.make_key("config.txt", config, paths)
+
+    def test_make_key_missing_file(self, tmp_path):
+        """Тест отсутствия ключа для недоступного файла."""
+        cache = self.make_cache(tmp_path)
+
+        assert cache.make_key("c.txt", self.config, [str(tmp_path / "no")]) is None
+
+    def test_make_key_with_content_hash(self, tmp_path):
+        """Тест ключа по хэшу содержимого файлов."""
+        file_a = tmp_path / "a.txt"
+        file_a.write_text("same", encoding="utf-8")
+        cache = self.make_cache(tmp_path, hash_contents=True)
+
+        key = cache.make_key("config.txt", self.config, [str(file_a)])
+        os.utime(file_a, ns=(1, 1))
+
+        assert key == cache.make_key("config.txt", self.config, [str(file_a)])
+        assert cache.make_key("c.txt", self.config, [str(tmp_path / "no")]) is None
+
+    def test_store_and_fetch(self, tmp_path):
+        """Тест сохранения и повторного использования результата."""
+        cache = self.make_cache(tmp_path)
+        result_path = tmp_path / "result.json"
+        result_path.write_text('{"out": {}}', encoding="utf-8")
+        output_path = tmp_path / "copy.json"
+
+        assert cache.fetch("key", str(output_path)) is False
+
+        cache.store("key", str(result_path))
+
+        assert cache.fetch("key", str(output_path)) is True
+        assert output_path.read_text(encoding="utf-8") == '{"out": {}}'
+        assert os.listdir(cache.cache_dir) == ["key.json"]
+
+    def test_evict_by_size(self, tmp_path):
+        """Тест вытеснения старых записей по размеру кэша."""
+        cache = self.make_cache(tmp_path, max_bytes=25)
+        result_path = tmp_path / "result.json"
+        result_path.write_text("x" * 10, encoding="utf-8")
+
+        for key in ("first", "second", "third"):
+            cache.store(key, str(result_path))
+            entry_path = os.path.join(cache.cache_dir, f"{key}.json")
+            stamp = {"first": 1, "second": 2, "third": 3}[key] * 10**9
+            os.utime(entry_path, ns=(stamp, stamp))
+        cache.evict()
+
+        assert sorted(os.listdir(cache.cache_dir)) == ["second.json", "third.json"]
+
+    def test_store_skips_result_over_budget(self, tmp_path):
+        """Тест пропуска результата больше бюджета без очистки кэша."""
+        cache = self.make_cache(tmp_path, max_bytes=25)
+        small_path = tmp_path / "small.json"
+        small_path.write_text("x" * 10, encoding="utf-8")
+        large_path = tmp_path / "large.json"
+        large_path.write_text("x" * 26, encoding="utf-8")
+        cache.store("small", str(small_path))
+
+        cache.store("large", str(large_path))
+
+        assert os.listdir(cache.cache_dir) == ["small.json"]
+        assert cache.fetch("large", str(tmp_path / "copy.json")) is False
+
+    def test_store_keeps_running_total(self, tmp_path, monkeypatch):
+        """Тест учёта размера без сканирования каталога при каждом сохранении."""
+        cache = self.make_cache(tmp_path, max_bytes=25)
+        result_path = tmp_path / "result.json"
+        result_path.write_text("x" * 10, encoding="utf-8")
+        scans = []
+        scan_entries = cache._scan_entries
+        monkeypatch.setattr(
+            cache, "_scan_entries", lambda: scans.append(1) or scan_entries()
+        )
+
+        cache.store("first", str(result_path))
+        cache.store("first", str(result_path))
+        cache.store("second", str(result_path))
+        assert len(scans) == 1
+
+        cache.store("third", str(result_path))
+        assert len(scans) == 2
+        assert len(os.listdir(cache.cache_dir)) == 2
+
+    def test_clear(self, tmp_path):
+        """Тест очистки кэша."""
+        cache = self.make_cache(tmp_path)
+        result_path = tmp_path / "result.json"
+        result_path.write_text("{}", encoding="utf-8")
+        cache.store("key", str(result_path))
+
+        cache.clear()
+
+        assert not os.path.exists(cache.cache_dir)
+
+    def test_make_key_uses_port_signature(self):
+        """Тест получения сигнатур файлов через порт файловой системы."""
+        file_system = Mock(spec=FileSystemPort)
+        file_system.get_file_signature.return_value = (1, 2)
+        file_system.get_absolute_path.return_value = "/abs/config.txt"
+        cache = ResultCache(file_system, cache_dir="unused")
+
+        assert cache.make_key("config.txt", self.config, ["a.txt"]) is not None
+        file_system.get_file_signature.assert_called_once_with("a.txt")
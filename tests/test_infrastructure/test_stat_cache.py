@@ -0,0 +1,73 @@
+import os
+import threading
+from unittest.mock import Mock, patch
+from domain import StatRecord
+from infrastructure.adapters import StatCache
+
+
+class TestStatCache:
+    """Тесты для кэша сведений stat на время запуска."""
+
+    def test_stat_once_per_scope(self):
+        """Тест одного вызова stat за запуск и очистки после него."""
+        cache = StatCache()
+        record = StatRecord(True, 3, 1)
+        stat_func = Mock(return_value=record)
+
+        with cache.scope():
+            assert cache.active
+            assert cache.stat("a.txt", stat_func) is record
+            assert cache.stat("a.txt", stat_func) is record
+            assert cache.lookup("a.txt") is record
+        assert stat_func.call_count == 1
+
+        assert not cache.active
+        assert cache.lookup("a.txt", "missing") == "missing"
+        cache.stat("a.txt", stat_func)
+        assert stat_func.call_count == 2
+
+    def test_remember_missing_file_and_outside_scope(self):
+        """Тест запоминания отсутствующего файла и игнорирования вне запуска."""
+        cache = StatCache()
+
+        cache.remember("a.txt", StatRecord(True, 3, 1))
+        assert cache.lookup("a.txt", "missing") == "missing"
+
+        with cache.scope():
+            cache.remember("b.txt", None)
+            assert cache.lookup("b.txt", "missing") is None
+
+    def test_nested_scopes(self):
+        """Тест сохранения сведений до выхода из последнего запуска."""
+        cache = StatCache()
+        entered = threading.Event()
+        release = threading.Event()
+
+        def other_run():
+            with cache.scope():
+                entered.set()
+                release.wait()
+
+        thread = threading.Thread(target=other_run)
+        thread.start()
+        entered.wait()
+        with cache.scope():
+            cache.remember("a.txt", StatRecord(True, 3, 1))
+        assert cache.lookup("a.txt") == StatRecord(True, 3, 1)
+        release.set()
+        thread.join()
+
+        assert cache.lookup("a.txt", "missing") == "missing"
+
+    def test_absolute_path(self):
+        """Тест одного os.getcwd за запуск для относительного пути."""
+        cache = StatCache()
+
+        with patch("os.getcwd", wraps=os.getcwd) as mock_getcwd:
+            with cache.scope():
+                first = cache.absolute_path("config.txt")
+                assert cache.absolute_path("config.txt") == first
+            assert mock_getcwd.call_count == 1
+            assert cache.absolute_path("config.txt") == first
+            assert cache.absolute_path("config.txt") == os.path.abspath("config.txt")
+        assert mock_getcwd.call_count == 4
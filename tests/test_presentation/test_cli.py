@@ -1,3 +1,4 @@
+import pytest
 import sys
 from unittest.mock import patch, mock_open, Mock
 from domain import ProcessingResult
@@ -77,6 +78,65 @@ class TestCLI:
             sys.argv = original_argv
             sys.exit = original_exit
 
+    def test_parse_args_with_options(self):
+        """Тест разбора аргументов вместе с параметрами."""
+        original_argv = sys.argv
+
+        try:
+            sys.argv = ["script.py", "--no-cache", "config.txt", "1", "--jobs=4"]
+
+            config_file, config_id = CLI.parse_args()
+            options = CLI.parse_options()
+
+            assert config_file == "config.txt"
+            assert config_id == "1"
+            assert options == {"no-cache": True, "jobs": "4"}
+        finally:
+            sys.argv = original_argv
+
+    def test_split_config_ids(self):
+        """Тест разбора списка ID конфигураций."""
+        assert CLI.split_config_ids("1") == ["1"]
+        assert CLI.split_config_ids("1, 3,1,,2") == ["1", "3", "2"]
+
+    def test_parse_profile_modes(self):
+        """Тест разбора режимов профилирования."""
+        assert CLI.parse_profile_modes(None) == []
+        assert CLI.parse_profile_modes(True) == ["trace"]
+        assert CLI.parse_profile_modes("pstats, MEMORY,pstats") == [
+            "trace",
+            "pstats",
+            "memory",
+        ]
+        with pytest.raises(ValueError):
+            CLI.parse_profile_modes("flamegraph")
+
+    def test_parse_output_format(self):
+        """Тест разбора формата результата."""
+        assert CLI.parse_output_format(None) == "json"
+        assert CLI.parse_output_format(" CSV") == "csv"
+        with pytest.raises(ValueError):
+            CLI.parse_output_format("xml")
+        with pytest.raises(ValueError):
+            CLI.parse_output_format(True)
+
+    def test_parse_memo_size(self):
+        """Тест разбора размера кэша строк."""
+        assert CLI.parse_memo_size(None) is False
+        assert CLI.parse_memo_size(True) is True
+        assert CLI.parse_memo_size("500") == 500
+        for value in ("0", "-1", "many"):
+            with pytest.raises(ValueError):
+                CLI.parse_memo_size(value)
+
+    def test_parse_jobs(self):
+        """Тест разбора числа одновременных конфигураций."""
+        assert CLI.parse_jobs(None) == 1
+        assert CLI.parse_jobs("4") == 4
+        for value in (True, "0", "-2", "abc", "1.5", ""):
+            with pytest.raises(ValueError, match="--jobs"):
+                CLI.parse_jobs(value)
+
     def test_show_help(self):
         """Тест вывода справочной информации."""
         with patch("builtins.print") as mock_print:
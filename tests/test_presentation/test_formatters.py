@@ -1,5 +1,25 @@
-from domain import Config, ProcessingResult
-from presentation import ConsoleFormatter, JsonFormatter
+import io
+import json
+import pytest
+from domain import (
+    ColumnarResult,
+    Config,
+    FileMatches,
+    FileStats,
+    ProcessingResult,
+    ResultManifest,
+    SearchResult,
+    StatsResult,
+)
+from presentation import (
+    OUTPUT_FORMATTERS,
+    BinaryFormatter,
+    ConsoleFormatter,
+    CsvFormatter,
+    JsonFormatter,
+    NdjsonFormatter,
+    OutputFormatter,
+)
 
 
 class TestConsoleFormatter:
@@ -105,3 +125,429 @@ class TestJsonFormatter:
         expected_path = str(tmp_path / f"results/result_config_{result.config_id}.json")
         assert file_path in expected_path
         assert (tmp_path / f"results/result_config_{result.config_id}.json").exists()
+
+    def test_write_result_matches_json_dumps(self):
+        """Тест побайтового совпадения потоковой записи с json.dumps."""
+        outs = [
+            {},
+            {"1": {"1": "data1", "2": 0}},
+            {
+                "1": {"1": 'строка "в кавычках"\n', "2": 3},
+                "2": {"1": "", "2": 0},
+            },
+        ]
+
+        for out in outs:
+            result = ProcessingResult(
+                config_file="/path/to/config.txt",
+                config_id="1",
+                config_data={"mode": "dir", "path": "./тест"},
+                out=out,
+            )
+            expected = json.dumps(
+                {
+                    "configFile": result.config_file,
+                    "configurationID": result.config_id,
+                    "configurationData": result.config_data,
+                    "out": out,
+                },
+                indent=2,
+                ensure_ascii=False,
+            )
+
+            assert JsonFormatter.format_result(result) == expected
+
+    def test_write_result_from_row_generator(self):
+        """Тест потоковой записи результата из генератора строк."""
+        out = {"1": {"1": "a", "2": "b"}, "2": {"1": "c", "2": ""}}
+        dict_result = ProcessingResult(
+            config_file="/path/to/config.txt",
+            config_id="7",
+            config_data={"mode": "files", "path": "a.txt, b.txt"},
+            out=out,
+        )
+        stream_result = ProcessingResult(
+            config_file=dict_result.config_file,
+            config_id=dict_result.config_id,
+            config_data=dict_result.config_data,
+            out=(row for row in out.items()),
+        )
+        buffer = io.StringIO()
+
+        JsonFormatter.write_result(buffer, stream_result)
+
+        assert buffer.getvalue() == JsonFormatter.format_result(dict_result)
+        assert json.loads(buffer.getvalue())["out"] == out
+
+    def test_manifest_roundtrip(self, tmp_path):
+        """Тест сохранения и загрузки сведений о входных данных."""
+        manifest = ResultManifest(
+            action="count",
+            files=["a.txt", "b.txt"],
+            signatures=[(1, 2), None],
+            line_counts=[3, 0],
+            result_signature=(5, 6),
+        )
+        manifest_path = JsonFormatter.get_manifest_path(str(tmp_path / "r.json"))
+
+        JsonFormatter.save_manifest(manifest, manifest_path)
+
+        assert manifest_path == str(tmp_path / "r.manifest.json")
+        assert JsonFormatter.load_manifest(manifest_path) == manifest
+        assert JsonFormatter.load_manifest(str(tmp_path / "missing.json")) is None
+
+    def test_save_trace(self, tmp_path):
+        """Тест путей и сохранения профиля этапов."""
+        result_path = str(tmp_path / "r.json")
+        trace_path = JsonFormatter.get_trace_path(result_path)
+
+        JsonFormatter.save_trace({"stages": {"чтение": 1}}, trace_path)
+
+        assert trace_path == str(tmp_path / "r.profile.json")
+        assert JsonFormatter.get_pstats_path(result_path) == str(tmp_path / "r.pstats")
+        with open(trace_path, encoding="utf-8") as f:
+            assert json.load(f) == {"stages": {"чтение": 1}}
+
+
+def make_result(out, config_id="1", line_counts=None):
+    """Создаёт результат обработки с заданным out."""
+    return ProcessingResult(
+        config_file="/path/to/config.txt",
+        config_id=config_id,
+        config_data={"mode": "dir", "path": "./test"},
+        out=out,
+        line_counts=line_counts,
+    )
+
+
+def make_sparse_result(columnar, shape="columnar"):
+    """Создаёт разреженный результат из столбцового в заданном виде out."""
+    out = {
+        "columnar": columnar.sparse_out,
+        "dict": dict(columnar.sparse_rows()),
+        "rows": columnar.sparse_rows(),
+    }[shape]
+    return make_result(out, line_counts=columnar.line_counts)
+
+
+COLUMNAR_OUTS = {
+    "count": ColumnarResult("count", [[2, 0, 5], [1]]),
+    "string": ColumnarResult("string", [['a, "b"', "строка"], ["x\ny", "", "z"]]),
+}
+
+
+class TestOutputFormatters:
+    """Тесты для форматов NDJSON, CSV и двоичного столбцового."""
+
+    @pytest.mark.parametrize(
+        "formatter", [JsonFormatter, NdjsonFormatter, BinaryFormatter]
+    )
+    @pytest.mark.parametrize("action", ["count", "string"])
+    @pytest.mark.parametrize("shape", ["columnar", "dict", "rows"])
+    def test_roundtrip(self, tmp_path, formatter, action, shape):
+        """Тест загрузки сохранённого out для разных видов результата."""
+        columnar = COLUMNAR_OUTS[action]
+        expected = dict(columnar.rows())
+        out = {
+            "columnar": columnar.out,
+            "dict": expected,
+            "rows": columnar.rows(),
+        }[shape]
+
+        path = formatter.save_to_file(make_result(out), str(tmp_path / "result"))
+
+        assert formatter.load_out(path) == expected
+
+    def test_output_formatter_is_abstract(self):
+        """Тест обязательной реализации write_result в формате."""
+
+        class IncompleteFormatter(OutputFormatter):
+            pass
+
+        with pytest.raises(TypeError):
+            IncompleteFormatter()
+        assert all(
+            not getattr(formatter, "__abstractmethods__")
+            for formatter in OUTPUT_FORMATTERS.values()
+        )
+
+    def test_ndjson(self):
+        """Тест строк NDJSON."""
+        lines = NdjsonFormatter.format_result(
+            make_result(COLUMNAR_OUTS["count"].out)
+        ).splitlines()
+
+        assert json.loads(lines[0]) == {
+            "configFile": "/path/to/config.txt",
+            "configurationID": "1",
+            "configurationData": {"mode": "dir", "path": "./test"},
+            "files": ["1", "2"],
+        }
+        assert lines[1:] == [
+            '{"line":1,"1":2,"2":1}',
+            '{"line":2,"1":0,"2":0}',
+            '{"line":3,"1":5,"2":0}',
+        ]
+
+    def test_csv(self):
+        """Тест CSV с экранированием и дополнением коротких файлов."""
+        text = CsvFormatter.format_result(make_result(COLUMNAR_OUTS["string"].out))
+
+        assert text == 'line,1,2\n1,"a, ""b""","x\ny"\n2,строка,\n3,,z\n'
+        assert CsvFormatter.load_out("result.csv") is None
+
+    @pytest.mark.parametrize("formatter", list(OUTPUT_FORMATTERS.values()))
+    def test_empty_result(self, tmp_path, formatter):
+        """Тест результата без строк."""
+        path = formatter.save_to_file(make_result({}), str(tmp_path / "empty"))
+
+        assert path.endswith("empty")
+        assert formatter.load_out(path) in (None, {})
+
+    def test_binary_blocks(self, tmp_path, monkeypatch):
+        """Тест разбиения двоичного результата на блоки и его заголовка."""
+        monkeypatch.setattr(BinaryFormatter, "BLOCK_ROWS", 2)
+        result = make_result(COLUMNAR_OUTS["string"].out)
+
+        data = BinaryFormatter.format_result(result)
+        path = BinaryFormatter.save_to_file(result, str(tmp_path / "result.bin"))
+
+        assert data.startswith(BinaryFormatter.MAGIC)
+        assert data.endswith(b"\x00" * 4)
+        assert BinaryFormatter.load_result(path) == {
+            "configFile": "/path/to/config.txt",
+            "configurationID": "1",
+            "configurationData": {"mode": "dir", "path": "./test"},
+            "out": dict(COLUMNAR_OUTS["string"].rows()),
+        }
+
+    def test_binary_is_compact(self):
+        """Тест того, что двоичный формат меньше JSON."""
+        result = make_result(ColumnarResult("count", [list(range(1000))] * 3).out)
+
+        binary = BinaryFormatter.format_result(result)
+
+        assert len(binary) < len(JsonFormatter.format_result(result).encode()) / 2
+
+    def test_binary_bad_magic(self, tmp_path):
+        """Тест ошибки при чтении файла другого формата."""
+        path = tmp_path / "result.bin"
+        path.write_bytes(b"{}")
+
+        with pytest.raises(ValueError):
+            BinaryFormatter.load_result(str(path))
+
+    def test_output_path_extension(self, tmp_path, monkeypatch):
+        """Тест расширения файла результата по умолчанию."""
+        monkeypatch.chdir(tmp_path)
+
+        assert CsvFormatter.get_output_path("7") == "results/result_config_7.csv"
+        assert JsonFormatter.get_output_path("7", extension="bin") == (
+            "results/result_config_7.bin"
+        )
+
+
+class TestSparseOutput:
+    """Тесты записи разреженного результата (без ячеек дополнения)."""
+
+    @pytest.mark.parametrize(
+        "formatter", [JsonFormatter, NdjsonFormatter, BinaryFormatter]
+    )
+    @pytest.mark.parametrize("action", ["count", "string"])
+    @pytest.mark.parametrize("shape", ["columnar", "dict", "rows"])
+    def test_roundtrip(self, tmp_path, formatter, action, shape):
+        """Тест загрузки сохранённого разреженного out."""
+        columnar = COLUMNAR_OUTS[action]
+        result = make_sparse_result(columnar, shape)
+
+        path = formatter.save_to_file(result, str(tmp_path / "result"))
+
+        assert formatter.load_out(path) == dict(columnar.sparse_rows())
+
+    def test_json(self):
+        """Тест JSON с числом строк каждого файла после out."""
+        text = JsonFormatter.format_result(make_sparse_result(COLUMNAR_OUTS["count"]))
+
+        assert json.loads(text) == {
+            "configFile": "/path/to/config.txt",
+            "configurationID": "1",
+            "configurationData": {"mode": "dir", "path": "./test"},
+            "out": {"1": {"1": 2, "2": 1}, "2": {"1": 0}, "3": {"1": 5}},
+            "lineCounts": [3, 1],
+        }
+        assert text.endswith('\n  },\n  "lineCounts": [3, 1]\n}')
+
+    def test_ndjson(self):
+        """Тест строк NDJSON только с настоящими ячейками."""
+        lines = NdjsonFormatter.format_result(
+            make_sparse_result(COLUMNAR_OUTS["count"])
+        ).splitlines()
+
+        assert json.loads(lines[0])["files"] == ["1", "2"]
+        assert json.loads(lines[0])["sparse"] is True
+        assert lines[1:] == [
+            '{"line":1,"1":2,"2":1}',
+            '{"line":2,"1":0}',
+            '{"line":3,"1":5}',
+            '{"lineCounts":[3,1]}',
+        ]
+
+    def test_csv(self):
+        """Тест CSV в длинном виде line,file,value."""
+        text = CsvFormatter.format_result(make_sparse_result(COLUMNAR_OUTS["string"]))
+
+        assert text == (
+            'line,file,value\n1,1,"a, ""b"""\n1,2,"x\ny"\n2,1,строка\n2,2,\n3,2,z\n'
+        )
+
+    @pytest.mark.parametrize("action", ["count", "string"])
+    def test_binary_matches_json(self, tmp_path, monkeypatch, action):
+        """Тест того, что двоичный результат загружается так же, как JSON."""
+        monkeypatch.setattr(BinaryFormatter, "BLOCK_ROWS", 2)
+        result = make_sparse_result(COLUMNAR_OUTS[action])
+
+        path = BinaryFormatter.save_to_file(result, str(tmp_path / "result.bin"))
+
+        assert BinaryFormatter.load_result(path) == json.loads(
+            JsonFormatter.format_result(result)
+        )
+
+    def test_streamed_line_counts(self):
+        """Тест числа строк, заполняемого при переборе потокового out."""
+        line_counts = []
+
+        def rows():
+            line_counts.extend([0, 0])
+            yield "1", {"1": 1, "2": 1}
+            line_counts[:] = [1, 1]
+
+        text = JsonFormatter.format_result(make_result(rows(), line_counts=line_counts))
+
+        assert json.loads(text)["lineCounts"] == [1, 1]
+
+    @pytest.mark.parametrize("formatter", list(OUTPUT_FORMATTERS.values()))
+    def test_ragged_is_smaller(self, formatter):
+        """Тест того, что разреженный результат меньше дополненного."""
+        columnar = ColumnarResult("count", [list(range(1000))] + [[1]] * 20)
+
+        padded = formatter.format_result(make_result(columnar.out))
+        sparse = formatter.format_result(make_sparse_result(columnar))
+
+        assert len(sparse) < len(padded) / 4
+
+
+def make_stats_result():
+    """Создаёт результат действия stats для двух файлов."""
+    first = FileStats(file_num=1, top_n=2)
+    first.update([3, 0, 7], 4)
+    second = FileStats(file_num=2, top_n=2)
+    second.update([2], 1)
+    return make_result(StatsResult([first, second]))
+
+
+class TestStatsOutput:
+    """Тесты записи сводки действия stats."""
+
+    def test_json(self):
+        """Тест JSON со сводкой в out."""
+        result = make_stats_result()
+
+        text = JsonFormatter.format_result(result)
+
+        assert json.loads(text)["out"] == result.out.to_dict()
+        assert text == json.dumps(
+            dict(JsonFormatter.result_header(result), out=result.out.to_dict()),
+            indent=2,
+            ensure_ascii=False,
+        )
+
+    def test_ndjson(self):
+        """Тест NDJSON: строка на файл и строка по всем файлам."""
+        result = make_stats_result()
+
+        lines = NdjsonFormatter.format_result(result).splitlines()
+
+        summary = result.out.to_dict()
+        assert json.loads(lines[0])["files"] == ["1", "2"]
+        assert json.loads(lines[0])["stats"] is True
+        assert json.loads(lines[1]) == dict(file=1, **summary["files"]["1"])
+        assert json.loads(lines[2])["file"] == 2
+        assert json.loads(lines[3]) == {"corpus": summary["corpus"]}
+
+    def test_csv(self):
+        """Тест CSV со счётчиками файлов."""
+        text = CsvFormatter.format_result(make_stats_result())
+
+        assert text == (
+            "file,lines,words,chars,emptyLines,maxLength,meanLength\n"
+            "1,3,4,10,1,7,3.33\n"
+            "2,1,1,2,0,2,2.0\n"
+            "corpus,4,5,12,1,7,3.0\n"
+        )
+
+    def test_binary(self, tmp_path):
+        """Тест двоичного файла со сводкой в заголовке."""
+        result = make_stats_result()
+
+        path = BinaryFormatter.save_to_file(result, str(tmp_path / "stats.bin"))
+
+        assert BinaryFormatter.load_result(path) == json.loads(
+            JsonFormatter.format_result(result)
+        )
+
+
+def make_search_result():
+    """Создаёт результат действия search для двух файлов."""
+    first = FileMatches()
+    first.add(2, "ab")
+    first.add(2, "ab")
+    first.add(5, "c")
+    first.count_patterns()
+    return make_result(SearchResult(["ab", "c"], [first, FileMatches()]))
+
+
+class TestSearchOutput:
+    """Тесты записи вхождений действия search."""
+
+    def test_json(self):
+        """Тест JSON с вхождениями в out."""
+        result = make_search_result()
+
+        out = json.loads(JsonFormatter.format_result(result))["out"]
+
+        assert out == result.out.to_dict()
+        assert out["corpus"] == {
+            "matches": 3,
+            "matchedFiles": 1,
+            "patterns": {"ab": 2, "c": 1},
+        }
+
+    def test_ndjson(self):
+        """Тест NDJSON: шаблоны в заголовке, строка на файл и по всем файлам."""
+        result = make_search_result()
+
+        lines = NdjsonFormatter.format_result(result).splitlines()
+
+        summary = result.out.to_dict()
+        header = json.loads(lines[0])
+        assert (header["files"], header["search"]) == (["1", "2"], True)
+        assert header["patterns"] == ["ab", "c"]
+        assert json.loads(lines[1]) == dict(file=1, **summary["files"]["1"])
+        assert json.loads(lines[2])["matches"] == 0
+        assert json.loads(lines[3]) == {"corpus": summary["corpus"]}
+
+    def test_csv(self):
+        """Тест CSV в длинном виде file,line,pattern,count."""
+        text = CsvFormatter.format_result(make_search_result())
+
+        assert text == "file,line,pattern,count\n1,2,ab,2\n1,5,c,1\n"
+
+    def test_binary(self, tmp_path):
+        """Тест двоичного файла с вхождениями в заголовке."""
+        result = make_search_result()
+
+        path = BinaryFormatter.save_to_file(result, str(tmp_path / "search.bin"))
+
+        assert BinaryFormatter.load_result(path) == json.loads(
+            JsonFormatter.format_result(result)
+        )
@@ -0,0 +1,273 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import pytest
+from unittest.mock import patch
+import script
+from presentation import JsonFormatter
+from presentation.server import (
+    ServerClient,
+    ServerError,
+    TextProcessorServer,
+    check_socket_owner,
+    default_socket_path,
+)
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """Создаёт рабочий каталог с файлами и конфигурацией."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "file1.txt").write_text("one two\nabc\n", encoding="utf-8")
+    (tmp_path / "config.txt").write_text(
+        "#1\n#mode: files\n#path: file1.txt\n#action: count\n\n"
+        "#2\n#mode: files\n#path: file1.txt\n#action: replace\n",
+        encoding="utf-8",
+    )
+    return tmp_path
+
+
+@pytest.fixture
+def socket_path():
+    """Возвращает короткий путь для сокета во временном каталоге."""
+    socket_dir = tempfile.mkdtemp(prefix="tp")
+    yield os.path.join(socket_dir, "server.sock")
+    shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def server(workspace, socket_path):
+    """Запускает сервер в фоновом потоке."""
+    server = TextProcessorServer(
+        script.TextProcessorApp(use_result_cache=False), socket_path
+    )
+    server.start()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join(timeout=5)
+
+
+class TestTextProcessorServer:
+    """Тесты для сервера обработки на Unix-сокете."""
+
+    def test_run_and_list(self, server, workspace):
+        """Тест выполнения и вывода конфигураций через клиент."""
+        client = ServerClient(server.socket_path)
+
+        assert client.is_available()
+        response = client.run("config.txt", ["1", "2"])
+        listing = client.list_configs("config.txt")
+
+        assert response == {
+            "ok": True,
+            "results": [
+                ["1", os.path.join("results", "result_config_1.json")],
+                ["2", os.path.join("results", "result_config_2.json")],
+            ],
+        }
+        result = json.loads(
+            (workspace / "results" / "result_config_1.json").read_text()
+        )
+        assert result["out"] == {"1": {"1": 2}, "2": {"1": 1}}
+        assert "Доступные конфигурации" in listing["output"]
+
+    def test_keeps_configs_and_files_warm(self, server, workspace):
+        """Тест повторного использования конфигураций и файлов между запросами."""
+        client = ServerClient(server.socket_path)
+
+        with patch.object(
+            server.app.config_service,
+            "read_configs",
+            wraps=server.app.config_service.read_configs,
+        ) as mock_read:
+            client.run("config.txt", None)
+            client.run("config.txt", ["1"])
+            assert mock_read.call_count == 1
+
+            (workspace / "config.txt").write_text(
+                "#1\n#mode: files\n#path: file1.txt\n#action: string\n",
+                encoding="utf-8",
+            )
+            assert client.run("config.txt", None)["results"] == [
+                ["1", os.path.join("results", "result_config_1.json")]
+            ]
+            assert mock_read.call_count == 2
+
+        assert server.app.file_repository.cache_stats()["misses"] == 1
+
+    def test_errors(self, server):
+        """Тест ответов на ошибочные запросы."""
+        client = ServerClient(server.socket_path)
+
+        assert client.run("config.txt", ["42"]) == {
+            "ok": False,
+            "error": "Конфигурация с ID 42 не найдена в файле config.txt",
+            "code": 1,
+        }
+        assert client.request({"command": "reboot"})["ok"] is False
+        assert client.request({})["error"] == "'config_file'"
+        assert "не найден" in client.run("missing.txt", None)["error"]
+
+    def test_concurrent_requests(self, server, workspace, tmp_path_factory):
+        """Тест одновременных запросов из одного и разных каталогов."""
+        other_dir = tmp_path_factory.mktemp("other")
+        shutil.copy(workspace / "file1.txt", other_dir / "file1.txt")
+        shutil.copy(workspace / "config.txt", other_dir / "config.txt")
+        client = ServerClient(server.socket_path)
+        responses = []
+
+        def request(cwd, config_id):
+            responses.append(
+                client.request(
+                    {
+                        "command": "run",
+                        "cwd": str(cwd),
+                        "config_file": "config.txt",
+                        "config_ids": [config_id],
+                    }
+                )
+            )
+
+        threads = [
+            threading.Thread(target=request, args=(cwd, config_id))
+            for cwd in (workspace, other_dir)
+            for config_id in ("1", "2", "1")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        assert len(responses) == 6 and all(r["ok"] for r in responses)
+        for cwd in (workspace, other_dir):
+            for config_id in ("1", "2"):
+                path = cwd / "results" / f"result_config_{config_id}.json"
+                assert json.loads(path.read_text(encoding="utf-8"))["out"]
+
+    def test_same_relative_paths_in_different_directories(
+        self, server, tmp_path_factory
+    ):
+        """Тест того, что кэш файлов не смешивает каталоги запросов."""
+        client = ServerClient(server.socket_path)
+        results = []
+        for name, text in (("a", "aaa bbb\n"), ("b", "ccc ddd\n")):
+            cwd = tmp_path_factory.mktemp(name)
+            (cwd / "d").mkdir()
+            (cwd / "d" / "f.txt").write_text(text, encoding="utf-8")
+            os.utime(cwd / "d" / "f.txt", ns=(1, 1))
+            (cwd / "config.txt").write_text(
+                "#1\n#mode: files\n#path: d/f.txt\n#action: string\n",
+                encoding="utf-8",
+            )
+            response = client.request(
+                {
+                    "command": "run",
+                    "cwd": str(cwd),
+                    "config_file": "config.txt",
+                    "config_ids": ["1"],
+                }
+            )
+            assert response["ok"]
+            result_path = cwd / "results" / "result_config_1.json"
+            results.append(json.loads(result_path.read_text(encoding="utf-8")))
+
+        assert [result["out"] for result in results] == [
+            {"1": {"1": "aaa bbb"}},
+            {"1": {"1": "ccc ddd"}},
+        ]
+
+    def test_start_when_already_running(self, server):
+        """Тест отказа запускать второй сервер на том же сокете."""
+        with pytest.raises(ServerError):
+            TextProcessorServer(server.app, server.socket_path).start()
+
+    def test_start_removes_stale_socket(self, workspace, socket_path):
+        """Тест удаления сокета, оставшегося от завершившегося сервера."""
+        with open(socket_path, "w"):
+            pass
+        server = TextProcessorServer(script.TextProcessorApp(), socket_path)
+
+        server.start()
+        server.close()
+        server.close()
+
+        assert not os.path.exists(socket_path)
+
+    def test_start_creates_private_socket(self, workspace, socket_path):
+        """Тест создания каталога 0700 и сокета 0600."""
+        nested_path = os.path.join(os.path.dirname(socket_path), "run", "s.sock")
+        server = TextProcessorServer(script.TextProcessorApp(), nested_path)
+
+        server.start()
+        try:
+            assert os.stat(os.path.dirname(nested_path)).st_mode & 0o777 == 0o700
+            assert os.stat(nested_path).st_mode & 0o777 == 0o600
+        finally:
+            server.close()
+
+    def test_start_refuses_foreign_socket(self, workspace, socket_path):
+        """Тест отказа использовать сокет другого пользователя."""
+        with open(socket_path, "w"):
+            pass
+        server = TextProcessorServer(script.TextProcessorApp(), socket_path)
+
+        with patch("os.getuid", return_value=os.getuid() + 1):
+            with pytest.raises(ServerError, match="другому пользователю"):
+                server.start()
+
+        assert os.path.exists(socket_path)
+
+    def test_profiled_requests(self, workspace, socket_path):
+        """Тест записи профиля запросов сервера, запущенного с --profile."""
+        server = TextProcessorServer(
+            script.TextProcessorApp(use_result_cache=False, profile=["trace"]),
+            socket_path,
+        )
+
+        response = server.handle_request(
+            {"command": "run", "cwd": str(workspace), "config_file": "config.txt"}
+        )
+
+        assert response["ok"] is True
+        for _, output_path in response["results"]:
+            assert os.path.exists(JsonFormatter.get_trace_path(output_path))
+
+
+class TestServerClient:
+    """Тесты для клиента сервера обработки."""
+
+    def test_unavailable_server(self, socket_path):
+        """Тест ошибки подключения к незапущенному серверу."""
+        client = ServerClient(socket_path)
+
+        assert client.is_available() is False
+        with pytest.raises(OSError):
+            client.run("config.txt", None)
+
+    def test_default_socket_path(self, monkeypatch):
+        """Тест выбора пути сокета по умолчанию."""
+        monkeypatch.setenv("TEXT_PROCESSOR_SOCKET", "/tmp/custom.sock")
+        assert default_socket_path() == "/tmp/custom.sock"
+
+        monkeypatch.delenv("TEXT_PROCESSOR_SOCKET")
+        monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+        assert default_socket_path() == "/run/user/1000/text_processor.sock"
+
+        monkeypatch.delenv("XDG_RUNTIME_DIR")
+        socket_dir = os.path.dirname(default_socket_path())
+        assert os.path.dirname(socket_dir) == tempfile.gettempdir()
+        assert os.path.basename(socket_dir) == f"text_processor-{os.getuid()}"
+        assert ServerClient().socket_path == default_socket_path()
+
+    def test_refuses_foreign_socket(self, server):
+        """Тест отказа подключаться к сокету другого пользователя."""
+        check_socket_owner(server.socket_path)
+
+        with patch("os.getuid", return_value=os.getuid() + 1):
+            with pytest.raises(PermissionError):
+                check_socket_owner(server.socket_path)
+            assert ServerClient(server.socket_path).is_available() is False
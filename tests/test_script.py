@@ -0,0 +1,804 @@
+import dataclasses
+import json
+import os
+import pstats
+import subprocess
+import sys
+import tempfile
+import threading
+import pytest
+from unittest.mock import patch
+import script
+from domain import CompactLines
+from infrastructure.adapters import PollingFileWatcher, file_system_adapter
+from infrastructure.repositories import ResultCache
+from presentation import JsonFormatter
+from presentation.server import TextProcessorServer
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """Создаёт рабочий каталог с файлами и конфигурацией."""
+    monkeypatch.chdir(tmp_path)
+    files_dir = tmp_path / "test_files"
+    files_dir.mkdir()
+    (files_dir / "file1.txt").write_text("one two\nHello abc\n", encoding="utf-8")
+    (files_dir / "file2.txt").write_text("three\n", encoding="utf-8")
+    (tmp_path / "config.txt").write_text(
+        "#1\n#mode: dir\n#path: ./test_files\n#action: count\n\n"
+        "#2\n#mode: files\n#path: ./test_files/file1.txt\n#action: replace\n",
+        encoding="utf-8",
+    )
+    return tmp_path
+
+
+def run_main(*args):
+    """Запускает main с указанными аргументами командной строки."""
+    with patch.object(sys, "argv", ["script.py", *args]):
+        with patch("builtins.print") as mock_print:
+            try:
+                script.main()
+            except SystemExit as e:
+                return e.code, mock_print
+    return 0, mock_print
+
+
+def import_profile(*args):
+    """Запускает script.py под -X importtime.
+
+    Возвращает множество импортированных модулей и суммарное время импорта
+    в миллисекундах.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", script.__file__, *args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    prefix = "import time:"
+    modules, total_us = set(), 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith(prefix) or "[us]" in line:
+            continue
+        _, cumulative, name = line.replace(prefix, "", 1).split("|")
+        if not name[1:].startswith(" "):
+            total_us += int(cumulative)
+        modules.add(name.strip().split(".")[0])
+    return modules, total_us / 1000
+
+
+class TestTextProcessorApp:
+    """Тесты для сборки приложения и запуска конфигураций."""
+
+    def test_run_config(self, workspace):
+        """Тест обработки конфигурации и сохранения результата."""
+        app = script.TextProcessorApp()
+        configs = app.config_service.read_configs("config.txt")
+
+        output_path = app.run_config("config.txt", configs[0])
+
+        with open(output_path, encoding="utf-8") as f:
+            result = json.load(f)
+        assert result["configurationID"] == "1"
+        assert result["out"] == {"1": {"1": 2, "2": 1}, "2": {"1": 2, "2": 0}}
+
+    def test_run_config_sparse(self, workspace):
+        """Тест разреженного результата без дополнения коротких файлов."""
+        app = script.TextProcessorApp(sparse=True)
+        configs = app.config_service.read_configs("config.txt")
+
+        output_path = app.run_config("config.txt", configs[0])
+
+        with open(output_path, encoding="utf-8") as f:
+            result = json.load(f)
+        assert result["out"] == {"1": {"1": 2, "2": 1}, "2": {"1": 2}}
+        assert result["lineCounts"] == [2, 1]
+
+    def test_run_config_uses_result_cache(self, workspace):
+        """Тест повторного использования результата из кэша."""
+        app = script.TextProcessorApp()
+        config = app.config_service.read_configs("config.txt")[0]
+        first_path = app.run_config("config.txt", config)
+        with open(first_path, encoding="utf-8") as f:
+            first = f.read()
+
+        with patch.object(app.file_processor, "process_files") as mock_process:
+            second_path = app.run_config("config.txt", config)
+            mock_process.assert_not_called()
+
+        with open(second_path, encoding="utf-8") as f:
+            assert f.read() == first
+
+    def test_config_cache_follows_result_cache(self, workspace):
+        """Тест кэша разобранных конфигураций только вместе с кэшем результатов."""
+        cached_app = script.TextProcessorApp()
+        uncached_app = script.TextProcessorApp(use_result_cache=False)
+
+        assert cached_app.config_adapter.cache_dir.endswith("configs")
+        assert uncached_app.config_adapter.cache_dir is None
+
+    def test_run_config_without_result_cache(self, workspace):
+        """Тест обработки без кэша результатов."""
+        app = script.TextProcessorApp(use_result_cache=False)
+        config = app.config_service.read_configs("config.txt")[1]
+
+        app.run_config("config.txt", config)
+
+        assert not list(workspace.glob(f"{ResultCache.DEFAULT_CACHE_DIR}/*.json"))
+
+    @pytest.mark.parametrize(
+        "config_index, expected",
+        [
+            (0, ["test_files/file1.txt", "test_files/file2.txt"]),
+            (1, ["test_files/file1.txt"]),
+        ],
+    )
+    def test_run_config_stats_input_once(self, workspace, config_index, expected):
+        """Тест одного stat на входной файл за запуск (для dir - stat записи)."""
+        app = script.TextProcessorApp(use_result_cache=False)
+        config = app.config_service.read_configs("config.txt")[config_index]
+        stat_record = file_system_adapter._stat_record
+        entry_stats = []
+
+        def counting_stat_record(path):
+            if isinstance(path, os.DirEntry):
+                entry_stats.append(path.path)
+            return stat_record(path)
+
+        with patch.object(
+            file_system_adapter, "_stat_record", counting_stat_record
+        ), patch("os.stat", wraps=os.stat) as mock_stat:
+            app.run_config("config.txt", config)
+
+        path_stats = [call.args[0] for call in mock_stat.call_args_list]
+        input_stats = [
+            os.path.normpath(path)
+            for path in entry_stats + path_stats
+            if "test_files/file" in str(path)
+        ]
+        assert sorted(input_stats) == expected
+        assert not app.stat_cache.active
+
+    def test_run_config_sees_changes_between_runs(self, workspace):
+        """Тест того, что сведения stat не переживают запуск."""
+        app = script.TextProcessorApp(use_result_cache=False)
+        config = app.config_service.read_configs("config.txt")[1]
+        app.run_config("config.txt", config)
+        (workspace / "test_files" / "file1.txt").unlink()
+
+        with pytest.raises(FileNotFoundError):
+            app.run_config("config.txt", config)
+
+    @pytest.mark.parametrize("incremental", [False, True])
+    def test_run_config_stats(self, workspace, incremental):
+        """Тест действия stats: сводка вместо построчной матрицы."""
+        app = script.TextProcessorApp(use_result_cache=False, profile=["trace"])
+        config = app.config_service.read_configs("config.txt")[0]
+        config.action = "stats"
+
+        output_path = app.run_config_profiled("config.txt", config, incremental)
+
+        with open(output_path, encoding="utf-8") as f:
+            out = json.load(f)["out"]
+        assert out["files"]["1"]["words"] == 4
+        assert out["files"]["2"]["longest"] == [{"line": 1, "length": 5}]
+        assert out["corpus"]["lines"] == 3
+        with open(JsonFormatter.get_trace_path(output_path), encoding="utf-8") as f:
+            assert json.load(f)["counters"] == {"files": 2, "lines_processed": 3}
+
+    @pytest.mark.parametrize("action", ["count", "stats"])
+    def test_run_config_counts_words_vectorized(self, workspace, action):
+        """Тест векторного подсчёта слов при обычном запуске конфигурации."""
+        numpy = pytest.importorskip("numpy")
+        app = script.TextProcessorApp(use_result_cache=False)
+        config = app.config_service.read_configs("config.txt")[0]
+        config = dataclasses.replace(config, action=action)
+
+        with patch.object(
+            app.text_service,
+            "count_words_bulk",
+            wraps=app.text_service.count_words_bulk,
+        ) as mock_bulk, patch.object(
+            numpy, "frombuffer", wraps=numpy.frombuffer
+        ) as mock_frombuffer:
+            app.run_config("config.txt", config)
+
+        assert mock_bulk.call_count == 2
+        assert mock_frombuffer.call_count == 2
+        if action == "count":
+            assert all(
+                isinstance(call.args[0], CompactLines)
+                for call in mock_bulk.call_args_list
+            )
+
+    def test_run_config_search(self, workspace):
+        """Тест действия search с шаблонами из конфигурации и файла."""
+        (workspace / "patterns.txt").write_text("o\n\nabc\n", encoding="utf-8")
+        app = script.TextProcessorApp(use_result_cache=False, profile=["trace"])
+        config = app.config_service.read_configs("config.txt")[0]
+        config.action = "search"
+        config.patterns = "he, o"
+        config.patterns_file = "patterns.txt"
+
+        output_path = app.run_config_profiled("config.txt", config, True)
+
+        with open(output_path, encoding="utf-8") as f:
+            out = json.load(f)["out"]
+        assert out["patterns"] == ["he", "o", "abc"]
+        assert out["files"]["1"]["lines"] == {
+            "1": {"o": 2},
+            "2": {"o": 1, "abc": 1},
+        }
+        assert out["corpus"]["patterns"] == {"he": 0, "o": 3, "abc": 1}
+        with open(JsonFormatter.get_trace_path(output_path), encoding="utf-8") as f:
+            assert json.load(f)["counters"] == {"files": 2, "patterns": 3}
+
+    def test_main_search_without_patterns(self, workspace):
+        """Тест ошибки действия search без шаблонов."""
+        (workspace / "config.txt").write_text(
+            "#1\n#mode: dir\n#path: ./test_files\n#action: search\n",
+            encoding="utf-8",
+        )
+
+        code, mock_print = run_main("config.txt", "1", "--no-cache")
+
+        assert code == 1
+        assert "не заданы шаблоны" in mock_print.call_args[0][0]
+
+    def test_run_config_streaming(self, workspace):
+        """Тест потоковой обработки больших входных данных."""
+        app = script.TextProcessorApp(use_result_cache=False)
+        app.file_processor.STREAMING_THRESHOLD = 0
+        config = app.config_service.read_configs("config.txt")[0]
+
+        output_path = app.run_config("config.txt", config)
+
+        with open(output_path, encoding="utf-8") as f:
+            assert json.load(f)["out"]["2"] == {"1": 2, "2": 0}
+
+    def test_run_config_streaming_sparse(self, workspace):
+        """Тест потоковой обработки без дополнения коротких файлов."""
+        app = script.TextProcessorApp(use_result_cache=False, sparse=True)
+        app.file_processor.STREAMING_THRESHOLD = 0
+        config = app.config_service.read_configs("config.txt")[0]
+
+        output_path = app.run_config("config.txt", config)
+
+        with open(output_path, encoding="utf-8") as f:
+            result = json.load(f)
+        assert result["out"]["2"] == {"1": 2}
+        assert result["lineCounts"] == [2, 1]
+
+    def test_run_config_incremental(self, workspace):
+        """Тест инкрементальной переобработки изменившегося файла."""
+        app = script.TextProcessorApp(use_result_cache=False)
+        config = app.config_service.read_configs("config.txt")[0]
+        app.run_config("config.txt", config, incremental=True)
+        (workspace / "test_files" / "file2.txt").write_text(
+            "a b c\nd\ne\n", encoding="utf-8"
+        )
+
+        with patch.object(
+            app.file_repository.file_system,
+            "read_file",
+            wraps=app.file_repository.file_system.read_file,
+        ) as mock_read:
+            output_path = app.run_config("config.txt", config, incremental=True)
+            mock_read.assert_called_once_with("./test_files/file2.txt")
+
+        with open(output_path, encoding="utf-8") as f:
+            incremental = f.read()
+        full_path = app.run_config("config.txt", config)
+        with open(full_path, encoding="utf-8") as f:
+            assert f.read() == incremental
+
+    @pytest.mark.parametrize(
+        "output_format, reads", [("bin", 1), ("ndjson", 1), ("csv", 2)]
+    )
+    def test_run_config_incremental_formats(self, workspace, output_format, reads):
+        """Тест инкрементального пересчёта в других форматах результата.
+
+        Из CSV прежний результат не загрузить, поэтому он пересчитывается целиком.
+        """
+        app = script.TextProcessorApp(
+            use_result_cache=False, output_format=output_format
+        )
+        config = app.config_service.read_configs("config.txt")[0]
+        app.run_config("config.txt", config, incremental=True)
+        (workspace / "test_files" / "file2.txt").write_text("a b\n", encoding="utf-8")
+
+        with patch.object(
+            app.file_repository.file_system,
+            "read_file",
+            wraps=app.file_repository.file_system.read_file,
+        ) as mock_read:
+            output_path = app.run_config("config.txt", config, incremental=True)
+            assert mock_read.call_count == reads
+
+        assert output_path == f"results/result_config_1.{output_format}"
+        with open(output_path, "rb") as f:
+            incremental = f.read()
+        with open(app.run_config("config.txt", config), "rb") as f:
+            assert f.read() == incremental
+
+    def test_run_config_output_formats_cached_separately(self, workspace):
+        """Тест того, что кэш результатов различает форматы."""
+        config = script.TextProcessorApp().config_service.read_configs("config.txt")[0]
+
+        json_path = script.TextProcessorApp().run_config("config.txt", config)
+        csv_path = script.TextProcessorApp(output_format="csv").run_config(
+            "config.txt", config
+        )
+
+        assert json_path.endswith(".json") and csv_path.endswith(".csv")
+        with open(csv_path, encoding="utf-8") as f:
+            assert f.read() == "line,1,2\n1,2,1\n2,2,0\n"
+
+    def test_run_config_incremental_ignores_foreign_result(self, workspace):
+        """Тест полного пересчёта, если результат перезаписан без манифеста."""
+        app = script.TextProcessorApp(use_result_cache=False)
+        config = app.config_service.read_configs("config.txt")[0]
+        app.run_config("config.txt", config, incremental=True)
+        (workspace / "results" / "result_config_1.json").write_text(
+            "{}", encoding="utf-8"
+        )
+
+        output_path = app.run_config("config.txt", config, incremental=True)
+
+        with open(output_path, encoding="utf-8") as f:
+            assert json.load(f)["out"]["1"] == {"1": 2, "2": 1}
+
+    def test_run_configs_shares_file_reads(self, workspace):
+        """Тест однократного чтения файлов, общих для нескольких конфигураций."""
+        app = script.TextProcessorApp(use_result_cache=False)
+        configs = app.config_service.read_configs("config.txt")
+
+        results = app.run_configs("config.txt", configs + configs)
+
+        assert [config_id for config_id, _ in results] == ["1", "2", "1", "2"]
+        stats = app.file_repository.cache_stats()
+        assert stats["misses"] == 2
+        assert stats["hits"] == 4
+
+    def test_run_configs_concurrently(self, workspace):
+        """Тест параллельного выполнения независимых конфигураций."""
+        app = script.TextProcessorApp(use_result_cache=False)
+        configs = app.config_service.read_configs("config.txt")
+        serial = {}
+        for config_id, output_path in app.run_configs("config.txt", configs):
+            with open(output_path, encoding="utf-8") as f:
+                serial[config_id] = f.read()
+
+        results = app.run_configs("config.txt", configs, jobs=2)
+
+        for config_id, output_path in results:
+            with open(output_path, encoding="utf-8") as f:
+                assert f.read() == serial[config_id]
+
+    def test_run_config_profiled(self, workspace):
+        """Тест сохранения профиля этапов рядом с результатом."""
+        app = script.TextProcessorApp(profile=["trace", "pstats", "memory"])
+        configs = app.config_service.read_configs("config.txt")
+
+        output_path = app.run_config_profiled("config.txt", configs[0])
+        app.run_config_profiled("config.txt", configs[0])
+
+        with open(JsonFormatter.get_trace_path(output_path), encoding="utf-8") as f:
+            trace = json.load(f)
+        assert trace["configurationID"] == "1"
+        assert trace["counters"] == {"files": 2, "result_cache_hits": 1}
+        assert set(trace["stages"]) == {"get_files_from_config", "result_cache_fetch"}
+        assert trace["memory"]["tracemalloc_peak_bytes"] > 0
+        assert pstats.Stats(trace["pstats"]).total_calls > 0
+
+    def test_run_config_profiled_counters(self, workspace):
+        """Тест счётчиков чтения и обработки в профиле."""
+        app = script.TextProcessorApp(use_result_cache=False, profile=["trace"])
+        configs = app.config_service.read_configs("config.txt")
+
+        results = app.run_configs("config.txt", [configs[0], configs[0]])
+
+        with open(JsonFormatter.get_trace_path(results[0][1]), encoding="utf-8") as f:
+            trace = json.load(f)
+        assert trace["counters"] == {
+            "files": 2,
+            "file_cache_hits": 2,
+            "file_cache_misses": 0,
+            "bytes_read": 24,
+            "lines_processed": 3,
+            "cells_produced": 4,
+        }
+        assert set(trace["stages"]) == {
+            "get_files_from_config",
+            "get_multiple_files",
+            "process_files",
+            "save_to_file",
+        }
+        assert "pstats" not in trace and "tracemalloc_peak_bytes" not in trace["memory"]
+
+    @pytest.mark.parametrize("sparse, cells", [(False, 4), (True, 3)])
+    def test_run_config_profiled_streaming(self, workspace, sparse, cells):
+        """Тест счётчиков и этапа обработки в профиле потоковой обработки."""
+        app = script.TextProcessorApp(
+            use_result_cache=False, profile=["trace"], sparse=sparse
+        )
+        app.file_processor.STREAMING_THRESHOLD = 0
+        config = app.config_service.read_configs("config.txt")[0]
+        expected_path = script.TextProcessorApp(
+            use_result_cache=False, sparse=sparse
+        ).run_config("config.txt", config)
+        with open(expected_path, encoding="utf-8") as f:
+            expected = json.load(f)["out"]
+
+        output_path = app.run_config_profiled("config.txt", config)
+
+        with open(output_path, encoding="utf-8") as f:
+            assert json.load(f)["out"] == expected
+        with open(JsonFormatter.get_trace_path(output_path), encoding="utf-8") as f:
+            trace = json.load(f)
+        assert trace["counters"] == {
+            "files": 2,
+            "streamed": 1,
+            "lines_processed": 3,
+            "cells_produced": cells,
+        }
+        assert trace["stages"]["process_files"]["calls"] == 1
+        assert set(trace["stages"]) == {
+            "get_files_from_config",
+            "process_files",
+            "save_to_file",
+        }
+
+    def test_run_config_profiled_memo(self, workspace):
+        """Тест счётчиков кэша строк в профиле."""
+        app = script.TextProcessorApp(
+            use_result_cache=False, profile=["trace"], memo=True
+        )
+        config = app.config_service.read_configs("config.txt")[1]
+
+        app.run_config_profiled("config.txt", config)
+        output_path = app.run_config_profiled("config.txt", config)
+
+        with open(JsonFormatter.get_trace_path(output_path), encoding="utf-8") as f:
+            counters = json.load(f)["counters"]
+        assert (
+            counters["memo_hits"],
+            counters["memo_misses"],
+            counters["memo_evictions"],
+        ) == (2, 0, 0)
+        assert app.line_memo.cache_stats()["hit_rate"] == 0.5
+        assert script.TextProcessorApp(memo=5).line_memo.max_entries == 5
+        assert script.TextProcessorApp().line_memo is None
+
+    def test_run_config_profiled_incremental(self, workspace):
+        """Тест профиля инкрементального пересчёта."""
+        app = script.TextProcessorApp(profile=["trace"])
+        configs = app.config_service.read_configs("config.txt")
+
+        output_path = app.run_config_profiled("config.txt", configs[0], True)
+
+        with open(JsonFormatter.get_trace_path(output_path), encoding="utf-8") as f:
+            assert json.load(f)["counters"] == {"files": 2, "stale_files": 2}
+
+    def test_watch(self, workspace):
+        """Тест перезапуска конфигураций при изменении файлов."""
+        app = script.TextProcessorApp(use_result_cache=False)
+        watcher = PollingFileWatcher(interval=0.01)
+        file2 = workspace / "test_files" / "file2.txt"
+
+        def wait(timeout=None):
+            if timeout is None:
+                file2.write_text("three four\n", encoding="utf-8")
+                return {str(file2)}
+            return set()
+
+        with patch.object(watcher, "wait", side_effect=wait):
+            with patch("builtins.print") as mock_print:
+                app.watch("config.txt", ["1", "2"], file_watcher=watcher, max_cycles=1)
+
+        assert [call.args[0] for call in mock_print.call_args_list] == [
+            "Результат сохранен в: results/result_config_1.json",
+            "Результат сохранен в: results/result_config_2.json",
+            "Результат сохранен в: results/result_config_1.json",
+        ]
+        with open("results/result_config_1.json", encoding="utf-8") as f:
+            assert json.load(f)["out"]["1"] == {"1": 2, "2": 2}
+        assert app.file_repository.cache_stats()["hits"] == 2
+
+    def test_watch_reports_errors(self, workspace):
+        """Тест продолжения наблюдения после ошибки обработки."""
+        app = script.TextProcessorApp()
+        watcher = PollingFileWatcher(interval=0.01)
+
+        with patch.object(app, "run_configs", side_effect=OSError("нет доступа")):
+            with patch.object(watcher, "wait", side_effect=KeyboardInterrupt):
+                with patch("builtins.print") as mock_print:
+                    app.watch("config.txt", file_watcher=watcher)
+
+        assert mock_print.call_args[0][0] == "Ошибка: нет доступа"
+
+    def test_watch_default_watcher(self, workspace):
+        """Тест выбора наблюдателя по умолчанию."""
+        app = script.TextProcessorApp()
+        watcher = PollingFileWatcher()
+
+        with patch("infrastructure.adapters.create_file_watcher", return_value=watcher):
+            with patch("builtins.print"):
+                app.watch("config.txt", max_cycles=1, timeout=0)
+
+
+class TestMain:
+    """Тесты для точки входа командной строки."""
+
+    def test_main_list_configs(self, workspace):
+        """Тест вывода списка конфигураций."""
+        code, mock_print = run_main("config.txt")
+
+        assert code == 0
+        assert "Доступные конфигурации" in mock_print.call_args[0][0]
+        assert not (workspace / ResultCache.DEFAULT_CACHE_DIR).exists()
+
+    def test_main_run_config(self, workspace):
+        """Тест запуска конфигурации из командной строки."""
+        code, mock_print = run_main("config.txt", "2", "--no-cache")
+
+        assert code == 0
+        mock_print.assert_called_once_with(
+            "Результат сохранен в: results/result_config_2.json"
+        )
+        assert not (workspace / ResultCache.DEFAULT_CACHE_DIR).exists()
+
+    def test_main_batch(self, workspace):
+        """Тест пакетного запуска нескольких конфигураций."""
+        code, mock_print = run_main("config.txt", "2,1", "--no-cache")
+
+        assert code == 0
+        assert [call.args[0] for call in mock_print.call_args_list] == [
+            "Результат сохранен в: results/result_config_2.json",
+            "Результат сохранен в: results/result_config_1.json",
+        ]
+
+    def test_main_all(self, workspace):
+        """Тест запуска всех конфигураций из файла."""
+        code, mock_print = run_main("config.txt", "--all", "--jobs=2")
+
+        assert code == 0
+        assert mock_print.call_count == 2
+        assert (workspace / "results" / "result_config_1.json").exists()
+        assert (workspace / "results" / "result_config_2.json").exists()
+
+    def test_main_unknown_config(self, workspace):
+        """Тест обработки неизвестного ID конфигурации."""
+        code, mock_print = run_main("config.txt", "42")
+
+        assert code == 1
+        assert "не найдена" in mock_print.call_args[0][0]
+
+    def test_main_error(self, workspace):
+        """Тест обработки ошибки при отсутствии конфигурационного файла."""
+        with patch("traceback.print_exc"):
+            code, mock_print = run_main("missing.txt", "1")
+
+        assert code == 1
+        assert mock_print.call_args[0][0].startswith("Ошибка: ")
+
+    def test_main_format(self, workspace):
+        """Тест параметра --format (выполняется без сервера)."""
+        with patch("presentation.server.ServerClient.run") as mock_run:
+            code, mock_print = run_main(
+                "config.txt", "1", "--format=ndjson", "--server"
+            )
+
+        assert code == 0
+        mock_run.assert_not_called()
+        mock_print.assert_called_once_with(
+            "Результат сохранен в: results/result_config_1.ndjson"
+        )
+
+        with patch("traceback.print_exc"):
+            code, mock_print = run_main("config.txt", "1", "--format=xml")
+        assert code == 1
+        assert "xml" in mock_print.call_args[0][0]
+
+    def test_main_sparse(self, workspace):
+        """Тест параметра --sparse (выполняется без сервера)."""
+        with patch("presentation.server.ServerClient.run") as mock_run:
+            code, _ = run_main("config.txt", "1", "--sparse", "--server")
+
+        assert code == 0
+        mock_run.assert_not_called()
+        with open(
+            workspace / "results" / "result_config_1.json", encoding="utf-8"
+        ) as f:
+            result = json.load(f)
+        assert result["out"]["2"] == {"1": 2}
+        assert result["lineCounts"] == [2, 1]
+
+    def test_main_memo(self, workspace):
+        """Тест параметра --memo (выполняется без сервера) и его ошибки."""
+        with patch("presentation.server.ServerClient.run") as mock_run:
+            code, _ = run_main("config.txt", "2", "--memo=10", "--server")
+
+        assert code == 0
+        mock_run.assert_not_called()
+        with open(
+            workspace / "results" / "result_config_2.json", encoding="utf-8"
+        ) as f:
+            assert json.load(f)["out"]["1"] == {"1": "16156 212416"}
+
+        with patch("traceback.print_exc"):
+            code, mock_print = run_main("config.txt", "1", "--memo=0")
+        assert code == 1
+        assert "Неверный размер кэша строк" in mock_print.call_args[0][0]
+
+    @pytest.mark.parametrize("option", ["--jobs=abc", "--jobs", "--jobs=0"])
+    def test_main_invalid_jobs(self, workspace, option):
+        """Тест понятной ошибки при неверном --jobs."""
+        with patch("traceback.print_exc"):
+            code, mock_print = run_main("config.txt", "1", option)
+
+        assert code == 1
+        assert "Неверное число одновременных конфигураций" in mock_print.call_args[0][0]
+        assert not (workspace / "results").exists()
+
+    def test_main_profile(self, workspace):
+        """Тест параметра --profile."""
+        code, _ = run_main("config.txt", "1", "--no-cache", "--profile")
+
+        assert code == 0
+        assert (workspace / "results" / "result_config_1.profile.json").exists()
+        assert not (workspace / "results" / "result_config_1.pstats").exists()
+
+    @pytest.mark.parametrize(
+        "args, config_ids, polling",
+        [
+            (["1,2", "--watch"], ["1", "2"], False),
+            (["--all", "--watch=poll"], None, True),
+        ],
+    )
+    def test_main_watch(self, workspace, args, config_ids, polling):
+        """Тест параметра --watch."""
+        with patch.object(script.TextProcessorApp, "watch") as mock_watch:
+            code, mock_print = run_main("config.txt", *args)
+
+        assert code == 0
+        assert "Ctrl+C" in mock_print.call_args[0][0]
+        call = mock_watch.call_args
+        assert call.args == ("config.txt", config_ids)
+        assert isinstance(call.kwargs["file_watcher"], PollingFileWatcher) == polling
+
+    def test_main_serve(self, workspace, tmp_path_factory):
+        """Тест параметра --serve."""
+        socket_path = tmp_path_factory.mktemp("sock") / "s.sock"
+        with patch(
+            "presentation.server.TextProcessorServer.serve_forever",
+            side_effect=KeyboardInterrupt,
+        ):
+            code, mock_print = run_main(f"--serve={socket_path}")
+
+        assert code == 0
+        mock_print.assert_called_once_with(f"Сервер запущен: {socket_path}")
+
+    @pytest.mark.parametrize(
+        "args, expected",
+        [
+            (["1,2"], ["1", "2"]),
+            (["--all"], None),
+        ],
+    )
+    def test_main_via_server(self, workspace, args, expected):
+        """Тест выполнения через сервер с параметром --server."""
+        response = {"ok": True, "results": [["1", "results/result_config_1.json"]]}
+        with patch("presentation.server.ServerClient.run", return_value=response) as m:
+            code, mock_print = run_main("config.txt", *args, "--server=/tmp/x.sock")
+
+        assert code == 0
+        assert m.call_args.args == ("config.txt", expected, False)
+        mock_print.assert_called_once_with(
+            "Результат сохранен в: results/result_config_1.json"
+        )
+
+    @pytest.mark.parametrize("option", ["--no-cache", "--jobs=2"])
+    def test_main_local_only_options_skip_server(self, workspace, option):
+        """Тест выполнения без сервера с параметрами, которые он не применяет."""
+        with patch("presentation.server.ServerClient.run") as mock_run:
+            code, mock_print = run_main("config.txt", "1", option, "--server")
+
+        assert code == 0
+        mock_run.assert_not_called()
+        mock_print.assert_called_once_with(
+            "Результат сохранен в: results/result_config_1.json"
+        )
+
+    def test_main_via_server_list_and_error(self, workspace):
+        """Тест вывода списка и ошибки, полученных от сервера."""
+        with patch(
+            "presentation.server.ServerClient.list_configs",
+            return_value={"ok": True, "output": "список"},
+        ):
+            code, mock_print = run_main("config.txt", "--server")
+        assert code == 0
+        mock_print.assert_called_once_with("список")
+
+        with patch(
+            "presentation.server.ServerClient.run",
+            return_value={"ok": False, "error": "нет", "code": 1},
+        ):
+            code, mock_print = run_main("config.txt", "42", "--server")
+        assert code == 1
+        assert "нет" in mock_print.call_args[0][0]
+
+    def test_main_server_unavailable(self, workspace, tmp_path_factory):
+        """Тест обычного выполнения, если сервер недоступен."""
+        socket_path = tmp_path_factory.mktemp("sock") / "missing.sock"
+        code, mock_print = run_main(
+            "config.txt", "2", "--no-cache", f"--server={socket_path}"
+        )
+
+        assert code == 0
+        mock_print.assert_called_once_with(
+            "Результат сохранен в: results/result_config_2.json"
+        )
+
+    def test_main_server_foreign_socket(self, workspace):
+        """Тест обычного выполнения с ошибкой, если сокет чужой."""
+        with patch(
+            "presentation.server.ServerClient.run",
+            side_effect=PermissionError("сокет другого пользователя"),
+        ):
+            code, mock_print = run_main("config.txt", "2", "--server")
+
+        assert code == 0
+        assert "другого пользователя" in mock_print.call_args_list[0][0][0]
+        mock_print.assert_called_with(
+            "Результат сохранен в: results/result_config_2.json"
+        )
+
+
+class TestStartup:
+    """Тесты бюджета импорта при запуске командной строки."""
+
+    # Запас в несколько раз против текущих значений: бюджет ловит возврат
+    # тяжёлого импорта (один NumPy стоит ~80 мс), а не шум машины.
+    HELP_BUDGET_MS = 120
+    LIST_BUDGET_MS = 250
+
+    HEAVY_MODULES = {"numpy", "concurrent", "multiprocessing", "ctypes", "cProfile"}
+    LAYERS = {"domain", "application", "infrastructure"}
+
+    def test_help_imports_only_presentation(self, workspace):
+        """Тест того, что справка не импортирует слои приложения."""
+        modules, total_ms = import_profile("help")
+
+        assert "presentation" in modules
+        assert not modules & (self.LAYERS | self.HEAVY_MODULES | {"traceback"})
+        assert total_ms < self.HELP_BUDGET_MS
+
+    def test_list_skips_processing_imports(self, workspace):
+        """Тест того, что список конфигураций не импортирует NumPy и пулы."""
+        modules, total_ms = import_profile("config.txt")
+
+        assert self.LAYERS <= modules
+        assert not modules & self.HEAVY_MODULES
+        assert total_ms < self.LIST_BUDGET_MS
+
+    def test_server_client_imports_only_presentation(self, workspace):
+        """Тест того, что запрос к серверу не импортирует слои приложения."""
+        socket_dir = tempfile.mkdtemp(prefix="tp")
+        server = TextProcessorServer(
+            script.TextProcessorApp(), os.path.join(socket_dir, "s.sock")
+        )
+        server.start()
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            modules, _ = import_profile(
+                "config.txt", "1", f"--server={server.socket_path}"
+            )
+        finally:
+            server.shutdown()
+            thread.join(timeout=5)
+            os.rmdir(socket_dir)
+
+        assert (workspace / "results" / "result_config_1.json").exists()
+        assert not modules & (self.LAYERS | self.HEAVY_MODULES)